@@ -0,0 +1,122 @@
+# benchmarks/load_test.py
+"""
+Load test for the HTTP pricing service: keeps --connections keep-alive
+connections busy with POST /calculate requests and reports throughput,
+latency percentiles and how many calculations each batch held. Starts an
+in-process service on a free port unless --url points at a running one.
+
+    python benchmarks/load_test.py [--connections 64] [--requests 20000] [--url http://127.0.0.1:8080]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+# Benchmark runs log heavily; keep their files out of the project's logs/ directory
+os.environ.setdefault("MARKETPLACE_CALC_LOG_DIR", os.path.join(tempfile.gettempdir(), "marketplace-calc-benchmark-logs"))
+
+from src.utils.config_loader import ConfigLoader
+from src.utils.logger import Logger
+from src.utils.pricing_service import PricingService
+
+def make_bodies(marketplaces, carriers, count):
+    rng = random.Random(0)
+    pairs = [(marketplace, carrier) for marketplace in marketplaces.values() for carrier in carriers.values()]
+    bodies = []
+    for _ in range(count):
+        marketplace, carrier = rng.choice(pairs)
+        service_id, service = rng.choice(list(carrier.services.items()))
+        body = dict(marketplace=marketplace.name, carrier=carrier.name,
+                    sale_price=round(rng.uniform(1, 200), 2), quantity=rng.randint(1, 4),
+                    cost_per_item=round(rng.uniform(0, 50), 2), weight_per_item=round(rng.uniform(0.5, 8), 1),
+                    tier_id=rng.choice(list(marketplace.tiers)), shipping_service_id=service_id)
+        if service.manual_entry:
+            body["manual_shipping_price"] = round(rng.uniform(0, 20), 2)
+        bodies.append(json.dumps(body).encode("utf-8"))
+    return bodies
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def request(reader, writer, host, method, path, body=b""):
+    writer.write(b"%s %s HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                 b"Content-Length: %d\r\n\r\n%s" % (method, path, host, len(body), body))
+    await writer.drain()
+    return await read_response(reader)
+
+async def client(host, port, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, host.encode(), b"POST", b"/calculate", body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def run(args):
+    marketplaces = ConfigLoader.load_marketplaces(os.path.join(project_root, "data", "marketplaces"))
+    carriers = ConfigLoader.load_shipping_carriers(os.path.join(project_root, "data", "shipping"))
+    service = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        service = PricingService(marketplaces, carriers, batch_window=args.batch_window_ms / 1000)
+        server = await service.start("127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    bodies = make_bodies(marketplaces, carriers, args.requests)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, bodies[index::args.connections], latencies, errors)
+                           for index in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, health = await request(reader, writer, host.encode(), b"GET", b"/health")
+    writer.close()
+    await writer.wait_closed()
+    health = json.loads(health)
+    if service is not None:
+        await service.close()
+
+    latencies.sort()
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+    print(f"{len(latencies)} requests over {args.connections} connections in {elapsed:.2f}s: "
+          f"{len(latencies) / elapsed:,.0f} requests/s, {len(errors)} errors")
+    print(f"latency ms  p50 {percentile(0.50):.2f}  p90 {percentile(0.90):.2f}  "
+          f"p99 {percentile(0.99):.2f}  max {latencies[-1] * 1000:.2f}")
+    if health.get("batches"):
+        print(f"{health['batches']} batches, {health['rows'] / health['batches']:.1f} calculations per batch")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--url", help="Test a running service instead of starting one")
+    args = parser.parse_args()
+    Logger.configure(level="WARNING")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/logging_overhead.py
+"""
+Per-calculation cost of logging: times ProfitCalculator.calculate_profit
+with the logger at DEBUG, INFO and WARNING. Console output is sent to
+os.devnull; the DEBUG and INFO runs still write the log file.
+
+    python benchmarks/logging_overhead.py [--calculations 20000]
+"""
+import argparse
+import contextlib
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+# Benchmark runs log heavily; keep their files out of the project's logs/ directory
+os.environ.setdefault("MARKETPLACE_CALC_LOG_DIR", os.path.join(tempfile.gettempdir(), "marketplace-calc-benchmark-logs"))
+
+from src.utils.calculator import ProfitCalculator
+from src.utils.config_loader import ConfigLoader
+from src.utils.logger import Logger
+
+LEVELS = ("DEBUG", "INFO", "WARNING")
+
+def make_rows(marketplace, carrier, count):
+    rng = random.Random(0)
+    tiers = list(marketplace.tiers)
+    services = [service_id for service_id, service in carrier.services.items() if not service.manual_entry]
+    rows = []
+    for _ in range(count):
+        service_id = rng.choice(services)
+        quantity = rng.randint(1, 4)
+        # Keep the parcel within the service's limits so no row logs an out-of-range WARNING
+        limits = carrier.services[service_id].weight_limits
+        heaviest = min(8.0, limits["max"] / quantity)
+        lightest = min(0.5, heaviest)
+        weight_per_item = max(math.floor(rng.uniform(lightest, heaviest) * 10) / 10, lightest)
+        rows.append(dict(sale_price=round(rng.uniform(1, 200), 2), quantity=quantity,
+                         cost_per_item=round(rng.uniform(0, 50), 2), weight_per_item=weight_per_item,
+                         tier_id=rng.choice(tiers), shipping_service_id=service_id))
+    return rows
+
+def time_level(level, marketplace, carrier, rows):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        Logger.configure(level=level)
+        calculator = ProfitCalculator(marketplace, carrier)
+        start = time.perf_counter()
+        for row in rows:
+            calculator.calculate_profit(**row)
+        elapsed = time.perf_counter() - start
+        Logger.shutdown()
+    return elapsed / len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calculations", type=int, default=20000)
+    args = parser.parse_args()
+
+    marketplace = ConfigLoader.load_marketplaces(os.path.join(project_root, "data", "marketplaces"))["eBay"]
+    carrier = ConfigLoader.load_shipping_carriers(os.path.join(project_root, "data", "shipping"))["USPS"]
+    rows = make_rows(marketplace, carrier, args.calculations)
+
+    timings = {level: time_level(level, marketplace, carrier, rows) for level in LEVELS}
+    baseline = timings["WARNING"]
+    print(f"{args.calculations} calculations per level")
+    for level in LEVELS:
+        print(f"{level:<8} {timings[level] * 1e6:8.2f} us/calculation  "
+              f"({timings[level] / baseline:5.1f}x WARNING)")
+
+if __name__ == "__main__":
+    main()
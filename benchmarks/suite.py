@@ -0,0 +1,215 @@
+# benchmarks/suite.py
+"""
+Benchmark suite for the calculator, fee, shipping, config-loading and
+logging hot paths, on seeded synthetic configs (hundreds of tiers,
+thousand-break rate tables) and inventories. Reports ops/sec and per-op
+latency percentiles, and compares ops/sec against a saved baseline: any
+benchmark slower than the baseline by more than --tolerance is reported
+as a regression and the run exits with status 1.
+
+    python benchmarks/suite.py --save-baseline        # record benchmarks/baseline.json
+    python benchmarks/suite.py                        # compare against it
+    python benchmarks/suite.py --filter shipping --samples 20
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+# Benchmark runs log heavily; keep their files out of the project's logs/ directory
+os.environ.setdefault("MARKETPLACE_CALC_LOG_DIR", os.path.join(tempfile.gettempdir(), "marketplace-calc-benchmark-logs"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from src.models.fee import Fee, FeeType, FeeApplication
+from src.utils.calculator import ProfitCalculator
+from src.utils.config_loader import ConfigLoader
+from src.utils.logger import Logger
+import synthetic
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    samples: int
+    ops_per_sample: int
+
+# A benchmark's setup returns (run_one_sample, ops_per_sample)
+Benchmark = Tuple[str, Callable[[], Tuple[Callable[[], None], int]]]
+
+def measure(name: str, run_sample: Callable[[], None], ops_per_sample: int, samples: int,
+            warmup: int) -> BenchmarkResult:
+    for _ in range(warmup):
+        run_sample()
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        run_sample()
+        durations.append(time.perf_counter() - start)
+    per_op = sorted(duration / ops_per_sample * 1e6 for duration in durations)
+
+    def percentile(fraction):
+        return per_op[min(len(per_op) - 1, int(fraction * len(per_op)))]
+    return BenchmarkResult(
+        name=name,
+        ops_per_sec=samples * ops_per_sample / sum(durations),
+        p50_us=statistics.median(per_op),
+        p90_us=percentile(0.90),
+        p99_us=percentile(0.99),
+        samples=samples,
+        ops_per_sample=ops_per_sample
+    )
+
+def build_benchmarks(workdir: str, rows: int) -> List[Benchmark]:
+    paths = synthetic.write_configs(workdir)
+    marketplace = ConfigLoader.load_marketplace(paths["marketplace"])
+    carrier = ConfigLoader.load_shipping(paths["shipping"])
+    listings = synthetic.inventory(marketplace, carrier, rows)
+    calculator = ProfitCalculator(marketplace, carrier)
+    columns = {name: [listing[name] for listing in listings] for name in listings[0]}
+    prices = [(listing["sale_price"], listing["quantity"]) for listing in listings]
+    weights = [listing["weight_per_item"] * listing["quantity"] for listing in listings]
+    zones = [listing["zone"] or "1" for listing in listings]
+    table, zoned = carrier.services["table"], carrier.services["zoned"]
+
+    def fee_benchmark(fee):
+        def setup():
+            def run():
+                for price, quantity in prices:
+                    fee.calculate(price, quantity)
+            return run, len(prices)
+        return setup
+
+    def get_rate_benchmark(service, with_zone):
+        def setup():
+            def run():
+                for weight, zone in zip(weights, zones):
+                    service.get_rate(weight, zone=zone if with_zone else None,
+                                     dimensions=(6.0, 4.0, 2.0) if with_zone else None)
+            return run, len(weights)
+        return setup
+
+    def get_rates_setup():
+        weight_array = np.asarray(weights)
+        return (lambda: table.get_rates(weight_array)), len(weights)
+
+    def calculate_profit_setup():
+        def run():
+            for listing in listings:
+                calculator.calculate_profit(**listing)
+        return run, len(listings)
+
+    def calculate_profit_batch_setup():
+        return (lambda: calculator.calculate_profit_batch(**columns)), len(listings)
+
+    def loader_setup(load, path):
+        def setup():
+            return (lambda: load(path)), 1
+        return setup
+
+    def logger_setup(level, use_queue):
+        def setup():
+            Logger.configure(level=level, use_queue=use_queue)
+            logger = Logger.get_logger()
+
+            def run():
+                for index in range(1000):
+                    logger.info("Benchmark record %d for %s", index, "listing")
+            return run, 1000
+        return setup
+
+    return [
+        ("fee.calculate.percentage", fee_benchmark(
+            Fee(type=FeeType.PERCENTAGE, application=FeeApplication.PER_ITEM, percentage=12.55))),
+        ("fee.calculate.compound", fee_benchmark(
+            Fee(type=FeeType.COMPOUND, application=FeeApplication.PER_ORDER, percentage=2.9, flat_fee=0.30))),
+        ("shipping.get_rate.table", get_rate_benchmark(table, with_zone=False)),
+        ("shipping.get_rate.zoned_dim", get_rate_benchmark(zoned, with_zone=True)),
+        ("shipping.get_rates.table", get_rates_setup),
+        ("calculator.calculate_profit", calculate_profit_setup),
+        ("calculator.calculate_profit_batch", calculate_profit_batch_setup),
+        ("config.load_marketplace", loader_setup(ConfigLoader.load_marketplace, paths["marketplace"])),
+        ("config.load_shipping", loader_setup(ConfigLoader.load_shipping, paths["shipping"])),
+        ("logger.info.disabled", logger_setup("WARNING", False)),
+        ("logger.info.enabled", logger_setup("INFO", False)),
+        ("logger.info.queued", logger_setup("INFO", True)),
+    ]
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Prints each result against the baseline; returns the names of regressions.
+    """
+    regressions = []
+    print(f"{'benchmark':<36} {'ops/sec':>14} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} {'vs baseline':>12}")
+    for result in results:
+        change = ""
+        if result.name in baseline:
+            ratio = result.ops_per_sec / baseline[result.name]["ops_per_sec"]
+            change = f"{(ratio - 1) * 100:+.1f}%"
+            if ratio < 1 - tolerance:
+                change += "  REGRESSION"
+                regressions.append(result.name)
+        print(f"{result.name:<36} {result.ops_per_sec:>14,.0f} {result.p50_us:>9.2f} {result.p90_us:>9.2f} "
+              f"{result.p99_us:>9.2f} {change:>12}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--samples", type=int, default=30, help="Timed samples per benchmark (default: 30)")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed samples first (default: 3)")
+    parser.add_argument("--rows", type=int, default=2000, help="Synthetic inventory size (default: 2000)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed ops/sec drop before a benchmark counts as a regression (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = []
+    # Console log output goes to os.devnull; only the logger benchmarks enable records at all
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        Logger.configure(level="WARNING", use_queue=False)
+        for name, setup in build_benchmarks(workdir, args.rows):
+            if args.filter and args.filter not in name:
+                continue
+            run_sample, ops_per_sample = setup()
+            results.append(measure(name, run_sample, ops_per_sample, args.samples, args.warmup))
+            Logger.configure(level="WARNING", use_queue=False)
+        Logger.shutdown()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": {result.name: asdict(result) for result in results}}, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}: "
+              f"{', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# benchmarks/synthetic.py
+"""
+Seeded generators for benchmark inputs: marketplace configs with hundreds
+of tiers, shipping configs with thousand-break rate tables and zoned rate
+matrices, and inventories priced against them. The same seed always
+produces the same files and rows.
+"""
+import json
+import os
+import random
+from typing import Dict, List
+
+FEE_SHAPES = ("percentage", "flat", "compound")
+APPLICATIONS = ("per_item", "per_order")
+
+def marketplace_config(name: str = "Synthetic", tiers: int = 300, fees_per_tier: int = 4, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    config = {"name": name, "tiers": {}}
+    for tier_index in range(tiers):
+        fees = {}
+        for fee_index in range(fees_per_tier):
+            shape = rng.choice(FEE_SHAPES)
+            fee = {"type": shape, "application": rng.choice(APPLICATIONS)}
+            if shape == "compound":
+                fee.update(percentage=round(rng.uniform(0.5, 4), 2), flat_fee=round(rng.uniform(0, 1), 2))
+            elif shape == "percentage":
+                fee["value"] = round(rng.uniform(1, 15), 2)
+            else:
+                fee["value"] = round(rng.uniform(0.05, 2), 2)
+            fees[f"fee_{fee_index}"] = fee
+        config["tiers"][f"tier_{tier_index}"] = {"name": f"Tier {tier_index}", "fees": fees}
+    return config
+
+def shipping_config(name: str = "SyntheticPost", breaks: int = 1000, zones: int = 8, seed: int = 0) -> dict:
+    """
+    One service with a flat rate table and one with a zoned rate matrix,
+    each with `breaks` weight breaks of 0.25 oz (the matrix bills in 0.25 oz
+    units, so every break is reachable).
+    """
+    rng = random.Random(seed)
+    weights = [round(0.25 * (index + 1), 2) for index in range(breaks)]
+    prices = []
+    price = 3.0
+    for _ in weights:
+        price = round(price + rng.uniform(0, 0.05), 2)
+        prices.append(price)
+    return {
+        "name": name,
+        "services": {
+            "table": {
+                "name": "Rate Table",
+                "weight_limits": {"min": 0, "max": weights[-1]},
+                "rates": [{"weight_up_to": weight, "price": price} for weight, price in zip(weights, prices)]
+            },
+            "zoned": {
+                "name": "Zoned",
+                "weight_limits": {"min": 0, "max": weights[-1]},
+                "rate_matrix": {
+                    "zones": [str(zone + 1) for zone in range(zones)],
+                    "weight_breaks": weights,
+                    "weight_unit": 0.25,
+                    "prices": [[round(price * (1 + 0.1 * zone), 2) for zone in range(zones)] for price in prices]
+                },
+                "dim_divisor": 139
+            }
+        }
+    }
+
+def write_configs(directory: str, tiers: int = 300, breaks: int = 1000, seed: int = 0) -> Dict[str, str]:
+    """
+    Writes one marketplace and one shipping config; returns their paths.
+    """
+    paths = {
+        "marketplace": os.path.join(directory, "marketplaces", "synthetic.json"),
+        "shipping": os.path.join(directory, "shipping", "synthetic.json"),
+    }
+    configs = {
+        "marketplace": marketplace_config(tiers=tiers, seed=seed),
+        "shipping": shipping_config(breaks=breaks, seed=seed),
+    }
+    for kind, path in paths.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(configs[kind], f)
+    return paths
+
+def inventory(marketplace, carrier, count: int, seed: int = 0) -> List[dict]:
+    """
+    calculate_profit keyword arguments for `count` listings that every
+    non-manual service of the carrier can ship.
+    """
+    rng = random.Random(seed)
+    tiers = list(marketplace.tiers)
+    services = [service_id for service_id, service in carrier.services.items() if not service.manual_entry]
+    max_weight = min(carrier.services[service_id].weight_limits["max"] for service_id in services)
+    rows = []
+    for _ in range(count):
+        quantity = rng.randint(1, 4)
+        service_id = rng.choice(services)
+        zones = carrier.services[service_id].rate_matrix
+        rows.append(dict(
+            sale_price=round(rng.uniform(1, 300), 2),
+            quantity=quantity,
+            cost_per_item=round(rng.uniform(0, 100), 2),
+            weight_per_item=round(rng.uniform(0.1, max_weight / quantity / 2), 2),
+            tier_id=rng.choice(tiers),
+            shipping_service_id=service_id,
+            zone=rng.choice(zones.zones) if zones is not None else None
+        ))
+    return rows
@@ -1,42 +1,133 @@
 # src/main.py
+import argparse
+import contextlib
 import sys
 import os
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)  # Changed from append to insert(0) to give it priority
 
-from PyQt5.QtWidgets import QApplication
-from src.ui.main_window import MainWindow  # Changed to absolute import
-from src.utils.config_loader import ConfigLoader
+from src.utils.config_registry import ConfigRegistry
+from src.utils.logger import Logger, OVERFLOW_POLICIES
+from src.utils.profiling import Instrumentation, profile_run
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Marketplace Profit Calculator")
+    parser.add_argument("--log-level", help="Lowest level logged, e.g. WARNING for quiet production runs "
+                                            "(default: DEBUG, or $MARKETPLACE_CALC_LOG_LEVEL)")
+    parser.add_argument("--no-config-cache", action="store_true",
+                        help="Always parse config JSON instead of loading compiled snapshots from .cache/configs")
+    parser.add_argument("--log-queue", action="store_true",
+                        help="Write log records from a background thread instead of the caller's")
+    parser.add_argument("--log-overflow", choices=OVERFLOW_POLICIES, default="block",
+                        help="With --log-queue, block or drop records when the queue is full (default: block)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Time calculator, config loading and UI stages and print a report on exit")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Run under cProfile and write the stats to PATH; GUI and serve calculations "
+                             "on worker threads are profiled per task and merged into the same file")
+    subparsers = parser.add_subparsers(dest="command")
+
+    reprice = subparsers.add_parser(
+        "reprice", help="Stream a CSV/JSONL inventory file through the calculator without the GUI")
+    reprice.add_argument("input", help="Inventory file (.csv or .jsonl)")
+    reprice.add_argument("output", help="Results file (.csv or .jsonl)")
+    reprice.add_argument("--rejects", help="File for rows that fail to parse or validate "
+                                           "(default: <output>.rejects.<ext>)")
+    reprice.add_argument("--marketplace", help="Marketplace name for rows without a marketplace column")
+    reprice.add_argument("--carrier", help="Carrier name for rows without a carrier column")
+    reprice.add_argument("--chunk-size", type=int, default=1000,
+                         help="Rows calculated per batch; 1 processes row by row (default: 1000)")
+
+    serve = subparsers.add_parser("serve", help="Serve profit calculations over HTTP/JSON")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    serve.add_argument("--batch-window-ms", type=float, default=2.0,
+                       help="How long single calculations wait to be batched together (default: 2)")
+    serve.add_argument("--max-batch", type=int, default=512,
+                       help="Calculations per batch before it is priced early (default: 512)")
+    return parser.parse_args(argv)
+
+def run_reprice(args, marketplaces, shipping_carriers):
+    from src.utils.repricer import InventoryRepricer
+
+    rejects_path = args.rejects
+    if not rejects_path:
+        base, extension = os.path.splitext(args.output)
+        rejects_path = f"{base}.rejects{extension}"
+
+    repricer = InventoryRepricer(
+        marketplaces,
+        shipping_carriers,
+        default_marketplace=args.marketplace,
+        default_carrier=args.carrier,
+        chunk_size=args.chunk_size
+    )
+    summary = repricer.reprice(args.input, args.output, rejects_path)
+    print(f"Read {summary.rows_read} rows: {summary.rows_written} written to {args.output}, "
+          f"{summary.rows_rejected} rejected to {rejects_path}")
+    return 0
+
+def run_serve(args, marketplaces, shipping_carriers):
+    import asyncio
+    from src.utils.pricing_service import PricingService
+
+    # Load every config up front so no request pays for parsing
+    marketplaces.warm_up()
+    shipping_carriers.warm_up()
+    service = PricingService(marketplaces, shipping_carriers,
+                             batch_window=args.batch_window_ms / 1000, max_batch_size=args.max_batch)
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def run_gui(marketplaces, shipping_carriers):
+    from PyQt5.QtWidgets import QApplication
+    from src.ui.main_window import MainWindow  # Changed to absolute import
+
+    app = QApplication(sys.argv)
+    window = MainWindow(marketplaces, shipping_carriers)
+    window.show()
+    return app.exec_()
+
+def run_command(args):
+    # Load marketplace and shipping configurations, from snapshots where the JSON is unchanged
+    cache = None
+    if not args.no_config_cache:
+        from src.utils.config_cache import ConfigSnapshotCache
+        cache = ConfigSnapshotCache(os.path.join(project_root, ".cache", "configs"))
+    # Registries index configs by name up front and build each one on first use
+    marketplaces = ConfigRegistry.marketplaces(os.path.join(project_root, "data", "marketplaces"), cache)
+    shipping_carriers = ConfigRegistry.shipping_carriers(os.path.join(project_root, "data", "shipping"), cache)
+
+    if args.command == "reprice":
+        return run_reprice(args, marketplaces, shipping_carriers)
+    if args.command == "serve":
+        return run_serve(args, marketplaces, shipping_carriers)
+
+    # Create and show the application
+    return run_gui(marketplaces, shipping_carriers)
 
 def main():
     # Add the project root directory to Python path
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     sys.path.append(project_root)
-    
-    # Load marketplace configurations
-    marketplaces = {}
-    marketplace_dir = os.path.join(project_root, "data", "marketplaces")
-    for filename in os.listdir(marketplace_dir):
-        if filename.endswith(".json"):
-            filepath = os.path.join(marketplace_dir, filename)
-            marketplace = ConfigLoader.load_marketplace(filepath)
-            marketplaces[marketplace.name] = marketplace
-    
-    # Load shipping configurations
-    shipping_carriers = {}
-    shipping_dir = os.path.join(project_root, "data", "shipping")
-    for filename in os.listdir(shipping_dir):
-        if filename.endswith(".json"):
-            filepath = os.path.join(shipping_dir, filename)
-            carrier = ConfigLoader.load_shipping(filepath)
-            shipping_carriers[carrier.name] = carrier
-    
-    # Create and show the application
-    app = QApplication(sys.argv)
-    window = MainWindow(marketplaces, shipping_carriers)
-    window.show()
-    sys.exit(app.exec_())
+
+    args = parse_args(sys.argv[1:])
+    if args.log_queue or args.log_level:
+        Logger.configure(use_queue=args.log_queue, overflow_policy=args.log_overflow, level=args.log_level)
+    if args.timings:
+        Instrumentation.enable()
+    profiler = profile_run(args.profile) if args.profile else contextlib.nullcontext()
+    with profiler:
+        status = run_command(args)
+    if args.timings:
+        report = Instrumentation.report()
+        Logger.get_logger().info("Stage timings:\n%s", report)
+        print(report, file=sys.stderr)
+    sys.exit(status)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,4 +1,5 @@
 # src/models/fee.py
+import logging
 from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Optional, Union, Dict
@@ -15,16 +16,38 @@ class FeeApplication(Enum):
     PER_ITEM = "per_item"
     PER_ORDER = "per_order"
 
+ROUNDING_MODES = ("half_up", "half_even", "down", "up")
+ROUNDING_SCOPES = ("order", "item")
+
+@dataclass(frozen=True)
+class FeeRounding:
+    """
+    How a fee's percentage part is rounded to whole cents in fixed-point
+    money mode. per="item" rounds the fee on one item and multiplies by
+    quantity; per="order" rounds once on the whole line. Per-order fees are
+    rounded once either way.
+    """
+    mode: str = "half_up"
+    per: str = "order"
+
+    def __post_init__(self):
+        if self.mode not in ROUNDING_MODES:
+            raise ValueError(f"Rounding mode must be one of {', '.join(ROUNDING_MODES)}")
+        if self.per not in ROUNDING_SCOPES:
+            raise ValueError(f"Rounding per must be one of {', '.join(ROUNDING_SCOPES)}")
+
 @dataclass
 class Fee:
     type: FeeType
     application: FeeApplication
     percentage: Optional[float] = None
     flat_fee: Optional[float] = None
+    # Fixed-point rounding rule; None uses the marketplace default
+    rounding: Optional[FeeRounding] = None
 
     def __post_init__(self):
-        logger.debug(f"Created Fee object: type={self.type}, application={self.application}, "
-                    f"percentage={self.percentage}, flat_fee={self.flat_fee}")
+        logger.debug("Created Fee object: type=%s, application=%s, percentage=%s, flat_fee=%s",
+                     self.type, self.application, self.percentage, self.flat_fee)
         self._validate()
 
     def _validate(self):
@@ -41,30 +64,69 @@ class Fee:
             raise ValueError("Compound fee requires both percentage and flat fee values")
 
     def calculate(self, base_amount: float, quantity: int = 1) -> float:
-        logger.debug(f"Calculating fee for base_amount={base_amount}, quantity={quantity}")
+        # Checked once: this runs for every fee of every calculation
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Calculating fee for base_amount=%s, quantity=%s", base_amount, quantity)
         
         try:
             if self.type == FeeType.PERCENTAGE:
                 fee = base_amount * (self.percentage / 100)
-                logger.debug(f"Calculated percentage fee: {fee}")
+                if debug:
+                    logger.debug("Calculated percentage fee: %s", fee)
             elif self.type == FeeType.FLAT:
                 fee = self.flat_fee
-                logger.debug(f"Applied flat fee: {fee}")
+                if debug:
+                    logger.debug("Applied flat fee: %s", fee)
             else:  # COMPOUND
                 fee = (base_amount * (self.percentage / 100)) + self.flat_fee
-                logger.debug(f"Calculated compound fee: {fee} "
-                           f"(percentage={base_amount * (self.percentage / 100)}, "
-                           f"flat={self.flat_fee})")
+                if debug:
+                    logger.debug("Calculated compound fee: %s (percentage=%s, flat=%s)",
+                                 fee, base_amount * (self.percentage / 100), self.flat_fee)
 
             if self.application == FeeApplication.PER_ITEM:
                 final_fee = fee * quantity
-                logger.debug(f"Applied per-item multiplication: {final_fee}")
+                if debug:
+                    logger.debug("Applied per-item multiplication: %s", final_fee)
             else:
                 final_fee = fee
-                logger.debug("Fee applied per order, no quantity multiplication")
+                if debug:
+                    logger.debug("Fee applied per order, no quantity multiplication")
 
             return final_fee
             
         except Exception as e:
-            logger.error(f"Error calculating fee: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            logger.error("Error calculating fee: %s", e, exc_info=True)
+            raise
+
+@dataclass(frozen=True)
+class FeeKernel:
+    """
+    A tier's fees folded into four coefficients, so the total for a sale is
+    per_item_rate*price*qty + per_order_rate*price + per_item_flat*qty + per_order_flat.
+    Rates are fractions (12.55% -> 0.1255). Works on floats and NumPy arrays.
+    """
+    per_item_rate: float = 0.0
+    per_order_rate: float = 0.0
+    per_item_flat: float = 0.0
+    per_order_flat: float = 0.0
+
+    @staticmethod
+    def compile(fees: Dict[str, Fee]) -> "FeeKernel":
+        rates = {FeeApplication.PER_ITEM: 0.0, FeeApplication.PER_ORDER: 0.0}
+        flats = {FeeApplication.PER_ITEM: 0.0, FeeApplication.PER_ORDER: 0.0}
+        for fee in fees.values():
+            if fee.type in (FeeType.PERCENTAGE, FeeType.COMPOUND):
+                rates[fee.application] += fee.percentage / 100
+            if fee.type in (FeeType.FLAT, FeeType.COMPOUND):
+                flats[fee.application] += fee.flat_fee
+        return FeeKernel(
+            per_item_rate=rates[FeeApplication.PER_ITEM],
+            per_order_rate=rates[FeeApplication.PER_ORDER],
+            per_item_flat=flats[FeeApplication.PER_ITEM],
+            per_order_flat=flats[FeeApplication.PER_ORDER]
+        )
+
+    def total(self, sale_price, quantity):
+        return (self.per_item_rate * sale_price * quantity + self.per_order_rate * sale_price
+                + self.per_item_flat * quantity + self.per_order_flat)
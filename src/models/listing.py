@@ -0,0 +1,22 @@
+# src/models/listing.py
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+@dataclass
+class Listing:
+    """
+    One set of calculate_profit inputs. marketplace and carrier name the
+    configs to price against when the caller handles several at once.
+    package_dimensions is (length, width, height) in inches.
+    """
+    sale_price: float
+    quantity: int
+    cost_per_item: float
+    weight_per_item: float
+    tier_id: str
+    shipping_service_id: str
+    manual_shipping_price: Optional[float] = None
+    zone: Optional[str] = None
+    package_dimensions: Optional[Tuple[float, float, float]] = None
+    marketplace: Optional[str] = None
+    carrier: Optional[str] = None
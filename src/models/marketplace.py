@@ -1,7 +1,8 @@
 # src/models/marketplace.py
-from dataclasses import dataclass
-from typing import Dict, List
-from models.fee import Fee
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from src.models.fee import Fee, FeeKernel, FeeRounding
 from src.utils.logger import Logger
 
 logger = Logger.get_logger()
@@ -10,16 +11,34 @@ logger = Logger.get_logger()
 class SellerTier:
     name: str
     fees: Dict[str, Fee]
+    fee_kernel: FeeKernel = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        logger.info(f"Created SellerTier: {self.name} with {len(self.fees)} fees")
-        logger.debug(f"SellerTier fees: {', '.join(self.fees.keys())}")
+        logger.info("Created SellerTier: %s with %d fees", self.name, len(self.fees))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("SellerTier fees: %s", ', '.join(self.fees.keys()))
+        self.fee_kernel = FeeKernel.compile(self.fees)
+
+    def total_fees(self, sale_price: float, quantity: int) -> float:
+        """
+        Total marketplace fees from the precompiled kernel, without per-fee dispatch.
+        """
+        return self.fee_kernel.total(sale_price, quantity)
+
+    def fee_breakdown(self, sale_price: float, quantity: int) -> Dict[str, float]:
+        """
+        Named per-fee amounts. Slower than total_fees; only needed for display.
+        """
+        return {fee_name: fee.calculate(sale_price, quantity) for fee_name, fee in self.fees.items()}
 
 @dataclass
 class Marketplace:
     name: str
     tiers: Dict[str, SellerTier]
+    # Default fixed-point rounding for fees without their own rule
+    rounding: Optional[FeeRounding] = None
 
     def __post_init__(self):
-        logger.info(f"Created Marketplace: {self.name} with {len(self.tiers)} tiers")
-        logger.debug(f"Marketplace tiers: {', '.join(self.tiers.keys())}")
\ No newline at end of file
+        logger.info("Created Marketplace: %s with %d tiers", self.name, len(self.tiers))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Marketplace tiers: %s", ', '.join(self.tiers.keys()))
\ No newline at end of file
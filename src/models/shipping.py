@@ -1,57 +1,315 @@
 # src/models/shipping.py
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import logging
+import math
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
 from src.utils.logger import Logger
 
 logger = Logger.get_logger()
 
+OUNCES_PER_POUND = 16
+# Slack when rounding weights up to whole billing units, so 1.1 / 0.1 bills 11 units, not 12
+_WEIGHT_EPSILON = 1e-9
+
+def is_whole_units(weight: float, weight_unit: float) -> bool:
+    """
+    Whether weight is a whole multiple of weight_unit (within _WEIGHT_EPSILON units).
+    """
+    units = weight / weight_unit
+    return abs(units - round(units)) <= _WEIGHT_EPSILON
+
 @dataclass
 class ShippingRate:
     weight_up_to: float
     price: float
 
     def __post_init__(self):
-        logger.debug(f"Created ShippingRate: weight_up_to={self.weight_up_to}, price={self.price}")
+        logger.debug("Created ShippingRate: weight_up_to=%s, price=%s", self.weight_up_to, self.price)
+
+@dataclass
+class ShippingRateMatrix:
+    """
+    Prices by weight break (rows of prices) and destination zone (columns).
+    Weights are rounded up to a whole weight_unit, and a dense table built at
+    construction maps each unit count straight to its row, so a lookup is two
+    array indexes rather than a search. The table has one entry per unit up
+    to the largest break, so choose the coarsest unit the carrier bills in.
+    """
+    zones: List[str]
+    weight_breaks: List[float]
+    prices: List[List[float]]
+    weight_unit: float = 1.0
+    _zone_columns: Dict[str, int] = field(init=False, repr=False, compare=False)
+    _unit_rows: List[int] = field(init=False, repr=False, compare=False)
+    _price_rows: List[List[Optional[float]]] = field(init=False, repr=False, compare=False)
+    _unit_row_array: np.ndarray = field(init=False, repr=False, compare=False)
+    _price_array: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        logger.debug("Created ShippingRateMatrix: %d weight breaks x %d zones, weight_unit=%s",
+                     len(self.weight_breaks), len(self.zones), self.weight_unit)
+        self._validate()
+        self.build_index()
+
+    def _validate(self):
+        if self.weight_unit <= 0:
+            raise ValueError("Rate matrix weight_unit must be greater than 0")
+        if not self.zones or len(set(self.zones)) != len(self.zones):
+            raise ValueError("Rate matrix zones must be non-empty and unique")
+        if not self.weight_breaks:
+            raise ValueError("Rate matrix requires at least one weight break")
+        for weight in self.weight_breaks:
+            # Weights bill in whole units, so a break between units could never be matched exactly
+            if not is_whole_units(weight, self.weight_unit):
+                raise ValueError(f"Rate matrix weight break {weight} is not a whole multiple "
+                                 f"of weight_unit {self.weight_unit}")
+        if len(self.prices) != len(self.weight_breaks):
+            raise ValueError(f"Rate matrix has {len(self.weight_breaks)} weight breaks "
+                             f"but {len(self.prices)} price rows")
+        for row_index, row in enumerate(self.prices):
+            if len(row) != len(self.zones):
+                raise ValueError(f"Rate matrix price row {row_index} has {len(row)} prices "
+                                 f"for {len(self.zones)} zones")
+
+    def build_index(self) -> None:
+        order = sorted(range(len(self.weight_breaks)), key=lambda index: self.weight_breaks[index])
+        breaks = [self.weight_breaks[index] for index in order]
+        self._zone_columns = {str(zone): column for column, zone in enumerate(self.zones)}
+
+        # _unit_rows[k] is the first row whose break covers k units; the final
+        # row of _price_rows is the "no rate" row for weights above every break
+        unit_count = math.ceil(breaks[-1] / self.weight_unit - _WEIGHT_EPSILON)
+        self._unit_rows = []
+        row = 0
+        for units in range(unit_count + 1):
+            while row < len(breaks) and breaks[row] < units * self.weight_unit - _WEIGHT_EPSILON:
+                row += 1
+            self._unit_rows.append(row)
+        self._unit_rows.append(len(breaks))
+
+        self._price_rows = [list(self.prices[index]) for index in order] + [[None] * len(self.zones)]
+        self._unit_row_array = np.array(self._unit_rows, dtype=np.intp)
+        self._price_array = np.array(
+            [list(self.prices[index]) for index in order] + [[np.nan] * len(self.zones)],
+            dtype=np.float64
+        )
+
+    def breakpoints(self) -> List[float]:
+        """
+        Weights at which get_price changes: the price is constant between
+        consecutive breakpoints and at each breakpoint itself.
+        """
+        return [units * self.weight_unit for units in range(len(self._unit_rows) - 1)
+                if self._unit_rows[units] != self._unit_rows[units + 1]]
+
+    def zone_column(self, zone: Optional[str]) -> int:
+        if zone is None:
+            if len(self.zones) == 1:
+                return 0
+            raise ValueError(f"A zone is required; available zones: {', '.join(self.zones)}")
+        column = self._zone_columns.get(str(zone))
+        if column is None:
+            raise ValueError(f"Unknown zone: {zone}. Available zones: {', '.join(self.zones)}")
+        return column
+
+    def get_price(self, weight: float, zone: Optional[str] = None) -> Optional[float]:
+        column = self.zone_column(zone)
+        units = max(math.ceil(weight / self.weight_unit - _WEIGHT_EPSILON), 0)
+        if units >= len(self._unit_rows):
+            return None
+        return self._price_rows[self._unit_rows[units]][column]
+
+    def get_prices(
+        self,
+        weights: np.ndarray,
+        zones: Union[str, Sequence[Optional[str]], None] = None
+    ) -> np.ndarray:
+        """
+        Vectorized get_price; NaN where get_price returns None.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if zones is None or isinstance(zones, str):
+            columns = self.zone_column(zones)
+        else:
+            columns = np.fromiter((self.zone_column(zone) for zone in zones),
+                                  dtype=np.intp, count=len(weights))
+        units = np.ceil(weights / self.weight_unit - _WEIGHT_EPSILON)
+        last = len(self._unit_row_array) - 1
+        units = np.where(np.isnan(units), last, np.clip(units, 0, last)).astype(np.intp)
+        return self._price_array[self._unit_row_array[units], columns]
 
 @dataclass
 class ShippingService:
+    """
+    A carrier service priced either by a flat list of weight breaks (rates)
+    or by a weight x zone rate_matrix. With dim_divisor set (cubic inches
+    per pound), parcels larger than dim_min_volume cubic inches are billed
+    at the greater of actual and dimensional weight.
+    """
     name: str
     weight_limits: Dict[str, float]
     rates: List[ShippingRate] = None
     manual_entry: bool = False
+    rate_matrix: Optional[ShippingRateMatrix] = None
+    dim_divisor: Optional[float] = None
+    dim_min_volume: float = 0.0
+    # Rate index built once from rates, sorted by weight_up_to: plain lists for
+    # bisect in get_rate, arrays for get_rates. Call build_rate_index() after
+    # modifying rates in place.
+    _rate_breaks: List[float] = field(init=False, repr=False, compare=False)
+    _rate_prices: List[float] = field(init=False, repr=False, compare=False)
+    _rate_break_array: np.ndarray = field(init=False, repr=False, compare=False)
+    _rate_price_array: np.ndarray = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        logger.info(f"Created ShippingService: {self.name}")
-        logger.debug(f"Weight limits: min={self.weight_limits['min']}, max={self.weight_limits['max']}")
-        if self.rates:
-            logger.debug(f"Number of rates: {len(self.rates)}")
-        if self.manual_entry:
-            logger.debug("Manual entry enabled for this service")
+        logger.info("Created ShippingService: %s", self.name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Weight limits: min=%s, max=%s", self.weight_limits['min'], self.weight_limits['max'])
+            if self.rates:
+                logger.debug("Number of rates: %d", len(self.rates))
+            if self.manual_entry:
+                logger.debug("Manual entry enabled for this service")
+            if self.rate_matrix:
+                logger.debug("Rate matrix zones: %s", ', '.join(self.rate_matrix.zones))
+            if self.dim_divisor:
+                logger.debug("Dimensional weight divisor: %s", self.dim_divisor)
+        self.build_rate_index()
+
+    def build_rate_index(self) -> None:
+        rates = sorted(self.rates or [], key=lambda x: x.weight_up_to)
+        self._rate_breaks = [rate.weight_up_to for rate in rates]
+        self._rate_prices = [rate.price for rate in rates]
+        self._rate_break_array = np.array(self._rate_breaks, dtype=np.float64)
+        # Trailing NaN answers weights above the last break
+        self._rate_price_array = np.array(self._rate_prices + [np.nan], dtype=np.float64)
+
+    def billable_weight(
+        self,
+        weight: float,
+        dimensions: Optional[Tuple[float, float, float]] = None
+    ) -> float:
+        """
+        Greater of actual weight and dimensional weight, in ounces.
+        dimensions is (length, width, height) in inches.
+        """
+        if not self.dim_divisor or dimensions is None:
+            return weight
+        length, width, height = dimensions
+        volume = length * width * height
+        if volume <= self.dim_min_volume:
+            return weight
+        return max(weight, volume / self.dim_divisor * OUNCES_PER_POUND)
 
-    def get_rate(self, weight: float, manual_price: float = None) -> Optional[float]:
-        logger.debug(f"Getting shipping rate for weight: {weight}")
+    def get_rate(
+        self,
+        weight: float,
+        manual_price: float = None,
+        zone: Optional[str] = None,
+        dimensions: Optional[Tuple[float, float, float]] = None
+    ) -> Optional[float]:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Getting shipping rate for weight: %s", weight)
         
         if weight < self.weight_limits["min"] or weight > self.weight_limits["max"]:
-            logger.warning(f"Weight {weight} is outside limits: "
-                         f"min={self.weight_limits['min']}, max={self.weight_limits['max']}")
+            logger.warning("Weight %s is outside limits: min=%s, max=%s",
+                           weight, self.weight_limits['min'], self.weight_limits['max'])
             return None
 
         if self.manual_entry:
             return manual_price
 
-        for rate in sorted(self.rates, key=lambda x: x.weight_up_to):
-            if weight <= rate.weight_up_to:
-                logger.debug(f"Found applicable rate: {rate.price} for weight {weight}")
-                return rate.price
-                
-        logger.warning(f"No applicable rate found for weight: {weight}")
+        price = self.price_for_billable_weight(self.billable_weight(weight, dimensions), zone)
+        if price is not None:
+            if debug:
+                logger.debug("Found applicable rate: %s for weight %s", price, weight)
+            return price
+
+        logger.warning("No applicable rate found for weight: %s", weight)
+        return None
+
+    def serves_zone(self, zone: Optional[str]) -> bool:
+        """
+        Whether get_rate can price this zone (services without a rate matrix serve all zones).
+        """
+        if self.rate_matrix is None:
+            return True
+        if zone is None:
+            return len(self.rate_matrix.zones) == 1
+        return str(zone) in self.rate_matrix.zones
+
+    def rate_breakpoints(self) -> List[float]:
+        """
+        Billable weights at which price_for_billable_weight can change.
+        """
+        if self.rate_matrix is not None:
+            return self.rate_matrix.breakpoints()
+        return list(self._rate_breaks)
+
+    def price_for_billable_weight(self, weight: float, zone: Optional[str] = None) -> Optional[float]:
+        """
+        Rate table lookup only: no weight limits, manual entry or DIM weight.
+        """
+        if self.rate_matrix is not None:
+            return self.rate_matrix.get_price(weight, zone)
+
+        # First break with weight <= weight_up_to
+        index = bisect_left(self._rate_breaks, weight)
+        if index < len(self._rate_breaks) and weight <= self._rate_breaks[index]:
+            return self._rate_prices[index]
         return None
 
+    def get_rates(
+        self,
+        weights: np.ndarray,
+        manual_price: Union[float, np.ndarray, None] = None,
+        zones: Union[str, Sequence[Optional[str]], None] = None,
+        dimensions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Vectorized get_rate. Returns one price per weight, with NaN wherever
+        get_rate would return None (outside the weight limits, above the
+        last rate break, or a manual service without a manual price).
+        zones is one zone or one per weight; dimensions is an (n, 3) array.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if self.manual_entry:
+            if manual_price is None:
+                prices = np.full(weights.shape, np.nan)
+            else:
+                prices = np.broadcast_to(np.asarray(manual_price, dtype=np.float64),
+                                         weights.shape).copy()
+        else:
+            billable = self.billable_weights(weights, dimensions)
+            if self.rate_matrix is not None:
+                prices = self.rate_matrix.get_prices(billable, zones)
+            else:
+                prices = self._rate_price_array[np.searchsorted(self._rate_break_array, billable, side="left")]
+
+        out_of_limits = (weights < self.weight_limits["min"]) | (weights > self.weight_limits["max"])
+        prices[out_of_limits] = np.nan
+        return prices
+
+    def billable_weights(self, weights: np.ndarray, dimensions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized billable_weight over an (n, 3) array of dimensions.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if not self.dim_divisor or dimensions is None:
+            return weights
+        dimensions = np.asarray(dimensions, dtype=np.float64)
+        volume = dimensions[:, 0] * dimensions[:, 1] * dimensions[:, 2]
+        dim_weight = volume / self.dim_divisor * OUNCES_PER_POUND
+        return np.where(volume > self.dim_min_volume, np.maximum(weights, dim_weight), weights)
+
 @dataclass
 class ShippingCarrier:
     name: str
     services: Dict[str, ShippingService]
 
     def __post_init__(self):
-        logger.info(f"Created ShippingCarrier: {self.name} with {len(self.services)} services")
-        logger.debug(f"Available services: {', '.join(self.services.keys())}")
\ No newline at end of file
+        logger.info("Created ShippingCarrier: %s with %d services", self.name, len(self.services))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Available services: %s", ', '.join(self.services.keys()))
\ No newline at end of file
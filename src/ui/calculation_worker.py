@@ -0,0 +1,36 @@
+# src/ui/calculation_worker.py
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from src.utils.calculator import ProfitCalculator
+from src.utils.logger import Logger
+from src.utils.profiling import profile_thread
+
+class CalculationSignals(QObject):
+    # Request id plus the ProfitCalculationResult, or the exception raised
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+class CalculationTask(QRunnable):
+    """
+    Runs one calculate_profit call on a QThreadPool thread. Inputs are read
+    from the widgets on the GUI thread beforehand; results come back
+    through queued signals tagged with request_id, so the window can drop
+    results of superseded requests.
+    """
+    def __init__(self, request_id: int, calculator: ProfitCalculator, inputs: dict):
+        super().__init__()
+        self.request_id = request_id
+        self.calculator = calculator
+        self.inputs = inputs
+        self.signals = CalculationSignals()
+        # Set by MainWindow when stage timing is enabled
+        self.dispatched_ns = None
+
+    def run(self):
+        try:
+            with profile_thread():
+                result = self.calculator.calculate_profit(**self.inputs)
+        except Exception as e:
+            Logger.get_logger().debug("Background calculation %d failed: %s", self.request_id, e)
+            self.signals.failed.emit(self.request_id, e)
+            return
+        self.signals.finished.emit(self.request_id, result)
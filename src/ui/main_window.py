@@ -1,11 +1,19 @@
+import time
+from PyQt5.QtCore import QThreadPool, QTimer
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QPushButton, 
                             QMessageBox)
+from ui.calculation_worker import CalculationTask
 from ui.marketplace_widget import MarketplaceWidget
 from ui.shipping_widget import ShippingWidget
 from ui.product_widget import ProductWidget
 from ui.results_widget import ResultsWidget
-from src.utils.calculator import ProfitCalculator
+from src.utils.calculator_pool import CalculatorPool
+from src.utils.result_cache import ResultCache
 from src.utils.logger import Logger
+from src.utils.profiling import Instrumentation, StageClock
+
+# Idle time after the last input change before recalculating
+RECALC_DEBOUNCE_MS = 250
 
 class MainWindow(QMainWindow):
     def __init__(self, marketplaces, shipping_carriers):
@@ -13,6 +21,15 @@ class MainWindow(QMainWindow):
         self.marketplaces = marketplaces
         self.shipping_carriers = shipping_carriers
         self.logger = Logger.get_logger()
+        # Every keystroke recalculates; repeated inputs come straight from the cache
+        self.result_cache = ResultCache()
+        self.calculators = CalculatorPool(marketplaces, shipping_carriers, result_cache=self.result_cache)
+        for configs in (marketplaces, shipping_carriers):
+            if hasattr(configs, "add_reload_listener"):
+                self.result_cache.watch(configs)
+        self.thread_pool = QThreadPool.globalInstance()
+        self.request_id = 0
+        self.pending_tasks = {}
         self.setup_ui()
         
     def setup_ui(self):
@@ -41,6 +58,12 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.calculate_button)
         layout.addWidget(self.results_widget)
         
+        # Debounce timer for automatic recalculation
+        self.recalc_timer = QTimer(self)
+        self.recalc_timer.setSingleShot(True)
+        self.recalc_timer.setInterval(RECALC_DEBOUNCE_MS)
+        self.recalc_timer.timeout.connect(self.calculate_profit)
+        
         # Connect signals
         self.product_widget.input_changed.connect(self.on_input_changed)
         self.marketplace_widget.input_changed.connect(self.on_input_changed)
@@ -49,23 +72,34 @@ class MainWindow(QMainWindow):
         self.logger.info("Main window UI setup completed")
     
     def on_input_changed(self):
-        # Only calculate if we have all required inputs
+        # Only calculate if we have all required inputs; bursts of changes
+        # restart the timer, so only the last one in a burst calculates, and
+        # inputs made invalid before it fires cancel the pending calculation
         if (self.product_widget.has_valid_inputs() and 
             self.marketplace_widget.get_selected_marketplace() and
             self.shipping_widget.has_valid_inputs()):
-            self.calculate_profit()
+            self.recalc_timer.start()
+        else:
+            self.recalc_timer.stop()
     
     def calculate_profit(self):
+        """
+        Starts a calculation of the current inputs on the thread pool.
+        Any calculation still running is superseded and its result dropped.
+        """
+        self.recalc_timer.stop()
+        clock = StageClock() if Instrumentation.enabled else None
         try:
             # Get selected marketplace and carrier
             marketplace_name = self.marketplace_widget.get_selected_marketplace()
             carrier_name = self.shipping_widget.get_selected_carrier()
             
-            self.logger.debug(f"Calculating profit for marketplace: {marketplace_name}, "
-                            f"carrier: {carrier_name}")
+            self.logger.debug("Calculating profit for marketplace: %s, carrier: %s",
+                              marketplace_name, carrier_name)
             
-            marketplace = self.marketplaces[marketplace_name]
-            carrier = self.shipping_carriers[carrier_name]
+            # Pooled per (marketplace, carrier); rebuilt only when a config is reloaded
+            calculator = self.calculators.get(marketplace_name, carrier_name)
+            carrier = calculator.shipping_carrier
             
             # Get shipping service and check if it's manual entry
             service_id = self.shipping_widget.get_selected_service()
@@ -78,16 +112,13 @@ class MainWindow(QMainWindow):
             
             if is_manual:
                 manual_shipping_price = self.shipping_widget.get_manual_price()
-                self.logger.debug(f"Using manual shipping price: ${manual_shipping_price:.2f}")
+                self.logger.debug("Using manual shipping price: $%.2f", manual_shipping_price)
             else:
                 weight_per_item = self.shipping_widget.get_weight()
-                self.logger.debug(f"Using weight-based shipping: {weight_per_item}oz")
-            
-            # Create calculator
-            calculator = ProfitCalculator(marketplace, carrier)
+                self.logger.debug("Using weight-based shipping: %soz", weight_per_item)
             
-            # Calculate profit
-            result = calculator.calculate_profit(
+            # Widgets are read here on the GUI thread; only the arithmetic runs on the pool
+            inputs = dict(
                 sale_price=self.product_widget.get_sale_price(),
                 quantity=self.product_widget.get_quantity(),
                 cost_per_item=self.product_widget.get_cost_per_item(),
@@ -96,14 +127,45 @@ class MainWindow(QMainWindow):
                 shipping_service_id=service_id,
                 manual_shipping_price=manual_shipping_price
             )
-            
-            # Update results
-            self.results_widget.update_results(result)
-            
-        except ValueError as e:
-            self.logger.warning(f"Validation error in calculation: {str(e)}")
-            QMessageBox.warning(self, "Input Error", str(e))
         except Exception as e:
-            self.logger.error(f"Error calculating profit: {str(e)}", exc_info=True)
+            self.show_calculation_error(e)
+            return
+        if clock:
+            clock.lap("ui.read_inputs")
+
+        self.request_id += 1
+        task = CalculationTask(self.request_id, calculator, inputs)
+        task.signals.finished.connect(self.on_calculation_finished)
+        task.signals.failed.connect(self.on_calculation_failed)
+        # Keeps each task's signal object alive until its result is delivered
+        self.pending_tasks[self.request_id] = task
+        self.thread_pool.start(task)
+        if clock:
+            clock.lap("ui.dispatch")
+            task.dispatched_ns = time.perf_counter_ns()
+
+    def on_calculation_finished(self, request_id, result):
+        task = self.pending_tasks.pop(request_id, None)
+        if request_id != self.request_id:
+            self.logger.debug("Discarding result of superseded calculation %d", request_id)
+            return
+        if task is not None and task.dispatched_ns is not None:
+            # Thread pool queueing, the calculation and signal delivery back to the GUI thread
+            Instrumentation.record("ui.round_trip", time.perf_counter_ns() - task.dispatched_ns)
+        with Instrumentation.stage("ui.update_results"):
+            self.results_widget.update_results(result)
+
+    def on_calculation_failed(self, request_id, error):
+        self.pending_tasks.pop(request_id, None)
+        if request_id != self.request_id:
+            return
+        self.show_calculation_error(error)
+
+    def show_calculation_error(self, error):
+        if isinstance(error, ValueError):
+            self.logger.warning(f"Validation error in calculation: {str(error)}")
+            QMessageBox.warning(self, "Input Error", str(error))
+        else:
+            self.logger.error(f"Error calculating profit: {str(error)}", exc_info=error)
             QMessageBox.critical(self, "Error", 
-                               "An error occurred while calculating profit. Check the logs for details.")
\ No newline at end of file
+                               "An error occurred while calculating profit. Check the logs for details.")
@@ -1,4 +1,5 @@
 # src/ui/results_widget.py
+import logging
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, 
                             QGridLayout, QGroupBox)
 from src.models.marketplace import Marketplace
@@ -37,6 +38,7 @@ class ResultsWidget(QWidget):
         # Fee breakdown section
         self.fee_breakdown_group = QGroupBox("Fee Breakdown")
         self.fee_breakdown_layout = QVBoxLayout()
+        self.fee_labels = {}
         self.fee_breakdown_group.setLayout(self.fee_breakdown_layout)
         
         results_group.setLayout(results_layout)
@@ -46,7 +48,8 @@ class ResultsWidget(QWidget):
     
     def update_results(self, calculation_result):
         self.logger.info("Updating calculation results")
-        self.logger.debug(f"Calculation results: {vars(calculation_result)}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Calculation results: %r", calculation_result)
         
         try:
             # Update main results
@@ -57,16 +60,18 @@ class ResultsWidget(QWidget):
             self.net_profit_label.setText(f"Net Profit: ${calculation_result.net_profit:.2f}")
             self.profit_margin_label.setText(f"Profit Margin: {calculation_result.profit_margin:.2f}%")
             
-            # Update fee breakdown
-            # Clear previous fee breakdown
-            for i in reversed(range(self.fee_breakdown_layout.count())): 
-                self.fee_breakdown_layout.itemAt(i).widget().setParent(None)
+            # Update fee breakdown, reusing the labels while the fee names are unchanged
+            fee_names = list(calculation_result.fee_breakdown)
+            if fee_names != list(self.fee_labels):
+                # Clear previous fee breakdown
+                for i in reversed(range(self.fee_breakdown_layout.count())): 
+                    self.fee_breakdown_layout.itemAt(i).widget().setParent(None)
+                self.fee_labels = {fee_name: QLabel() for fee_name in fee_names}
+                for label in self.fee_labels.values():
+                    self.fee_breakdown_layout.addWidget(label)
             
-            # Add new fee breakdown
             for fee_name, fee_amount in calculation_result.fee_breakdown.items():
-                self.fee_breakdown_layout.addWidget(
-                    QLabel(f"{fee_name}: ${fee_amount:.2f}")
-                )
+                self.fee_labels[fee_name].setText(f"{fee_name}: ${fee_amount:.2f}")
             
             self.logger.debug("Results updated successfully")
             
@@ -86,4 +91,5 @@ class ResultsWidget(QWidget):
         
         # Clear fee breakdown
         for i in reversed(range(self.fee_breakdown_layout.count())): 
-            self.fee_breakdown_layout.itemAt(i).widget().setParent(None)
\ No newline at end of file
+            self.fee_breakdown_layout.itemAt(i).widget().setParent(None)
+        self.fee_labels = {}
\ No newline at end of file
@@ -1,13 +1,28 @@
-from typing import Dict, List, Optional
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.models.fee import Fee, FeeKernel, FeeType, FeeApplication
+from src.models.listing import Listing
 from src.models.marketplace import Marketplace, SellerTier
 from src.models.shipping import ShippingCarrier, ShippingService
 from dataclasses import dataclass
-from utils.logger import Logger
+from src.utils.logger import Logger
+from src.utils.profiling import Instrumentation, StageClock
+
+if TYPE_CHECKING:
+    from src.utils.result_cache import ResultCache
 
 logger = Logger.get_logger()
 
 @dataclass
 class ProfitCalculationResult:
+    """
+    Results of one calculation. Slotted (no per-instance __dict__); for
+    many results, ProfitResultSet stores them as columns instead.
+    """
+    __slots__ = ("gross_revenue", "total_marketplace_fees", "shipping_cost", "total_cost",
+                 "net_profit", "profit_margin", "fee_breakdown")
+
     gross_revenue: float
     total_marketplace_fees: float
     shipping_cost: float
@@ -16,11 +31,112 @@ class ProfitCalculationResult:
     profit_margin: float
     fee_breakdown: Dict[str, float]
 
+@dataclass
+class BatchProfitCalculationResult:
+    """
+    Columnar counterpart of ProfitCalculationResult: every field holds one
+    value per input row. Fee breakdown columns are NaN for rows whose tier
+    does not charge that fee.
+    """
+    gross_revenue: np.ndarray
+    total_marketplace_fees: np.ndarray
+    shipping_cost: np.ndarray
+    total_cost: np.ndarray
+    net_profit: np.ndarray
+    profit_margin: np.ndarray
+    fee_breakdown: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.gross_revenue)
+
+    def row(self, index: int) -> ProfitCalculationResult:
+        """
+        Returns a single row as a ProfitCalculationResult.
+        """
+        return ProfitCalculationResult(
+            gross_revenue=float(self.gross_revenue[index]),
+            total_marketplace_fees=float(self.total_marketplace_fees[index]),
+            shipping_cost=float(self.shipping_cost[index]),
+            total_cost=float(self.total_cost[index]),
+            net_profit=float(self.net_profit[index]),
+            profit_margin=float(self.profit_margin[index]),
+            fee_breakdown={
+                fee_name: float(values[index])
+                for fee_name, values in self.fee_breakdown.items()
+                if not np.isnan(values[index])
+            }
+        )
+
+class _TierFeeTable:
+    """
+    Every tier's fee kernel and per-fee coefficients laid out as arrays by
+    tier position, so a batch gathers each row's coefficients in one pass
+    however many tiers it spans. Amounts follow Fee.calculate operation for
+    operation, so results stay bit-identical to calculate_profit.
+    """
+    def __init__(self, tiers: Dict[str, SellerTier]):
+        self.positions = {tier_id: position for position, tier_id in enumerate(tiers)}
+        kernels = [tier.fee_kernel for tier in tiers.values()]
+        self.per_item_rate = np.array([kernel.per_item_rate for kernel in kernels], dtype=np.float64)
+        self.per_order_rate = np.array([kernel.per_order_rate for kernel in kernels], dtype=np.float64)
+        self.per_item_flat = np.array([kernel.per_item_flat for kernel in kernels], dtype=np.float64)
+        self.per_order_flat = np.array([kernel.per_order_flat for kernel in kernels], dtype=np.float64)
+        # fee name -> (charged, rate, flat, is_flat, is_compound, per_item), one entry per tier
+        self.fees: Dict[str, Tuple[np.ndarray, ...]] = {}
+        fee_names = dict.fromkeys(fee_name for tier in tiers.values() for fee_name in tier.fees)
+        for fee_name in fee_names:
+            fees = [tier.fees.get(fee_name) for tier in tiers.values()]
+            self.fees[fee_name] = (
+                np.array([fee is not None for fee in fees], dtype=bool),
+                np.array([fee.percentage / 100 if fee is not None and fee.type != FeeType.FLAT else 0.0
+                          for fee in fees], dtype=np.float64),
+                np.array([fee.flat_fee if fee is not None and fee.type != FeeType.PERCENTAGE else 0.0
+                          for fee in fees], dtype=np.float64),
+                np.array([fee is not None and fee.type == FeeType.FLAT for fee in fees], dtype=bool),
+                np.array([fee is not None and fee.type == FeeType.COMPOUND for fee in fees], dtype=bool),
+                np.array([fee is not None and fee.application == FeeApplication.PER_ITEM for fee in fees],
+                         dtype=bool),
+            )
+
+    def total_fees(self, positions: np.ndarray, sale_price: np.ndarray, quantity: np.ndarray) -> np.ndarray:
+        return FeeKernel(
+            per_item_rate=self.per_item_rate[positions],
+            per_order_rate=self.per_order_rate[positions],
+            per_item_flat=self.per_item_flat[positions],
+            per_order_flat=self.per_order_flat[positions]
+        ).total(sale_price, quantity)
+
+    def fee_amounts(self, fee_name: str, positions: np.ndarray, sale_price: np.ndarray,
+                    quantity: np.ndarray) -> np.ndarray:
+        """
+        One fee's amount per row; NaN where the row's tier does not charge it.
+        """
+        charged, rate, flat, is_flat, is_compound, per_item = (column[positions]
+                                                               for column in self.fees[fee_name])
+        amounts = np.where(is_flat, flat, sale_price * rate)
+        amounts = np.where(is_compound, amounts + flat, amounts)
+        amounts = np.where(per_item, amounts * quantity, amounts)
+        return np.where(charged, amounts, np.nan)
+
+def _group_rows(group_index: np.ndarray, group_count: int) -> List[np.ndarray]:
+    # Row positions per group from one stable sort, rather than a full scan per group
+    order = np.argsort(group_index, kind="stable")
+    bounds = np.cumsum(np.bincount(group_index, minlength=group_count))
+    return np.split(order, bounds[:-1])
+
+def _id_column(ids: Union[str, Sequence[str]], length: int) -> np.ndarray:
+    if isinstance(ids, str):
+        return np.full(length, ids, dtype=object)
+    return np.asarray(ids, dtype=object)
+
 class ProfitCalculator:
-    def __init__(self, marketplace: Marketplace, shipping_carrier: ShippingCarrier):
+    def __init__(self, marketplace: Marketplace, shipping_carrier: ShippingCarrier,
+                 result_cache: Optional["ResultCache"] = None):
         self.marketplace = marketplace
         self.shipping_carrier = shipping_carrier
+        self.result_cache = result_cache
         self.logger = Logger.get_logger()
+        self._fee_table: Optional[_TierFeeTable] = None
         self.logger.info(f"Initialized ProfitCalculator for marketplace: {marketplace.name}, "
                         f"carrier: {shipping_carrier.name}")
 
@@ -32,13 +148,50 @@ class ProfitCalculator:
         weight_per_item: float,
         tier_id: str,
         shipping_service_id: str,
-        manual_shipping_price: Optional[float] = None
+        manual_shipping_price: Optional[float] = None,
+        zone: Optional[str] = None,
+        package_dimensions: Optional[Tuple[float, float, float]] = None,
+        include_fee_breakdown: bool = True
     ) -> ProfitCalculationResult:
-        self.logger.info(f"Starting profit calculation for {quantity} items at ${sale_price} each")
-        self.logger.debug(f"Calculation parameters: cost_per_item=${cost_per_item}, "
-                         f"weight_per_item={weight_per_item}oz, tier={tier_id}, "
-                         f"shipping_service={shipping_service_id}, "
-                         f"manual_shipping_price=${manual_shipping_price if manual_shipping_price is not None else 'N/A'}")
+        """
+        Calculates profit for one listing. Total fees come from the tier's
+        precompiled fee kernel; the named per-fee breakdown is only built when
+        include_fee_breakdown is set and is otherwise left empty. zone and
+        package_dimensions (inches) are used by zoned and DIM-weight services.
+        With a result_cache, repeated inputs return the cached result.
+        """
+        if self.result_cache is not None:
+            # Equal numbers hash equally across int, float and numpy scalars; only
+            # the dimensions need normalizing to a hashable tuple
+            inputs = (sale_price, quantity, cost_per_item, weight_per_item, tier_id, shipping_service_id,
+                      manual_shipping_price, zone,
+                      None if package_dimensions is None else tuple(package_dimensions),
+                      bool(include_fee_breakdown))
+            result = self.result_cache.get(self.marketplace, self.shipping_carrier, inputs)
+            if result is None:
+                result = self._calculate_profit(*inputs)
+                self.result_cache.put(self.marketplace, self.shipping_carrier, inputs, result)
+            return result
+        return self._calculate_profit(sale_price, quantity, cost_per_item, weight_per_item, tier_id,
+                                      shipping_service_id, manual_shipping_price, zone,
+                                      package_dimensions, include_fee_breakdown)
+
+    def _calculate_profit(self, sale_price, quantity, cost_per_item, weight_per_item, tier_id,
+                          shipping_service_id, manual_shipping_price, zone, package_dimensions,
+                          include_fee_breakdown) -> ProfitCalculationResult:
+        # Levels are checked once per call; disabled records cost no formatting
+        info = self.logger.isEnabledFor(logging.INFO)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        clock = StageClock() if Instrumentation.enabled else None
+        if info:
+            self.logger.info("Starting profit calculation for %s items at $%s each", quantity, sale_price)
+        if debug:
+            self.logger.debug("Calculation parameters: cost_per_item=$%s, weight_per_item=%soz, tier=%s, "
+                              "shipping_service=%s, manual_shipping_price=$%s",
+                              cost_per_item, weight_per_item, tier_id, shipping_service_id,
+                              manual_shipping_price if manual_shipping_price is not None else 'N/A')
+        if clock:
+            clock.lap("calculator.logging")
         try:
             # Get the shipping service first to determine if it's manual entry
             if shipping_service_id not in self.shipping_carrier.services:
@@ -71,46 +224,46 @@ class ProfitCalculator:
                 self.logger.error(f"Invalid tier_id: {tier_id}. Available tiers: {list(self.marketplace.tiers.keys())}")
                 raise ValueError(f"Invalid tier_id: {tier_id}")
             tier = self.marketplace.tiers[tier_id]
+            if clock:
+                clock.lap("calculator.validation")
             
             # Calculate gross revenue
             gross_revenue = sale_price * quantity
-            self.logger.debug(f"Calculated gross revenue: ${gross_revenue:.2f}")
+            if debug:
+                self.logger.debug("Calculated gross revenue: $%.2f", gross_revenue)
             
             # Calculate marketplace fees
-            fee_breakdown = {}
-            total_marketplace_fees = 0
-            
-            for fee_name, fee in tier.fees.items():
-                fee_amount = fee.calculate(sale_price, quantity)
-                fee_breakdown[fee_name] = fee_amount
-                total_marketplace_fees += fee_amount
-                self.logger.debug(f"Calculated {fee_name}: ${fee_amount:.2f}")
+            total_marketplace_fees = tier.total_fees(sale_price, quantity)
+            if debug:
+                self.logger.debug("Calculated marketplace fees: $%.2f", total_marketplace_fees)
+            fee_breakdown = tier.fee_breakdown(sale_price, quantity) if include_fee_breakdown else {}
+            if clock:
+                clock.lap("calculator.fees")
 
             # Calculate shipping cost
             if is_manual_entry:
                 shipping_cost = manual_shipping_price
-                self.logger.debug(f"Using manual shipping price: ${shipping_cost:.2f}")
+                if debug:
+                    self.logger.debug("Using manual shipping price: $%.2f", shipping_cost)
             else:
                 total_weight = weight_per_item * quantity
-                shipping_cost = shipping_service.get_rate(total_weight)
+                shipping_cost = shipping_service.get_rate(total_weight, zone=zone,
+                                                          dimensions=package_dimensions)
                 if shipping_cost is None:
-                    self.logger.warning(f"No shipping rate found for weight: {total_weight}oz")
+                    self.logger.warning("No shipping rate found for weight: %soz", total_weight)
                     shipping_cost = 0
             
-            self.logger.debug(f"Final shipping cost: ${shipping_cost:.2f}")
+            if debug:
+                self.logger.debug("Final shipping cost: $%.2f", shipping_cost)
+            if clock:
+                clock.lap("calculator.shipping")
 
             # Calculate total cost and profit
             total_cost = (cost_per_item * quantity) + total_marketplace_fees + shipping_cost
             net_profit = gross_revenue - total_cost
             profit_margin = (net_profit / gross_revenue) * 100 if gross_revenue > 0 else 0
 
-            self.logger.info(f"Completed profit calculation: "
-                           f"revenue=${gross_revenue:.2f}, "
-                           f"fees=${total_marketplace_fees:.2f}, "
-                           f"shipping=${shipping_cost:.2f}, "
-                           f"profit=${net_profit:.2f} ({profit_margin:.1f}%)")
-
-            return ProfitCalculationResult(
+            result = ProfitCalculationResult(
                 gross_revenue=gross_revenue,
                 total_marketplace_fees=total_marketplace_fees,
                 shipping_cost=shipping_cost,
@@ -119,7 +272,249 @@ class ProfitCalculator:
                 profit_margin=profit_margin,
                 fee_breakdown=fee_breakdown
             )
+            if clock:
+                clock.lap("calculator.result")
+
+            if info:
+                self.logger.info("Completed profit calculation: revenue=$%.2f, fees=$%.2f, "
+                                 "shipping=$%.2f, profit=$%.2f (%.1f%%)",
+                                 gross_revenue, total_marketplace_fees, shipping_cost,
+                                 net_profit, profit_margin)
+            if clock:
+                clock.lap("calculator.logging")
+            return result
             
         except Exception as e:
             self.logger.error(f"Error in profit calculation: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+    def calculate_profit_batch(
+        self,
+        sale_price: Sequence[float],
+        quantity: Sequence[int],
+        cost_per_item: Sequence[float],
+        weight_per_item: Sequence[float],
+        tier_id: Union[str, Sequence[str]],
+        shipping_service_id: Union[str, Sequence[str]],
+        manual_shipping_price: Optional[Sequence[float]] = None,
+        zone: Union[str, Sequence[Optional[str]], None] = None,
+        package_dimensions: Optional[Sequence[Tuple[float, float, float]]] = None,
+        include_fee_breakdown: bool = True
+    ) -> BatchProfitCalculationResult:
+        """
+        Vectorized form of calculate_profit over column arrays. tier_id,
+        shipping_service_id and zone may be a single id applied to every row;
+        package_dimensions is an (n, 3) array.
+        Results match calculate_profit row for row; the first invalid row
+        raises ValueError.
+        """
+        sale_price = np.asarray(sale_price, dtype=np.float64)
+        quantity = np.asarray(quantity, dtype=np.int64)
+        cost_per_item = np.asarray(cost_per_item, dtype=np.float64)
+        weight_per_item = np.asarray(weight_per_item, dtype=np.float64)
+        row_count = len(sale_price)
+        tier_id = _id_column(tier_id, row_count)
+        shipping_service_id = _id_column(shipping_service_id, row_count)
+        if manual_shipping_price is None:
+            manual_shipping_price = np.full(row_count, np.nan)
+        manual_shipping_price = np.asarray(manual_shipping_price, dtype=np.float64)
+        if zone is not None and not isinstance(zone, str):
+            zone = _id_column(zone, row_count)
+        if package_dimensions is not None:
+            package_dimensions = np.asarray(package_dimensions, dtype=np.float64).reshape(-1, 3)
+
+        clock = StageClock() if Instrumentation.enabled else None
+        self.logger.info(f"Starting batch profit calculation for {row_count} rows")
+        try:
+            columns = [quantity, cost_per_item, weight_per_item, tier_id,
+                       shipping_service_id, manual_shipping_price]
+            if zone is not None and not isinstance(zone, str):
+                columns.append(zone)
+            if package_dimensions is not None:
+                columns.append(package_dimensions)
+            if any(len(column) != row_count for column in columns):
+                raise ValueError("All input columns must have the same length")
+
+            services = self.shipping_carrier.services
+            tiers = self.marketplace.tiers
+            service_ids, service_index = np.unique(shipping_service_id, return_inverse=True)
+            tier_ids, tier_index = np.unique(tier_id, return_inverse=True)
+
+            for invalid, message in self._validation_masks(sale_price, quantity, cost_per_item, weight_per_item,
+                                                           manual_shipping_price, tier_ids, tier_index,
+                                                           service_ids, service_index):
+                self._raise_for_invalid_rows(invalid, message)
+            if clock:
+                clock.lap("calculator.batch.validation")
+
+            gross_revenue = sale_price * quantity
+
+            # Marketplace fees in one pass per fee name, whatever the number of tiers
+            fee_table = self._tier_fee_table()
+            positions = np.array([fee_table.positions[tier] for tier in tier_ids], dtype=np.intp)[tier_index]
+            total_marketplace_fees = fee_table.total_fees(positions, sale_price, quantity)
+            fee_breakdown = {}
+            if include_fee_breakdown:
+                for fee_name in dict.fromkeys(fee_name for tier in tier_ids for fee_name in tiers[tier].fees):
+                    fee_breakdown[fee_name] = fee_table.fee_amounts(fee_name, positions, sale_price, quantity)
+            if clock:
+                clock.lap("calculator.batch.fees")
+
+            # Shipping, one pass over each service's rows
+            shipping_cost = np.zeros(row_count)
+            total_weight = weight_per_item * quantity
+            for service_id, rows in zip(service_ids, _group_rows(service_index, len(service_ids))):
+                service = services[service_id]
+                if getattr(service, 'manual_entry', False):
+                    shipping_cost[rows] = manual_shipping_price[rows]
+                else:
+                    # get_rate returning None means no charge, as in calculate_profit
+                    rates = service.get_rates(
+                        total_weight[rows],
+                        zones=zone if zone is None or isinstance(zone, str) else zone[rows],
+                        dimensions=None if package_dimensions is None else package_dimensions[rows]
+                    )
+                    shipping_cost[rows] = np.nan_to_num(rates, nan=0.0)
+            if clock:
+                clock.lap("calculator.batch.shipping")
+
+            total_cost = (cost_per_item * quantity) + total_marketplace_fees + shipping_cost
+            net_profit = gross_revenue - total_cost
+            profit_margin = (net_profit / gross_revenue) * 100
+
+            self.logger.info(f"Completed batch profit calculation for {row_count} rows")
+
+            result = BatchProfitCalculationResult(
+                gross_revenue=gross_revenue,
+                total_marketplace_fees=total_marketplace_fees,
+                shipping_cost=shipping_cost,
+                total_cost=total_cost,
+                net_profit=net_profit,
+                profit_margin=profit_margin,
+                fee_breakdown=fee_breakdown
+            )
+            if clock:
+                clock.lap("calculator.batch.result")
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Error in batch profit calculation: {str(e)}", exc_info=True)
+            raise
+
+    def calculate_listings(
+        self,
+        listings: Sequence[Listing]
+    ) -> List[Union[ProfitCalculationResult, ValueError]]:
+        """
+        Calculates many listings with one batch call. Listings that fail
+        validation get the ValueError calculate_profit would raise in their
+        slot and the rest are still batched. Listing marketplace/carrier
+        fields are ignored; group listings per calculator first.
+        """
+        columns = {
+            "sale_price": np.array([listing.sale_price for listing in listings], dtype=np.float64),
+            "quantity": np.array([listing.quantity for listing in listings], dtype=np.int64),
+            "cost_per_item": np.array([listing.cost_per_item for listing in listings], dtype=np.float64),
+            "weight_per_item": np.array([listing.weight_per_item for listing in listings], dtype=np.float64),
+            "tier_id": _id_column([listing.tier_id for listing in listings], len(listings)),
+            "shipping_service_id": _id_column([listing.shipping_service_id for listing in listings], len(listings)),
+            "manual_shipping_price": np.array([listing.manual_shipping_price for listing in listings],
+                                              dtype=np.float64),
+            "zone": _id_column([listing.zone for listing in listings], len(listings)),
+            "package_dimensions": np.array([listing.package_dimensions or (0.0, 0.0, 0.0) for listing in listings],
+                                           dtype=np.float64).reshape(-1, 3)
+        }
+        service_ids, service_index = np.unique(columns["shipping_service_id"], return_inverse=True)
+        tier_ids, tier_index = np.unique(columns["tier_id"], return_inverse=True)
+        results: List[Union[ProfitCalculationResult, ValueError, None]] = [None] * len(listings)
+        # A row's first failing check is the error calculate_profit would raise for it
+        pending = np.ones(len(listings), dtype=bool)
+        for invalid, message in self._validation_masks(columns["sale_price"], columns["quantity"],
+                                                       columns["cost_per_item"], columns["weight_per_item"],
+                                                       columns["manual_shipping_price"], tier_ids, tier_index,
+                                                       service_ids, service_index):
+            for row in np.flatnonzero(invalid & pending):
+                results[row] = ValueError(message)
+            pending &= ~invalid
+        if not pending.all():
+            self.logger.warning(f"{int((~pending).sum())} of {len(listings)} listings failed validation")
+
+        valid = np.flatnonzero(pending)
+        if len(valid):
+            try:
+                batch = self.calculate_profit_batch(**{name: column[valid] for name, column in columns.items()})
+                for position, row in enumerate(valid):
+                    results[row] = batch.row(position)
+            except ValueError:
+                # Errors the masks do not cover, such as an unknown zone, are found row by row
+                for row in valid:
+                    results[row] = self._calculate_listing(listings[row])
+        return results
+
+    def _calculate_listing(self, listing: Listing) -> Union[ProfitCalculationResult, ValueError]:
+        try:
+            return self.calculate_profit(
+                sale_price=listing.sale_price,
+                quantity=listing.quantity,
+                cost_per_item=listing.cost_per_item,
+                weight_per_item=listing.weight_per_item,
+                tier_id=listing.tier_id,
+                shipping_service_id=listing.shipping_service_id,
+                manual_shipping_price=listing.manual_shipping_price,
+                zone=listing.zone,
+                package_dimensions=listing.package_dimensions
+            )
+        except ValueError as e:
+            return e
+
+    def _validation_masks(
+        self,
+        sale_price: np.ndarray,
+        quantity: np.ndarray,
+        cost_per_item: np.ndarray,
+        weight_per_item: np.ndarray,
+        manual_shipping_price: np.ndarray,
+        tier_ids: np.ndarray,
+        tier_index: np.ndarray,
+        service_ids: np.ndarray,
+        service_index: np.ndarray
+    ) -> List[Tuple[np.ndarray, str]]:
+        """
+        (invalid rows, error message) pairs in the order calculate_profit
+        checks its inputs, so a row's first invalid mask is its error.
+        """
+        services = self.shipping_carrier.services
+        checks = []
+        for position, service_id in enumerate(service_ids):
+            if service_id not in services:
+                self.logger.error(f"Invalid shipping_service_id: {service_id}. "
+                                  f"Available services: {list(services.keys())}")
+                checks.append((service_index == position, f"Invalid shipping_service_id: {service_id}"))
+        is_manual_entry = np.array(
+            [service_id in services and getattr(services[service_id], 'manual_entry', False)
+             for service_id in service_ids],
+            dtype=bool
+        )[service_index]
+        checks.append((~((sale_price > 0) & (quantity > 0) & (cost_per_item >= 0)),
+                       "Required parameters must have valid values"))
+        checks.append((is_manual_entry & ~(manual_shipping_price >= 0),
+                       "Manual shipping price must be provided and non-negative"))
+        checks.append((~is_manual_entry & (weight_per_item <= 0),
+                       "Weight must be greater than 0 for non-manual shipping"))
+        for position, tier in enumerate(tier_ids):
+            if tier not in self.marketplace.tiers:
+                self.logger.error(f"Invalid tier_id: {tier}. Available tiers: {list(self.marketplace.tiers.keys())}")
+                checks.append((tier_index == position, f"Invalid tier_id: {tier}"))
+        return checks
+
+    def _tier_fee_table(self) -> _TierFeeTable:
+        # Built on the first batch call; scalar-only calculators never pay for it
+        if self._fee_table is None:
+            self._fee_table = _TierFeeTable(self.marketplace.tiers)
+        return self._fee_table
+
+    def _raise_for_invalid_rows(self, invalid: np.ndarray, message: str) -> None:
+        if invalid.any():
+            row = int(np.flatnonzero(invalid)[0])
+            self.logger.warning(f"{message}: {int(invalid.sum())} invalid rows, first at row {row}")
+            raise ValueError(f"{message} (row {row})")
@@ -0,0 +1,55 @@
+# src/utils/calculator_pool.py
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.calculator import ProfitCalculator
+from src.utils.logger import Logger
+from src.utils.result_cache import ResultCache
+
+class CalculatorPool:
+    """
+    Hands out one long-lived ProfitCalculator per (marketplace, carrier)
+    name pair. ProfitCalculator keeps no per-call state and its lookup
+    tables (each tier's FeeKernel, each service's sorted rate index) are
+    built once when the configs load, so a pooled calculator is safe to
+    share across threads and repeated calls pay only for arithmetic.
+
+    marketplaces and shipping_carriers may be plain dicts or
+    ConfigRegistry objects; a calculator is rebuilt when the registry has
+    swapped in a reloaded config. An optional ResultCache is shared by
+    every calculator in the pool.
+    """
+    def __init__(self, marketplaces: Mapping[str, Marketplace], shipping_carriers: Mapping[str, ShippingCarrier],
+                 result_cache: Optional[ResultCache] = None):
+        self.marketplaces = marketplaces
+        self.shipping_carriers = shipping_carriers
+        self.result_cache = result_cache
+        self.logger = Logger.get_logger()
+        self._calculators: Dict[Tuple[str, str], ProfitCalculator] = {}
+        self._lock = threading.Lock()
+
+    def get(self, marketplace_name: str, carrier_name: str) -> ProfitCalculator:
+        if marketplace_name not in self.marketplaces:
+            raise ValueError(f"Unknown marketplace: {marketplace_name}")
+        if carrier_name not in self.shipping_carriers:
+            raise ValueError(f"Unknown carrier: {carrier_name}")
+        marketplace = self.marketplaces[marketplace_name]
+        carrier = self.shipping_carriers[carrier_name]
+        key = (marketplace_name, carrier_name)
+        calculator = self._calculators.get(key)
+        if calculator is not None and calculator.marketplace is marketplace and calculator.shipping_carrier is carrier:
+            return calculator
+        with self._lock:
+            calculator = self._calculators.get(key)
+            if calculator is None or calculator.marketplace is not marketplace or calculator.shipping_carrier is not carrier:
+                calculator = ProfitCalculator(marketplace, carrier, result_cache=self.result_cache)
+                self._calculators[key] = calculator
+            return calculator
+
+    def __len__(self) -> int:
+        return len(self._calculators)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._calculators.clear()
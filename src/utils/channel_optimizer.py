@@ -0,0 +1,241 @@
+# src/utils/channel_optimizer.py
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.logger import Logger
+
+RANK_FIELDS = ("net_profit", "profit_margin")
+
+@dataclass(frozen=True)
+class ChannelOption:
+    marketplace: str
+    tier_id: str
+    carrier: str
+    service_id: str
+    gross_revenue: float
+    total_marketplace_fees: float
+    shipping_cost: float
+    total_cost: float
+    net_profit: float
+    profit_margin: float
+
+@dataclass
+class BatchChannelChoice:
+    """
+    Best channel per input row. Name columns are None and amounts NaN where
+    no service can ship the row.
+    """
+    marketplace: np.ndarray
+    tier_id: np.ndarray
+    carrier: np.ndarray
+    service_id: np.ndarray
+    gross_revenue: np.ndarray
+    total_marketplace_fees: np.ndarray
+    shipping_cost: np.ndarray
+    total_cost: np.ndarray
+    net_profit: np.ndarray
+    profit_margin: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.net_profit)
+
+class ChannelOptimizer:
+    """
+    Evaluates every (marketplace, tier, carrier service) combination for a
+    listing. Fee kernels and services are laid out once as arrays, so a
+    listing is priced as a tiers x services grid with the same arithmetic as
+    ProfitCalculator.calculate_profit. Combinations whose service cannot
+    ship the parcel (outside weight limits, no rate, unpriced zone, or a
+    manual service without a manual price) are left out rather than priced
+    with free shipping.
+    """
+    def __init__(self, marketplaces: Dict[str, Marketplace], shipping_carriers: Dict[str, ShippingCarrier]):
+        self.logger = Logger.get_logger()
+        self.tiers = [(marketplace_name, tier_id, tier)
+                      for marketplace_name, marketplace in marketplaces.items()
+                      for tier_id, tier in marketplace.tiers.items()]
+        self.services = [(carrier_name, service_id, service)
+                         for carrier_name, carrier in shipping_carriers.items()
+                         for service_id, service in carrier.services.items()]
+        if not self.tiers or not self.services:
+            raise ValueError("ChannelOptimizer needs at least one seller tier and one shipping service")
+        kernels = [tier.fee_kernel for _, _, tier in self.tiers]
+        self.per_item_rate = np.array([kernel.per_item_rate for kernel in kernels], dtype=np.float64)
+        self.per_order_rate = np.array([kernel.per_order_rate for kernel in kernels], dtype=np.float64)
+        self.per_item_flat = np.array([kernel.per_item_flat for kernel in kernels], dtype=np.float64)
+        self.per_order_flat = np.array([kernel.per_order_flat for kernel in kernels], dtype=np.float64)
+        self.logger.info(f"Initialized ChannelOptimizer with {len(self.tiers)} tiers "
+                        f"and {len(self.services)} shipping services")
+
+    def _fee_matrix(self, sale_price: np.ndarray, quantity: np.ndarray) -> np.ndarray:
+        # FeeKernel.total, broadcast to (rows, tiers)
+        sale_price = sale_price[:, None]
+        quantity = quantity[:, None]
+        return (self.per_item_rate * sale_price * quantity + self.per_order_rate * sale_price
+                + self.per_item_flat * quantity + self.per_order_flat)
+
+    def _shipping_matrix(self, weight_per_item, quantity, manual_shipping_price, zone,
+                         package_dimensions) -> np.ndarray:
+        # (rows, services), NaN where the service cannot ship the row
+        total_weight = weight_per_item * quantity
+        shipping = np.full((len(total_weight), len(self.services)), np.nan)
+        for column, (_, _, service) in enumerate(self.services):
+            if service.manual_entry:
+                prices = service.get_rates(total_weight, manual_price=manual_shipping_price)
+                prices[~(manual_shipping_price >= 0)] = np.nan
+            else:
+                if isinstance(zone, str) or zone is None:
+                    if not service.serves_zone(zone):
+                        continue
+                    zones = zone
+                    rows = np.arange(len(total_weight))
+                else:
+                    rows = np.flatnonzero([service.serves_zone(row_zone) for row_zone in zone])
+                    zones = zone[rows]
+                dimensions = None if package_dimensions is None else package_dimensions[rows]
+                prices = np.full(len(total_weight), np.nan)
+                prices[rows] = service.get_rates(total_weight[rows], zones=zones, dimensions=dimensions)
+                prices[~(weight_per_item > 0)] = np.nan
+            shipping[:, column] = prices
+        return shipping
+
+    def _prepare(self, sale_price, quantity, cost_per_item, weight_per_item, manual_shipping_price,
+                 zone, package_dimensions):
+        sale_price = np.atleast_1d(np.asarray(sale_price, dtype=np.float64))
+        quantity = np.atleast_1d(np.asarray(quantity, dtype=np.int64))
+        cost_per_item = np.atleast_1d(np.asarray(cost_per_item, dtype=np.float64))
+        weight_per_item = np.atleast_1d(np.asarray(weight_per_item, dtype=np.float64))
+        row_count = len(sale_price)
+        if manual_shipping_price is None:
+            manual_shipping_price = np.nan
+        manual_shipping_price = np.broadcast_to(
+            np.asarray(manual_shipping_price, dtype=np.float64), (row_count,))
+        if zone is not None and not isinstance(zone, str):
+            zone = np.asarray(zone, dtype=object)
+        if package_dimensions is not None:
+            package_dimensions = np.asarray(package_dimensions, dtype=np.float64).reshape(-1, 3)
+
+        if any(len(column) != row_count for column in (quantity, cost_per_item, weight_per_item)):
+            raise ValueError("All input columns must have the same length")
+        invalid = ~((sale_price > 0) & (quantity > 0) & (cost_per_item >= 0))
+        if invalid.any():
+            row = int(np.flatnonzero(invalid)[0])
+            self.logger.warning(f"Invalid channel optimizer input at row {row}")
+            raise ValueError(f"Required parameters must have valid values (row {row})")
+        return (sale_price, quantity, cost_per_item, weight_per_item, manual_shipping_price,
+                zone, package_dimensions)
+
+    def rank(
+        self,
+        sale_price: float,
+        quantity: int,
+        cost_per_item: float,
+        weight_per_item: float,
+        manual_shipping_price: Optional[float] = None,
+        zone: Optional[str] = None,
+        package_dimensions: Optional[Tuple[float, float, float]] = None,
+        rank_by: str = "net_profit",
+        limit: Optional[int] = None
+    ) -> List[ChannelOption]:
+        """
+        All shippable combinations for one listing, best first by rank_by
+        (net_profit or profit_margin).
+        """
+        if rank_by not in RANK_FIELDS:
+            raise ValueError(f"rank_by must be one of {', '.join(RANK_FIELDS)}")
+        (sale_price, quantity, cost_per_item, weight_per_item, manual_shipping_price,
+         zone, package_dimensions) = self._prepare(sale_price, quantity, cost_per_item, weight_per_item,
+                                                   manual_shipping_price, zone, package_dimensions)
+        fees = self._fee_matrix(sale_price, quantity)[0]
+        shipping = self._shipping_matrix(weight_per_item, quantity, manual_shipping_price, zone,
+                                         package_dimensions)[0]
+
+        # Same operation order as calculate_profit, over a (tiers, services) grid
+        gross_revenue = sale_price[0] * quantity[0]
+        total_cost = (cost_per_item[0] * quantity[0]) + fees[:, None] + shipping[None, :]
+        net_profit = gross_revenue - total_cost
+        profit_margin = (net_profit / gross_revenue) * 100
+
+        tier_index, service_index = np.nonzero(np.broadcast_to(~np.isnan(shipping), net_profit.shape))
+        scores = (net_profit if rank_by == "net_profit" else profit_margin)[tier_index, service_index]
+        order = np.argsort(-scores, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+
+        options = []
+        for position in order:
+            tier_position, service_position = tier_index[position], service_index[position]
+            marketplace_name, tier_id, _ = self.tiers[tier_position]
+            carrier_name, service_id, _ = self.services[service_position]
+            options.append(ChannelOption(
+                marketplace=marketplace_name,
+                tier_id=tier_id,
+                carrier=carrier_name,
+                service_id=service_id,
+                gross_revenue=float(gross_revenue),
+                total_marketplace_fees=float(fees[tier_position]),
+                shipping_cost=float(shipping[service_position]),
+                total_cost=float(total_cost[tier_position, service_position]),
+                net_profit=float(net_profit[tier_position, service_position]),
+                profit_margin=float(profit_margin[tier_position, service_position])
+            ))
+        self.logger.debug(f"Ranked {len(tier_index)} channel combinations")
+        return options
+
+    def best_batch(
+        self,
+        sale_price: Sequence[float],
+        quantity: Sequence[int],
+        cost_per_item: Sequence[float],
+        weight_per_item: Sequence[float],
+        manual_shipping_price: Optional[Sequence[float]] = None,
+        zone: Union[str, Sequence[Optional[str]], None] = None,
+        package_dimensions: Optional[Sequence[Tuple[float, float, float]]] = None
+    ) -> BatchChannelChoice:
+        """
+        Best combination per row of an inventory. Net profit is revenue less
+        item cost, tier fees and shipping, and revenue is fixed per row, so
+        the best combination is the cheapest tier paired with the cheapest
+        service; ranking by net profit or margin picks the same channel.
+        Costs rows x (tiers + services) instead of the full product.
+        """
+        (sale_price, quantity, cost_per_item, weight_per_item, manual_shipping_price,
+         zone, package_dimensions) = self._prepare(sale_price, quantity, cost_per_item, weight_per_item,
+                                                   manual_shipping_price, zone, package_dimensions)
+        row_count = len(sale_price)
+        self.logger.info(f"Choosing best channels for {row_count} rows")
+        fees = self._fee_matrix(sale_price, quantity)
+        shipping = self._shipping_matrix(weight_per_item, quantity, manual_shipping_price, zone,
+                                         package_dimensions)
+        rows = np.arange(row_count)
+
+        tier_choice = np.argmin(fees, axis=1)
+        service_choice = np.argmin(np.where(np.isnan(shipping), np.inf, shipping), axis=1)
+        shippable = ~np.isnan(shipping).all(axis=1)
+
+        total_marketplace_fees = fees[rows, tier_choice]
+        shipping_cost = shipping[rows, service_choice]
+        gross_revenue = sale_price * quantity
+        total_cost = (cost_per_item * quantity) + total_marketplace_fees + shipping_cost
+        net_profit = gross_revenue - total_cost
+        profit_margin = (net_profit / gross_revenue) * 100
+
+        def names(entries, choice, position):
+            column = np.array([entry[position] for entry in entries], dtype=object)[choice]
+            column[~shippable] = None
+            return column
+
+        return BatchChannelChoice(
+            marketplace=names(self.tiers, tier_choice, 0),
+            tier_id=names(self.tiers, tier_choice, 1),
+            carrier=names(self.services, service_choice, 0),
+            service_id=names(self.services, service_choice, 1),
+            gross_revenue=gross_revenue,
+            total_marketplace_fees=total_marketplace_fees,
+            shipping_cost=shipping_cost,
+            total_cost=total_cost,
+            net_profit=net_profit,
+            profit_margin=profit_margin
+        )
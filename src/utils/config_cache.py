@@ -0,0 +1,138 @@
+# src/utils/config_cache.py
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Callable, Optional, TypeVar
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.config_loader import ConfigLoader
+from src.utils.logger import Logger
+
+T = TypeVar("T")
+
+SNAPSHOT_VERSION = 2
+# Snapshots hold pickled model objects, so a change to any of these files invalidates them
+_MODEL_SOURCES = ("models/fee.py", "models/marketplace.py", "models/shipping.py", "utils/config_loader.py",
+                  "utils/config_schema.py")
+
+def _code_fingerprint() -> str:
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256(str(SNAPSHOT_VERSION).encode())
+    for source in _MODEL_SOURCES:
+        with open(os.path.join(src_dir, source), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+class ConfigSnapshotCache:
+    """
+    Compiled snapshots of config files. A snapshot is the fully built and
+    validated Marketplace/ShippingCarrier (fee kernels and rate indexes
+    included) pickled next to the source's path, mtime, size and SHA-256.
+    Loading one skips JSON parsing, validation and per-object logging.
+
+    A source whose mtime and size match its snapshot is a hit without
+    reading it; otherwise the content hash decides, so a touched but
+    unchanged file is still a hit. Any change to the source, or to the
+    model code, falls back to ConfigLoader and rewrites the snapshot.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.logger = Logger.get_logger()
+        self.fingerprint = _code_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def load_marketplace(self, file_path: str) -> Marketplace:
+        return self.load(file_path, ConfigLoader.load_marketplace)
+
+    def load_shipping(self, file_path: str) -> ShippingCarrier:
+        return self.load(file_path, ConfigLoader.load_shipping)
+
+    def snapshot_path(self, file_path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{key}.snapshot")
+
+    def cached_name(self, file_path: str, loader: Callable[[str], T]) -> Optional[str]:
+        """
+        Config name recorded in a current snapshot, read from the snapshot
+        header only; None when there is no snapshot or the source has changed.
+        """
+        header = self._read_header(self.snapshot_path(file_path), loader)
+        if header is None:
+            return None
+        stat = os.stat(file_path)
+        if header["mtime_ns"] != stat.st_mtime_ns or header["size"] != stat.st_size:
+            return None
+        return header.get("name")
+
+    def load(self, file_path: str, loader: Callable[[str], T]) -> T:
+        """
+        Returns the snapshot of file_path if it is current, else loader(file_path).
+        """
+        snapshot_path = self.snapshot_path(file_path)
+        stat = os.stat(file_path)
+        header = self._read_header(snapshot_path, loader)
+        if header is not None and header["mtime_ns"] == stat.st_mtime_ns and header["size"] == stat.st_size:
+            value = self._read_value(snapshot_path)
+            if value is not None:
+                self.hits += 1
+                self.logger.debug(f"Loaded config snapshot for {file_path}")
+                return value
+
+        with open(file_path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        if header is not None and header["sha256"] == content_hash:
+            value = self._read_value(snapshot_path)
+            if value is not None:
+                # Same content under a new mtime: refresh the header, keep the snapshot
+                self._write(snapshot_path, loader, stat, content_hash, value)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        self.logger.info(f"Config snapshot for {file_path} is missing or stale; parsing source")
+        value = loader(file_path)
+        self._write(snapshot_path, loader, stat, content_hash, value)
+        return value
+
+    def _read_header(self, snapshot_path: str, loader: Callable) -> Optional[dict]:
+        try:
+            with open(snapshot_path, "rb") as f:
+                header = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if (not isinstance(header, dict) or header.get("fingerprint") != self.fingerprint
+                or header.get("loader") != loader.__qualname__):
+            return None
+        return header
+
+    def _read_value(self, snapshot_path: str):
+        try:
+            with open(snapshot_path, "rb") as f:
+                pickle.load(f)  # header
+                return pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable config snapshot {snapshot_path}: {str(e)}")
+            return None
+
+    def _write(self, snapshot_path: str, loader: Callable, stat: os.stat_result, content_hash: str,
+               value) -> None:
+        header = {
+            "fingerprint": self.fingerprint,
+            "loader": loader.__qualname__,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": content_hash,
+            "name": getattr(value, "name", None),
+        }
+        # Written to a temporary file and renamed, so readers never see a partial snapshot
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write config snapshot {snapshot_path}: {str(e)}")
@@ -1,70 +1,39 @@
 # src/utils/config_loader.py
 import json
 import os
-from typing import Dict
-from src.models.fee import Fee, FeeType, FeeApplication
-from src.models.marketplace import Marketplace, SellerTier
-from src.models.shipping import ShippingCarrier, ShippingService, ShippingRate
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.config_schema import ConfigValidationError, build_marketplace, build_shipping
 from src.utils.logger import Logger
+from src.utils.profiling import Instrumentation, StageClock
+
+if TYPE_CHECKING:
+    # config_cache imports ConfigLoader, so only type checkers import it here
+    from src.utils.config_cache import ConfigSnapshotCache
 
 class ConfigLoader:
     logger = Logger.get_logger()
 
     @staticmethod
-    def load_marketplace(file_path: str) -> Marketplace:
+    def load_marketplace(file_path: str, data: Optional[Dict[str, Any]] = None) -> Marketplace:
         logger = ConfigLoader.logger
         logger.info(f"Loading marketplace configuration from: {file_path}")
         
+        clock = StageClock() if Instrumentation.enabled else None
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                logger.debug(f"Successfully loaded JSON data from {file_path}")
-            
-            tiers = {}
-            for tier_id, tier_data in data["tiers"].items():
-                logger.debug(f"Processing tier: {tier_id}")
-                fees = {}
-                
-                for fee_id, fee_data in tier_data["fees"].items():
-                    logger.debug(f"Processing fee: {fee_id} for tier: {tier_id}")
-                    
-                    # Determine fee type and get appropriate values
-                    if fee_data["type"] == "compound":
-                        fee_type = FeeType.COMPOUND
-                        percentage = fee_data.get("percentage")
-                        flat_fee = fee_data.get("flat_fee")
-                    elif fee_data["type"] == "percentage":
-                        fee_type = FeeType.PERCENTAGE
-                        percentage = fee_data.get("value")  # Changed from "percentage" to "value"
-                        flat_fee = None
-                    else:
-                        fee_type = FeeType.FLAT
-                        percentage = None
-                        flat_fee = fee_data.get("value", 0)  # Also using "value" for flat fees
-                    
-                    logger.debug(f"Determined fee type: {fee_type} for fee: {fee_id}")
-                    
-                    try:
-                        fees[fee_id] = Fee(
-                            type=fee_type,
-                            application=FeeApplication(fee_data["application"]),
-                            percentage=percentage,
-                            flat_fee=flat_fee
-                        )
-                    except ValueError as e:
-                        logger.error(f"Error creating fee {fee_id}: {str(e)}")
-                        raise
-                
-                tiers[tier_id] = SellerTier(
-                    name=tier_data["name"],
-                    fees=fees
-                )
-                logger.debug(f"Created tier {tier_id} with {len(fees)} fees")
-            
-            marketplace = Marketplace(
-                name=data["name"],
-                tiers=tiers
-            )
+            # Callers that already parsed the file (e.g. ConfigRegistry indexing) pass the document in
+            if data is None:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+                    logger.debug(f"Successfully loaded JSON data from {file_path}")
+            if clock:
+                clock.lap("config.marketplace.parse")
+
+            # Validated and built in one pass; every problem is reported together
+            marketplace = build_marketplace(data, source=file_path)
+            if clock:
+                clock.lap("config.marketplace.build")
             
             logger.info(f"Successfully loaded marketplace {marketplace.name} "
                        f"with {len(marketplace.tiers)} tiers")
@@ -76,8 +45,8 @@ class ConfigLoader:
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in marketplace configuration: {str(e)}")
             raise
-        except KeyError as e:
-            logger.error(f"Missing required field in marketplace configuration: {str(e)}")
+        except ConfigValidationError as e:
+            logger.error(f"Invalid marketplace configuration {str(e)}")
             raise
         except Exception as e:
             logger.error(f"Unexpected error loading marketplace configuration: {str(e)}", 
@@ -85,57 +54,24 @@ class ConfigLoader:
             raise
 
     @staticmethod
-    def load_shipping(file_path: str) -> ShippingCarrier:
+    def load_shipping(file_path: str, data: Optional[Dict[str, Any]] = None) -> ShippingCarrier:
         logger = ConfigLoader.logger
         logger.info(f"Loading shipping configuration from: {file_path}")
         
+        clock = StageClock() if Instrumentation.enabled else None
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                logger.debug(f"Successfully loaded JSON data from {file_path}")
-            
-            services = {}
-            for service_id, service_data in data["services"].items():
-                logger.debug(f"Processing shipping service: {service_id}")
-                
-                try:
-                    # Check if this is a manual entry service
-                    is_manual = service_data.get("manual_entry", False)
-                    
-                    rates = []
-                    # Only process rates if this is not a manual entry service
-                    if not is_manual:
-                        if "rates" not in service_data:
-                            logger.error(f"Missing rates for non-manual service: {service_id}")
-                            raise KeyError("rates")
-                            
-                        for rate_data in service_data["rates"]:
-                            rate = ShippingRate(
-                                weight_up_to=rate_data["weight_up_to"],
-                                price=rate_data["price"]
-                            )
-                            rates.append(rate)
-                            logger.debug(f"Added rate for weight up to {rate.weight_up_to}oz: "
-                                    f"${rate.price}")
-                    
-                    services[service_id] = ShippingService(
-                        name=service_data["name"],
-                        weight_limits=service_data["weight_limits"],
-                        rates=rates if not is_manual else None,
-                        manual_entry=is_manual
-                    )
-                    
-                    logger.debug(f"Created shipping service {service_id}" + 
-                            (f" with {len(rates)} rates" if not is_manual else " (manual entry)"))
-                    
-                except KeyError as e:
-                    logger.error(f"Missing required field in service {service_id}: {str(e)}")
-                    raise
-            
-            carrier = ShippingCarrier(
-                name=data["name"],
-                services=services
-            )
+            # Callers that already parsed the file (e.g. ConfigRegistry indexing) pass the document in
+            if data is None:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+                    logger.debug(f"Successfully loaded JSON data from {file_path}")
+            if clock:
+                clock.lap("config.shipping.parse")
+
+            # Validated and built in one pass; every problem is reported together
+            carrier = build_shipping(data, source=file_path)
+            if clock:
+                clock.lap("config.shipping.build")
             
             logger.info(f"Successfully loaded shipping carrier {carrier.name} "
                     f"with {len(carrier.services)} services")
@@ -147,10 +83,38 @@ class ConfigLoader:
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in shipping configuration: {str(e)}")
             raise
-        except KeyError as e:
-            logger.error(f"Missing required field in shipping configuration: {str(e)}")
+        except ConfigValidationError as e:
+            logger.error(f"Invalid shipping configuration {str(e)}")
             raise
         except Exception as e:
             logger.error(f"Unexpected error loading shipping configuration: {str(e)}", 
                         exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def load_marketplaces(directory: str, cache: Optional["ConfigSnapshotCache"] = None) -> Dict[str, Marketplace]:
+        """
+        Loads every marketplace JSON file in a directory, keyed by marketplace name.
+        With a ConfigSnapshotCache, unchanged files load from their snapshots.
+        """
+        load = cache.load_marketplace if cache else ConfigLoader.load_marketplace
+        marketplaces = {}
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".json"):
+                marketplace = load(os.path.join(directory, filename))
+                marketplaces[marketplace.name] = marketplace
+        return marketplaces
+
+    @staticmethod
+    def load_shipping_carriers(directory: str, cache: Optional["ConfigSnapshotCache"] = None) -> Dict[str, ShippingCarrier]:
+        """
+        Loads every shipping JSON file in a directory, keyed by carrier name.
+        With a ConfigSnapshotCache, unchanged files load from their snapshots.
+        """
+        load = cache.load_shipping if cache else ConfigLoader.load_shipping
+        carriers = {}
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".json"):
+                carrier = load(os.path.join(directory, filename))
+                carriers[carrier.name] = carrier
+        return carriers
\ No newline at end of file
@@ -0,0 +1,190 @@
+# src/utils/config_registry.py
+import json
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.config_cache import ConfigSnapshotCache
+from src.utils.config_loader import ConfigLoader
+from src.utils.logger import Logger
+
+T = TypeVar("T")
+
+def _read_document(file_path: str) -> Dict[str, Any]:
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+def _load_config(file_path: str, loader: Callable[..., T], cache: Optional[ConfigSnapshotCache],
+                 document: Optional[Dict[str, Any]] = None) -> T:
+    # Module-level so process pools can pickle it
+    if cache:
+        return cache.load(file_path, loader)
+    return loader(file_path, document)
+
+class ConfigRegistry(Mapping):
+    """
+    Read-only mapping from config name to Marketplace or ShippingCarrier
+    over one config directory, loading each file on first access.
+
+    The name index is built at construction without building any model
+    objects: from the header of a current snapshot when a
+    ConfigSnapshotCache is given, otherwise from the file's top-level
+    "name". Iterating, len() and `in` use only the index; indexing loads.
+    Without a cache the document parsed for the index is kept until its
+    config is loaded and built from it, so each file is parsed once.
+    When two files share a name the later file in sorted order wins, as
+    with ConfigLoader.load_marketplaces. warm_up() loads many files
+    concurrently for batch jobs that will touch most of them.
+
+    reload_file() swaps a re-read config in with copy-on-write, so a caller
+    that fetched an object keeps a consistent snapshot of it; version
+    counts swaps.
+    """
+    def __init__(self, directory: str, loader: Callable[..., T],
+                 cache: Optional[ConfigSnapshotCache] = None):
+        self.directory = directory
+        self.cache = cache
+        self.logger = Logger.get_logger()
+        self._source_loader = loader
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._loaded: Dict[str, T] = {}
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self.paths: Dict[str, str] = {}
+        self.version = 0
+        self._reload_listeners: List[Callable[[Optional[str]], None]] = []
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".json"):
+                file_path = os.path.join(directory, filename)
+                name = cache.cached_name(file_path, loader) if cache else None
+                if name is None:
+                    document = _read_document(file_path)
+                    name = document["name"]
+                    if cache is None:
+                        self._documents[name] = document
+                self.paths[name] = file_path
+        self.logger.info(f"Indexed {len(self.paths)} configs in {directory}")
+
+    @classmethod
+    def marketplaces(cls, directory: str, cache: Optional[ConfigSnapshotCache] = None) -> "ConfigRegistry":
+        return cls(directory, ConfigLoader.load_marketplace, cache)
+
+    @classmethod
+    def shipping_carriers(cls, directory: str, cache: Optional[ConfigSnapshotCache] = None) -> "ConfigRegistry":
+        return cls(directory, ConfigLoader.load_shipping, cache)
+
+    def __getitem__(self, name: str) -> T:
+        value = self._loaded.get(name)
+        if value is not None:
+            return value
+        file_path = self.paths[name]
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        # Per-name lock: concurrent first accesses to one config load it once
+        with load_lock:
+            while name not in self._loaded:
+                version = self.version
+                value = _load_config(file_path, self._source_loader, self.cache, self._documents.get(name))
+                with self._lock:
+                    # A reload during the load may have changed the file; load it again
+                    if self.version == version:
+                        self._loaded[name] = value
+                        self._documents.pop(name, None)
+                        self.logger.debug(f"Loaded config {name} on first access")
+                file_path = self.paths[name]
+            return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, name) -> bool:
+        return name in self.paths
+
+    def add_reload_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """
+        Calls listener(name) after every reload_file() swap.
+        """
+        self._reload_listeners.append(listener)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, workers: Optional[int] = None,
+                processes: bool = False) -> None:
+        """
+        Loads the named configs (default: all) that are not loaded yet.
+        Threads overlap file and snapshot I/O; processes=True builds large
+        configs on several cores and ships the built objects back.
+        """
+        pending = [name for name in (self.paths if names is None else names) if not self.is_loaded(name)]
+        if not pending:
+            return
+        paths = [self.paths[name] for name in pending]
+        workers = workers or min(len(pending), os.cpu_count() or 1)
+        executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        version = self.version
+        with executor_class(max_workers=workers) as executor:
+            values = list(executor.map(_load_config, paths, [self._source_loader] * len(paths),
+                                       [self.cache] * len(paths), [self._documents.get(name) for name in pending]))
+        with self._lock:
+            # As in __getitem__: a reload during the loads may have changed the files
+            installed = self.version == version
+            if installed:
+                for name, value in zip(pending, values):
+                    self._loaded.setdefault(name, value)
+                    self._documents.pop(name, None)
+        if not installed:
+            self.logger.info(f"Configs in {self.directory} were reloaded during warm-up; loading them again")
+            for name in pending:
+                if name in self.paths:
+                    self[name]
+            return
+        self.logger.info(f"Warmed up {len(pending)} configs from {self.directory} with {workers} workers")
+
+    def reload_file(self, file_path: str) -> Optional[str]:
+        """
+        Re-reads one config file after it was changed, added or deleted and
+        swaps the result in. Configs that were already loaded are rebuilt
+        now; others only have their index entry refreshed. If the file no
+        longer parses, the previous version stays in place. Returns the
+        config's name, or None when it was removed or failed to load.
+        """
+        old_names = [name for name, path in self.paths.items() if path == file_path]
+        document = None
+        if not os.path.exists(file_path):
+            name, value = None, None
+        else:
+            try:
+                if any(self.is_loaded(old_name) for old_name in old_names):
+                    value = _load_config(file_path, self._source_loader, self.cache)
+                    name = value.name
+                else:
+                    value = None
+                    document = _read_document(file_path)
+                    name = document["name"]
+            except Exception as e:
+                self.logger.error(f"Keeping previous config for {file_path}; reload failed: {str(e)}")
+                return None
+
+        with self._lock:
+            paths = {other: path for other, path in self.paths.items() if path != file_path}
+            loaded = {other: loaded for other, loaded in self._loaded.items() if other not in old_names}
+            documents = {other: kept for other, kept in self._documents.items() if other not in old_names}
+            if name is not None:
+                paths[name] = file_path
+                if value is not None:
+                    loaded[name] = value
+                elif self.cache is None:
+                    documents[name] = document
+            self.paths, self._loaded, self._documents = paths, loaded, documents
+            self.version += 1
+        self.logger.info(f"Reloaded {file_path}: " + (f"config {name}" if name else "removed"))
+        for listener in self._reload_listeners:
+            listener(name)
+        return name
@@ -0,0 +1,333 @@
+# src/utils/config_schema.py
+from typing import Any, Dict, List, Optional, Tuple
+from src.models.fee import Fee, FeeType, FeeApplication, FeeRounding, ROUNDING_MODES, ROUNDING_SCOPES
+from src.models.marketplace import Marketplace, SellerTier
+from src.models.shipping import ShippingCarrier, ShippingService, ShippingRate, ShippingRateMatrix, is_whole_units
+
+FEE_APPLICATIONS = tuple(application.value for application in FeeApplication)
+FEE_TYPES = tuple(fee_type.name.lower() for fee_type in FeeType)
+
+class ConfigValidationError(ValueError):
+    """
+    Every problem found in one config document, each prefixed with its JSON path.
+    """
+    def __init__(self, source: str, errors: List[str]):
+        self.source = source
+        self.errors = errors
+        super().__init__(f"{source}: {len(errors)} configuration error(s)\n  " + "\n  ".join(errors))
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class _SchemaWalker:
+    """
+    Walks a parsed config document once. Each build_* method checks one
+    node and returns its runtime object, or None if that node (or anything
+    under it) has errors; errors are collected rather than raised, so one
+    pass reports all of them.
+    """
+    def __init__(self):
+        self.errors: List[str] = []
+
+    def error(self, path: str, message: str) -> None:
+        self.errors.append(f"{path}: {message}")
+
+    def mapping(self, value: Any, path: str) -> Optional[Dict[str, Any]]:
+        if not isinstance(value, dict):
+            self.error(path, f"expected an object, got {type(value).__name__}")
+            return None
+        return value
+
+    def child(self, node: Dict[str, Any], key: str, path: str, required: bool = True) -> Any:
+        if key not in node:
+            if required:
+                self.error(f"{path}.{key}", "missing required field")
+            return None
+        return node[key]
+
+    def string(self, node: Dict[str, Any], key: str, path: str) -> Optional[str]:
+        value = self.child(node, key, path)
+        if value is not None and not isinstance(value, str):
+            self.error(f"{path}.{key}", f"expected a string, got {type(value).__name__}")
+            return None
+        return value
+
+    def number(self, node: Dict[str, Any], key: str, path: str, required: bool = True,
+               minimum: Optional[float] = None, positive: bool = False) -> Optional[float]:
+        value = self.child(node, key, path, required)
+        if value is None:
+            return None
+        if not _is_number(value):
+            self.error(f"{path}.{key}", f"expected a number, got {type(value).__name__}")
+            return None
+        if positive and value <= 0:
+            self.error(f"{path}.{key}", f"must be greater than 0, got {value}")
+            return None
+        if minimum is not None and value < minimum:
+            self.error(f"{path}.{key}", f"must be at least {minimum}, got {value}")
+            return None
+        return value
+
+    def increasing(self, values: List[float], path: str, what: str) -> bool:
+        for index in range(1, len(values)):
+            if values[index] <= values[index - 1]:
+                self.error(f"{path}[{index}]", f"{what} must be sorted and unique, "
+                                               f"{values[index]} follows {values[index - 1]}")
+                return False
+        return True
+
+    def build_rounding(self, node: Dict[str, Any], path: str) -> Optional[FeeRounding]:
+        data = self.child(node, "rounding", path, required=False)
+        rounding_path = f"{path}.rounding"
+        if data is None or self.mapping(data, rounding_path) is None:
+            return None
+        mode = data.get("mode", "half_up")
+        per = data.get("per", "order")
+        if mode not in ROUNDING_MODES:
+            self.error(f"{rounding_path}.mode", f"must be one of {', '.join(ROUNDING_MODES)}, got {mode!r}")
+            return None
+        if per not in ROUNDING_SCOPES:
+            self.error(f"{rounding_path}.per", f"must be one of {', '.join(ROUNDING_SCOPES)}, got {per!r}")
+            return None
+        return FeeRounding(mode=mode, per=per)
+
+    # Marketplaces
+
+    def build_marketplace(self, data: Any) -> Optional[Marketplace]:
+        root = self.mapping(data, "$")
+        if root is None:
+            return None
+        errors = len(self.errors)
+        name = self.string(root, "name", "$")
+        rounding = self.build_rounding(root, "$")
+        tiers = {}
+        tiers_data = self.child(root, "tiers", "$")
+        if tiers_data is not None and self.mapping(tiers_data, "$.tiers") is not None:
+            for tier_id, tier_data in tiers_data.items():
+                tiers[tier_id] = self.build_tier(tier_data, f"$.tiers.{tier_id}")
+        if len(self.errors) > errors:
+            return None
+        return Marketplace(name=name, tiers=tiers, rounding=rounding)
+
+    def build_tier(self, data: Any, path: str) -> Optional[SellerTier]:
+        node = self.mapping(data, path)
+        if node is None:
+            return None
+        errors = len(self.errors)
+        name = self.string(node, "name", path)
+        fees = {}
+        fees_data = self.child(node, "fees", path)
+        if fees_data is not None and self.mapping(fees_data, f"{path}.fees") is not None:
+            for fee_id, fee_data in fees_data.items():
+                fees[fee_id] = self.build_fee(fee_data, f"{path}.fees.{fee_id}")
+        if len(self.errors) > errors:
+            return None
+        return SellerTier(name=name, fees=fees)
+
+    def build_fee(self, data: Any, path: str) -> Optional[Fee]:
+        node = self.mapping(data, path)
+        if node is None:
+            return None
+        errors = len(self.errors)
+        fee_kind = self.child(node, "type", path)
+        if fee_kind == "compound":
+            fee_type = FeeType.COMPOUND
+            percentage = self.number(node, "percentage", path, minimum=0)
+            flat_fee = self.number(node, "flat_fee", path, minimum=0)
+        elif fee_kind == "percentage":
+            fee_type = FeeType.PERCENTAGE
+            percentage = self.number(node, "value", path, minimum=0)
+            flat_fee = None
+        elif fee_kind == "flat":
+            # A flat fee without a value is 0
+            fee_type = FeeType.FLAT
+            percentage = None
+            flat_fee = self.number(node, "value", path, required=False, minimum=0)
+            if flat_fee is None and "value" not in node:
+                flat_fee = 0
+        else:
+            if fee_kind is not None:
+                self.error(f"{path}.type", f"must be one of {', '.join(FEE_TYPES)}, got {fee_kind!r}")
+            fee_type = percentage = flat_fee = None
+
+        application = self.child(node, "application", path)
+        if application is not None and application not in FEE_APPLICATIONS:
+            self.error(f"{path}.application", f"must be one of {', '.join(FEE_APPLICATIONS)}, "
+                                              f"got {application!r}")
+        rounding = self.build_rounding(node, path)
+        if len(self.errors) > errors:
+            return None
+        return Fee(type=fee_type, application=FeeApplication(application),
+                   percentage=percentage, flat_fee=flat_fee, rounding=rounding)
+
+    # Shipping
+
+    def build_shipping(self, data: Any) -> Optional[ShippingCarrier]:
+        root = self.mapping(data, "$")
+        if root is None:
+            return None
+        errors = len(self.errors)
+        name = self.string(root, "name", "$")
+        services = {}
+        services_data = self.child(root, "services", "$")
+        if services_data is not None and self.mapping(services_data, "$.services") is not None:
+            for service_id, service_data in services_data.items():
+                services[service_id] = self.build_service(service_data, f"$.services.{service_id}")
+        if len(self.errors) > errors:
+            return None
+        return ShippingCarrier(name=name, services=services)
+
+    def build_weight_limits(self, node: Dict[str, Any], path: str) -> Optional[Dict[str, float]]:
+        limits = self.child(node, "weight_limits", path)
+        limits_path = f"{path}.weight_limits"
+        if limits is None or self.mapping(limits, limits_path) is None:
+            return None
+        minimum = self.number(limits, "min", limits_path, minimum=0)
+        maximum = self.number(limits, "max", limits_path, minimum=0)
+        if minimum is None or maximum is None:
+            return None
+        if minimum > maximum:
+            self.error(limits_path, f"min ({minimum}) is greater than max ({maximum})")
+            return None
+        return limits
+
+    def build_rates(self, node: Dict[str, Any], path: str) -> Optional[List[ShippingRate]]:
+        rates_data = self.child(node, "rates", path)
+        rates_path = f"{path}.rates"
+        if rates_data is None:
+            return None
+        if not isinstance(rates_data, list):
+            self.error(rates_path, f"expected an array, got {type(rates_data).__name__}")
+            return None
+        if not rates_data:
+            self.error(rates_path, "expected at least one rate")
+            return None
+        errors = len(self.errors)
+        breaks: List[Tuple[float, float]] = []
+        for index, rate_data in enumerate(rates_data):
+            rate_path = f"{rates_path}[{index}]"
+            rate = self.mapping(rate_data, rate_path)
+            if rate is None:
+                continue
+            weight_up_to = self.number(rate, "weight_up_to", rate_path, positive=True)
+            price = self.number(rate, "price", rate_path, minimum=0)
+            if weight_up_to is not None and price is not None:
+                breaks.append((weight_up_to, price))
+        if len(self.errors) > errors:
+            return None
+        if not self.increasing([weight for weight, _ in breaks], f"{rates_path}", "rates weight_up_to"):
+            return None
+        return [ShippingRate(weight_up_to=weight, price=price) for weight, price in breaks]
+
+    def build_rate_matrix(self, data: Any, path: str) -> Optional[ShippingRateMatrix]:
+        node = self.mapping(data, path)
+        if node is None:
+            return None
+        errors = len(self.errors)
+        zones = self.child(node, "zones", path)
+        if zones is not None:
+            if not isinstance(zones, list) or not zones:
+                self.error(f"{path}.zones", "expected a non-empty array")
+            else:
+                zones = [str(zone) for zone in zones]
+                if len(set(zones)) != len(zones):
+                    self.error(f"{path}.zones", "zones must be unique")
+        unit_errors = len(self.errors)
+        weight_unit = self.number(node, "weight_unit", path, required=False, positive=True)
+        unit = 1.0 if weight_unit is None else weight_unit
+        weight_breaks = self.child(node, "weight_breaks", path)
+        if weight_breaks is not None:
+            if not isinstance(weight_breaks, list) or not weight_breaks:
+                self.error(f"{path}.weight_breaks", "expected a non-empty array")
+            elif not all(_is_number(weight) and weight > 0 for weight in weight_breaks):
+                self.error(f"{path}.weight_breaks", "weight breaks must be numbers greater than 0")
+            else:
+                self.increasing(weight_breaks, f"{path}.weight_breaks", "weight breaks")
+                # Weights bill in whole units, so other breaks would misprice (skipped if weight_unit is invalid)
+                if len(self.errors) == unit_errors:
+                    for index, weight in enumerate(weight_breaks):
+                        if not is_whole_units(weight, unit):
+                            self.error(f"{path}.weight_breaks[{index}]",
+                                       f"{weight} is not a whole multiple of weight_unit {unit}")
+        # Price cells are checked even when zones or breaks have errors, so one run reports everything
+        prices = self.child(node, "prices", path)
+        if prices is not None:
+            if not isinstance(prices, list):
+                self.error(f"{path}.prices", f"expected an array, got {type(prices).__name__}")
+                prices = []
+            elif isinstance(weight_breaks, list) and weight_breaks and len(prices) != len(weight_breaks):
+                self.error(f"{path}.prices", f"expected {len(weight_breaks)} rows, one per weight break")
+            for row_index, row in enumerate(prices):
+                row_path = f"{path}.prices[{row_index}]"
+                if not isinstance(row, list):
+                    self.error(row_path, f"expected an array, got {type(row).__name__}")
+                    continue
+                if isinstance(zones, list) and zones and len(row) != len(zones):
+                    self.error(row_path, f"expected {len(zones)} prices, one per zone")
+                for column, price in enumerate(row):
+                    if price is not None and not (_is_number(price) and price >= 0):
+                        self.error(f"{row_path}[{column}]", f"expected a price >= 0 or null, got {price!r}")
+        if len(self.errors) > errors:
+            return None
+        return ShippingRateMatrix(zones=zones, weight_breaks=weight_breaks, prices=prices, weight_unit=unit)
+
+    def build_service(self, data: Any, path: str) -> Optional[ShippingService]:
+        node = self.mapping(data, path)
+        if node is None:
+            return None
+        errors = len(self.errors)
+        name = self.string(node, "name", path)
+        weight_limits = self.build_weight_limits(node, path)
+        manual_entry = node.get("manual_entry", False)
+        if not isinstance(manual_entry, bool):
+            self.error(f"{path}.manual_entry", f"expected true or false, got {manual_entry!r}")
+        rates = None
+        rate_matrix = None
+        if manual_entry is False:
+            if "rate_matrix" in node:
+                rate_matrix = self.build_rate_matrix(node["rate_matrix"], f"{path}.rate_matrix")
+            elif "rates" not in node:
+                self.error(path, "non-manual service needs rates or a rate_matrix")
+            else:
+                rates = self.build_rates(node, path)
+        # Weights above the last break would pass the limits check and then have no rate
+        heaviest = (rates[-1].weight_up_to if rates else
+                    max(rate_matrix.weight_breaks) if rate_matrix else None)
+        if weight_limits is not None and heaviest is not None and weight_limits["max"] > heaviest:
+            self.error(f"{path}.weight_limits.max", f"{weight_limits['max']} is above the heaviest rate "
+                                                   f"({heaviest}); heavier parcels would have no rate")
+        dim_divisor = self.number(node, "dim_divisor", path, required=False, positive=True)
+        dim_min_volume = self.number(node, "dim_min_volume", path, required=False, minimum=0)
+        if len(self.errors) > errors:
+            return None
+        return ShippingService(
+            name=name,
+            weight_limits=weight_limits,
+            rates=rates,
+            manual_entry=manual_entry,
+            rate_matrix=rate_matrix,
+            dim_divisor=dim_divisor,
+            dim_min_volume=0.0 if dim_min_volume is None else dim_min_volume
+        )
+
+def build_marketplace(data: Any, source: str = "<marketplace>") -> Marketplace:
+    """
+    Validates a parsed marketplace document and builds it in the same pass.
+    Raises ConfigValidationError listing every error found.
+    """
+    walker = _SchemaWalker()
+    marketplace = walker.build_marketplace(data)
+    if walker.errors:
+        raise ConfigValidationError(source, walker.errors)
+    return marketplace
+
+def build_shipping(data: Any, source: str = "<shipping>") -> ShippingCarrier:
+    """
+    Validates a parsed shipping document and builds it in the same pass.
+    Raises ConfigValidationError listing every error found.
+    """
+    walker = _SchemaWalker()
+    carrier = walker.build_shipping(data)
+    if walker.errors:
+        raise ConfigValidationError(source, walker.errors)
+    return carrier
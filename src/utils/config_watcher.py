@@ -0,0 +1,85 @@
+# src/utils/config_watcher.py
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from src.utils.config_registry import ConfigRegistry
+from src.utils.logger import Logger
+
+class ConfigWatcher:
+    """
+    Polls the directories of one or more ConfigRegistry objects and hands
+    each changed, added or deleted JSON file to its registry's
+    reload_file(). Files are compared by mtime and size, so unchanged
+    configs are never re-read. Call poll() directly for a single scan, or
+    start() to poll on a background thread every interval seconds.
+
+    Use as a context manager, or call stop() when done.
+    """
+    def __init__(self, registries: List[ConfigRegistry], interval: float = 2.0):
+        self.registries = registries
+        self.interval = interval
+        self.logger = Logger.get_logger()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen: Dict[str, Tuple[int, int]] = {}
+        for registry in registries:
+            self._seen.update(self._scan(registry))
+
+    @staticmethod
+    def _scan(registry: ConfigRegistry) -> Dict[str, Tuple[int, int]]:
+        files = {}
+        for filename in os.listdir(registry.directory):
+            if filename.endswith(".json"):
+                file_path = os.path.join(registry.directory, filename)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                files[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self) -> List[str]:
+        """
+        One scan; reloads what changed since the last scan and returns those paths.
+        """
+        changed = []
+        for registry in self.registries:
+            current = self._scan(registry)
+            known = {path for path in self._seen if os.path.dirname(path) == registry.directory}
+            for file_path in sorted(known | set(current)):
+                if self._seen.get(file_path) == current.get(file_path):
+                    continue
+                registry.reload_file(file_path)
+                changed.append(file_path)
+                if file_path in current:
+                    self._seen[file_path] = current[file_path]
+                else:
+                    del self._seen[file_path]
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.error(f"Config watcher poll failed: {str(e)}", exc_info=True)
+
+    def start(self) -> "ConfigWatcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+            self._thread.start()
+            self.logger.info(f"Watching {len(self.registries)} config directories every {self.interval}s")
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
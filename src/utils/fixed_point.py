@@ -0,0 +1,408 @@
+# src/utils/fixed_point.py
+import logging
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.models.fee import Fee, FeeType, FeeApplication, FeeRounding
+from src.models.marketplace import Marketplace, SellerTier
+from src.models.shipping import ShippingCarrier
+from src.utils.calculator import ProfitCalculationResult, BatchProfitCalculationResult, _id_column
+from src.utils.logger import Logger
+
+CENTS = 100
+# Percentages are held as integer parts per million of the base (12.55% -> 125500)
+RATE_SCALE = 1_000_000
+DEFAULT_ROUNDING = FeeRounding()
+INT64_LIMIT = 2 ** 63
+
+def to_cents(amount: Union[float, str, Decimal]) -> int:
+    """
+    Dollars to integer cents, rounding half up at the cent.
+    """
+    return int(Decimal(str(amount)).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def _exact(value: float, scale: int, what: str) -> int:
+    scaled = Decimal(str(value)) * scale
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"{what} {value} cannot be represented exactly in fixed-point money mode")
+    return int(scaled)
+
+def _divide(numerator: int, mode: str) -> int:
+    # numerator / RATE_SCALE rounded to whole cents; numerators are never negative
+    if mode == "down":
+        return numerator // RATE_SCALE
+    if mode == "up":
+        return -(-numerator // RATE_SCALE)
+    quotient, remainder = divmod(numerator, RATE_SCALE)
+    twice = 2 * remainder
+    if twice > RATE_SCALE or (twice == RATE_SCALE and (mode == "half_up" or quotient % 2)):
+        quotient += 1
+    return quotient
+
+def _divide_array(numerator: np.ndarray, mode: str) -> np.ndarray:
+    if mode == "down":
+        return numerator // RATE_SCALE
+    if mode == "up":
+        return -(-numerator // RATE_SCALE)
+    quotient, remainder = np.divmod(numerator, RATE_SCALE)
+    twice = 2 * remainder
+    round_up = twice > RATE_SCALE
+    if mode == "half_up":
+        round_up |= twice == RATE_SCALE
+    else:
+        round_up |= (twice == RATE_SCALE) & (quotient % 2 == 1)
+    return quotient + round_up
+
+def _require_cents(name: str, value) -> None:
+    if isinstance(value, bool) or not isinstance(value, (int, np.integer)):
+        raise ValueError(f"{name} must be integer cents (see to_cents), got {value!r}")
+
+def _cents_column(name: str, values, missing: Optional[int] = None) -> np.ndarray:
+    """
+    A cent column as int64. Integer dtypes pass through; other values must
+    be whole numbers, so dollar amounts are rejected rather than truncated.
+    None (or NaN) becomes `missing` where that is allowed.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64, copy=False)
+    try:
+        floats = values.astype(np.float64) if values.dtype.kind in "fO" else None
+    except (TypeError, ValueError):
+        floats = None
+    if floats is None:
+        raise ValueError(f"{name} must be integer cents (see to_cents)")
+    absent = np.isnan(floats)
+    if missing is None and absent.any():
+        raise ValueError(f"{name} must be integer cents (see to_cents)")
+    present = floats[~absent]
+    if not (np.isfinite(present).all() and (present == np.floor(present)).all()):
+        raise ValueError(f"{name} must be integer cents (see to_cents), got non-integral values")
+    return np.where(absent, missing if missing is not None else 0, floats).astype(np.int64)
+
+def _shipping_cents(rate: Optional[float]) -> int:
+    # get_rate returning None means no charge, as in calculate_profit
+    return 0 if rate is None else int(round(rate * CENTS))
+
+@dataclass(frozen=True)
+class FixedPointFee:
+    """
+    One fee in integer units: rate_ppm is the percentage in parts per
+    million of the base, flat_cents the flat part. Only the percentage part
+    is ever rounded, once per item or once per order line as the fee's
+    rounding rule says.
+    """
+    rate_ppm: int
+    flat_cents: int
+    per_item: bool
+    round_per_item: bool
+    mode: str
+
+    @staticmethod
+    def compile(name: str, fee: Fee, default: FeeRounding) -> "FixedPointFee":
+        rounding = fee.rounding or default
+        rate_ppm = flat_cents = 0
+        if fee.type in (FeeType.PERCENTAGE, FeeType.COMPOUND):
+            rate_ppm = _exact(fee.percentage, RATE_SCALE // 100, f"Fee {name} percentage")
+        if fee.type in (FeeType.FLAT, FeeType.COMPOUND):
+            flat_cents = _exact(fee.flat_fee, CENTS, f"Fee {name} flat fee")
+        return FixedPointFee(
+            rate_ppm=rate_ppm,
+            flat_cents=flat_cents,
+            per_item=fee.application == FeeApplication.PER_ITEM,
+            round_per_item=rounding.per == "item",
+            mode=rounding.mode
+        )
+
+    def amount(self, sale_price: int, quantity: int) -> int:
+        if self.per_item and not self.round_per_item:
+            return _divide(sale_price * self.rate_ppm * quantity, self.mode) + self.flat_cents * quantity
+        fee = _divide(sale_price * self.rate_ppm, self.mode) + self.flat_cents
+        return fee * quantity if self.per_item else fee
+
+    def amounts(self, sale_price: np.ndarray, quantity: np.ndarray) -> np.ndarray:
+        if self.per_item and not self.round_per_item:
+            return _divide_array(sale_price * self.rate_ppm * quantity, self.mode) + self.flat_cents * quantity
+        fee = _divide_array(sale_price * self.rate_ppm, self.mode) + self.flat_cents
+        return fee * quantity if self.per_item else fee
+
+def compile_tier(tier: SellerTier, default: Optional[FeeRounding] = None) -> Dict[str, FixedPointFee]:
+    default = default or DEFAULT_ROUNDING
+    return {name: FixedPointFee.compile(name, fee, default) for name, fee in tier.fees.items()}
+
+@dataclass
+class FixedPointResult:
+    """
+    ProfitCalculationResult in integer cents. Every amount is exact, so
+    fees, costs and profit reconcile to the cent when summed.
+    """
+    gross_revenue: int
+    total_marketplace_fees: int
+    shipping_cost: int
+    total_cost: int
+    net_profit: int
+    profit_margin: float
+    fee_breakdown: Dict[str, int]
+
+    def to_dollars(self) -> ProfitCalculationResult:
+        return ProfitCalculationResult(
+            gross_revenue=self.gross_revenue / CENTS,
+            total_marketplace_fees=self.total_marketplace_fees / CENTS,
+            shipping_cost=self.shipping_cost / CENTS,
+            total_cost=self.total_cost / CENTS,
+            net_profit=self.net_profit / CENTS,
+            profit_margin=self.profit_margin,
+            fee_breakdown={fee_name: amount / CENTS for fee_name, amount in self.fee_breakdown.items()}
+        )
+
+@dataclass
+class BatchFixedPointResult:
+    """
+    Columnar FixedPointResult: int64 cent columns, float profit_margin.
+    Fee breakdown columns are masked where the row's tier does not charge
+    that fee.
+    """
+    gross_revenue: np.ndarray
+    total_marketplace_fees: np.ndarray
+    shipping_cost: np.ndarray
+    total_cost: np.ndarray
+    net_profit: np.ndarray
+    profit_margin: np.ndarray
+    fee_breakdown: Dict[str, np.ma.MaskedArray]
+
+    def __len__(self) -> int:
+        return len(self.gross_revenue)
+
+    def row(self, index: int) -> FixedPointResult:
+        return FixedPointResult(
+            gross_revenue=int(self.gross_revenue[index]),
+            total_marketplace_fees=int(self.total_marketplace_fees[index]),
+            shipping_cost=int(self.shipping_cost[index]),
+            total_cost=int(self.total_cost[index]),
+            net_profit=int(self.net_profit[index]),
+            profit_margin=float(self.profit_margin[index]),
+            fee_breakdown={
+                fee_name: int(values.data[index])
+                for fee_name, values in self.fee_breakdown.items()
+                if not np.ma.getmaskarray(values)[index]
+            }
+        )
+
+    def to_dollars(self) -> BatchProfitCalculationResult:
+        return BatchProfitCalculationResult(
+            gross_revenue=self.gross_revenue / CENTS,
+            total_marketplace_fees=self.total_marketplace_fees / CENTS,
+            shipping_cost=self.shipping_cost / CENTS,
+            total_cost=self.total_cost / CENTS,
+            net_profit=self.net_profit / CENTS,
+            profit_margin=self.profit_margin,
+            fee_breakdown={fee_name: (values / CENTS).filled(np.nan)
+                           for fee_name, values in self.fee_breakdown.items()}
+        )
+
+class FixedPointCalculator:
+    """
+    ProfitCalculator in exact money arithmetic. Prices, costs and manual
+    shipping are integer cents (see to_cents), weights stay in ounces.
+    Fee percentages are compiled once to parts per million and flat fees to
+    cents; each fee is rounded to the cent by its own rounding rule, else
+    the marketplace's, else half up per order. Looked-up shipping rates are
+    rounded to the cent. Batch results match calculate_profit row for row.
+    """
+    def __init__(self, marketplace: Marketplace, shipping_carrier: ShippingCarrier):
+        self.marketplace = marketplace
+        self.shipping_carrier = shipping_carrier
+        self.logger = Logger.get_logger()
+        self.tiers = {tier_id: compile_tier(tier, marketplace.rounding)
+                      for tier_id, tier in marketplace.tiers.items()}
+        self.logger.info(f"Initialized FixedPointCalculator with marketplace: {marketplace.name}, "
+                        f"shipping carrier: {shipping_carrier.name}")
+
+    def calculate_profit(
+        self,
+        sale_price: int,
+        quantity: int,
+        cost_per_item: int,
+        weight_per_item: float,
+        tier_id: str,
+        shipping_service_id: str,
+        manual_shipping_price: Optional[int] = None,
+        zone: Optional[str] = None,
+        package_dimensions: Optional[Tuple[float, float, float]] = None,
+        include_fee_breakdown: bool = True
+    ) -> FixedPointResult:
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("Fixed-point calculation: %s items at %s cents, tier=%s, shipping_service=%s",
+                              quantity, sale_price, tier_id, shipping_service_id)
+        _require_cents("sale_price", sale_price)
+        _require_cents("cost_per_item", cost_per_item)
+        if manual_shipping_price is not None:
+            _require_cents("manual_shipping_price", manual_shipping_price)
+        services = self.shipping_carrier.services
+        if shipping_service_id not in services:
+            raise ValueError(f"Invalid shipping_service_id: {shipping_service_id}")
+        shipping_service = services[shipping_service_id]
+        is_manual_entry = getattr(shipping_service, 'manual_entry', False)
+
+        if not all([sale_price > 0, quantity > 0, cost_per_item >= 0, tier_id, shipping_service_id]):
+            raise ValueError("Required parameters must have valid values")
+        if is_manual_entry:
+            if manual_shipping_price is None or manual_shipping_price < 0:
+                raise ValueError("Manual shipping price must be provided and non-negative")
+        elif weight_per_item <= 0:
+            raise ValueError("Weight must be greater than 0 for non-manual shipping")
+        if tier_id not in self.tiers:
+            raise ValueError(f"Invalid tier_id: {tier_id}")
+
+        gross_revenue = sale_price * quantity
+        fee_breakdown = {fee_name: fee.amount(sale_price, quantity)
+                         for fee_name, fee in self.tiers[tier_id].items()}
+        total_marketplace_fees = sum(fee_breakdown.values())
+
+        if is_manual_entry:
+            shipping_cost = manual_shipping_price
+        else:
+            shipping_cost = _shipping_cents(shipping_service.get_rate(
+                weight_per_item * quantity, zone=zone, dimensions=package_dimensions))
+
+        total_cost = (cost_per_item * quantity) + total_marketplace_fees + shipping_cost
+        net_profit = gross_revenue - total_cost
+        if debug:
+            self.logger.debug("Fixed-point result: fees=%s, shipping=%s, profit=%s cents",
+                              total_marketplace_fees, shipping_cost, net_profit)
+        return FixedPointResult(
+            gross_revenue=gross_revenue,
+            total_marketplace_fees=total_marketplace_fees,
+            shipping_cost=shipping_cost,
+            total_cost=total_cost,
+            net_profit=net_profit,
+            profit_margin=(net_profit / gross_revenue) * 100,
+            fee_breakdown=fee_breakdown if include_fee_breakdown else {}
+        )
+
+    def calculate_profit_batch(
+        self,
+        sale_price: Sequence[int],
+        quantity: Sequence[int],
+        cost_per_item: Sequence[int],
+        weight_per_item: Sequence[float],
+        tier_id: Union[str, Sequence[str]],
+        shipping_service_id: Union[str, Sequence[str]],
+        manual_shipping_price: Optional[Sequence[int]] = None,
+        zone: Union[str, Sequence[Optional[str]], None] = None,
+        package_dimensions: Optional[Sequence[Tuple[float, float, float]]] = None,
+        include_fee_breakdown: bool = True
+    ) -> BatchFixedPointResult:
+        """
+        Vectorized calculate_profit over int64 cent columns; arguments are
+        as for ProfitCalculator.calculate_profit_batch. Manual shipping
+        prices of -1 (or None) mean none was given.
+        """
+        sale_price = _cents_column("sale_price", sale_price)
+        quantity = np.asarray(quantity, dtype=np.int64)
+        cost_per_item = _cents_column("cost_per_item", cost_per_item)
+        weight_per_item = np.asarray(weight_per_item, dtype=np.float64)
+        row_count = len(sale_price)
+        tier_id = _id_column(tier_id, row_count)
+        shipping_service_id = _id_column(shipping_service_id, row_count)
+        if manual_shipping_price is None:
+            manual_shipping_price = np.full(row_count, -1, dtype=np.int64)
+        else:
+            manual_shipping_price = _cents_column("manual_shipping_price", manual_shipping_price, missing=-1)
+        if zone is not None and not isinstance(zone, str):
+            zone = _id_column(zone, row_count)
+        if package_dimensions is not None:
+            package_dimensions = np.asarray(package_dimensions, dtype=np.float64).reshape(-1, 3)
+        self.logger.info(f"Starting fixed-point batch calculation for {row_count} rows")
+
+        columns = [quantity, cost_per_item, weight_per_item, tier_id, shipping_service_id, manual_shipping_price]
+        if zone is not None and not isinstance(zone, str):
+            columns.append(zone)
+        if package_dimensions is not None:
+            columns.append(package_dimensions)
+        if any(len(column) != row_count for column in columns):
+            raise ValueError("All input columns must have the same length")
+
+        services = self.shipping_carrier.services
+        service_ids, service_index = np.unique(shipping_service_id, return_inverse=True)
+        tier_ids, tier_index = np.unique(tier_id, return_inverse=True)
+        for service_id in service_ids:
+            if service_id not in services:
+                raise ValueError(f"Invalid shipping_service_id: {service_id}")
+        is_manual_entry = np.array(
+            [getattr(services[service_id], 'manual_entry', False) for service_id in service_ids],
+            dtype=bool
+        )[service_index]
+
+        _raise_for_invalid_rows(~((sale_price > 0) & (quantity > 0) & (cost_per_item >= 0)),
+                                "Required parameters must have valid values")
+        _raise_for_invalid_rows(is_manual_entry & (manual_shipping_price < 0),
+                                "Manual shipping price must be provided and non-negative")
+        _raise_for_invalid_rows(~is_manual_entry & (weight_per_item <= 0),
+                                "Weight must be greater than 0 for non-manual shipping")
+        for tier in tier_ids:
+            if tier not in self.tiers:
+                raise ValueError(f"Invalid tier_id: {tier}")
+        self._check_range(sale_price, quantity, tier_ids)
+
+        gross_revenue = sale_price * quantity
+        fee_amounts: Dict[str, np.ndarray] = {}
+        fee_charged: Dict[str, np.ndarray] = {}
+        total_marketplace_fees = np.zeros(row_count, dtype=np.int64)
+        for index, tier in enumerate(tier_ids):
+            rows = np.flatnonzero(tier_index == index)
+            for fee_name, fee in self.tiers[tier].items():
+                amounts = fee.amounts(sale_price[rows], quantity[rows])
+                total_marketplace_fees[rows] += amounts
+                if include_fee_breakdown:
+                    if fee_name not in fee_amounts:
+                        fee_amounts[fee_name] = np.zeros(row_count, dtype=np.int64)
+                        fee_charged[fee_name] = np.zeros(row_count, dtype=bool)
+                    fee_amounts[fee_name][rows] = amounts
+                    fee_charged[fee_name][rows] = True
+
+        shipping_cost = np.zeros(row_count, dtype=np.int64)
+        total_weight = weight_per_item * quantity
+        for index, service_id in enumerate(service_ids):
+            rows = np.flatnonzero(service_index == index)
+            service = services[service_id]
+            if getattr(service, 'manual_entry', False):
+                shipping_cost[rows] = manual_shipping_price[rows]
+            else:
+                rates = service.get_rates(
+                    total_weight[rows],
+                    zones=zone if zone is None or isinstance(zone, str) else zone[rows],
+                    dimensions=None if package_dimensions is None else package_dimensions[rows]
+                )
+                shipping_cost[rows] = np.rint(np.nan_to_num(rates, nan=0.0) * CENTS).astype(np.int64)
+
+        total_cost = (cost_per_item * quantity) + total_marketplace_fees + shipping_cost
+        net_profit = gross_revenue - total_cost
+        self.logger.info(f"Completed fixed-point batch calculation for {row_count} rows")
+        return BatchFixedPointResult(
+            gross_revenue=gross_revenue,
+            total_marketplace_fees=total_marketplace_fees,
+            shipping_cost=shipping_cost,
+            total_cost=total_cost,
+            net_profit=net_profit,
+            profit_margin=(net_profit / gross_revenue) * 100,
+            fee_breakdown={fee_name: np.ma.MaskedArray(amounts, mask=~fee_charged[fee_name])
+                           for fee_name, amounts in fee_amounts.items()}
+        )
+
+    def _check_range(self, sale_price: np.ndarray, quantity: np.ndarray, tier_ids: Sequence[str]) -> None:
+        # The widest intermediate is price * rate_ppm * quantity; keep it inside int64
+        if not len(sale_price):
+            return
+        max_rate = max([fee.rate_ppm for tier in tier_ids for fee in self.tiers[tier].values()] or [0])
+        largest = int(sale_price.max()) * max(max_rate, RATE_SCALE) * int(quantity.max())
+        if largest >= INT64_LIMIT:
+            raise ValueError("Batch amounts are too large for int64 fixed-point arithmetic; "
+                             "use calculate_profit for these rows")
+
+def _raise_for_invalid_rows(invalid: np.ndarray, message: str) -> None:
+    if invalid.any():
+        row = int(np.flatnonzero(invalid)[0])
+        raise ValueError(f"{message} (row {row})")
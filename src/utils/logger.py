@@ -1,24 +1,246 @@
+import atexit
+import gzip
 import logging
 import os
+import queue
+import shutil
 import sys
-from datetime import datetime
-from typing import Optional
+import threading
+import time
+from datetime import datetime, timedelta
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
+from typing import Optional, Union
+
+OVERFLOW_POLICIES = ("block", "drop")
+# Overrides the default DEBUG level, e.g. WARNING for quiet production runs
+LOG_LEVEL_ENV = "MARKETPLACE_CALC_LOG_LEVEL"
+# Overrides the default <project>/logs directory, e.g. a temporary directory for tests
+LOG_DIR_ENV = "MARKETPLACE_CALC_LOG_DIR"
+# Set by the first process to log; child processes (pool workers) see another pid here
+_LOG_OWNER_ENV = "MARKETPLACE_CALC_LOG_OWNER"
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "logs")
+
+def resolve_level(level) -> int:
+    """
+    Accepts a logging level number or name ("debug", "WARNING", ...).
+    """
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return value
+
+class _BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue: when the queue is full it either blocks
+    the caller until the listener catches up, or drops the record and counts it.
+    """
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str):
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """
+    File handler that rolls the log over when it reaches max_bytes or when
+    the rotation interval passes ("midnight", "hourly", a number of seconds,
+    or None for size only). Rotated segments are renamed to
+    <filename>.<YYYYmmdd-HHMMSS-ffffff>, so they sort oldest first.
+
+    Only the rename and reopen happen on the logging thread. Gzip
+    compression and pruning to the newest backup_count archives run on a
+    background thread, so a rollover never waits on compressing a large file.
+    close() waits for pending compression to finish.
+
+    Rotation is single-process: only one process may write a given file.
+    Logger gives each child process (e.g. ParallelProfitCalculator
+    workers) its own app-<pid>.log for this reason.
+    """
+    def __init__(self, filename: str, max_bytes: int = 0, rotate_when: Union[str, float, None] = None,
+                 backup_count: int = 0, compress: bool = True, encoding: Optional[str] = None):
+        if isinstance(rotate_when, str) and rotate_when not in ("midnight", "hourly"):
+            raise ValueError("rotate_when must be 'midnight', 'hourly', a number of seconds or None")
+        super().__init__(filename, "a", encoding=encoding)
+        self.max_bytes = max_bytes
+        self.rotate_when = rotate_when
+        self.backup_count = backup_count
+        self.compress = compress
+        # Measured from the last write, so a file left over from an earlier period rolls on first use
+        last_write = os.stat(self.baseFilename).st_mtime if os.path.exists(self.baseFilename) else time.time()
+        self.rollover_at = self._next_rollover(last_write)
+        self._jobs: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def _next_rollover(self, now: float) -> Optional[float]:
+        if self.rotate_when is None:
+            return None
+        if self.rotate_when == "midnight":
+            tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+            return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+        if self.rotate_when == "hourly":
+            return now + 3600
+        return now + float(self.rotate_when)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        # Size is checked before writing, so a segment can exceed max_bytes by one record;
+        # this avoids formatting every record twice as RotatingFileHandler does
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes > 0 and self.stream is not None:
+            return self.stream.tell() >= self.max_bytes
+        return False
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            segment = f"{self.baseFilename}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+            while os.path.exists(segment) or os.path.exists(f"{segment}.gz"):
+                segment += "0"
+            os.rename(self.baseFilename, segment)
+            self._submit(segment)
+        self.stream = self._open()
+        self.rollover_at = self._next_rollover(time.time())
+
+    def _submit(self, segment: str) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._archive_segments, name="log-archiver", daemon=True)
+            self._worker.start()
+        self._jobs.put(segment)
+
+    def _archive_segments(self) -> None:
+        while True:
+            segment = self._jobs.get()
+            try:
+                if self.compress:
+                    with open(segment, "rb") as source, gzip.open(f"{segment}.gz", "wb") as target:
+                        shutil.copyfileobj(source, target)
+                    os.remove(segment)
+                self._prune()
+            except Exception as e:
+                print(f"Error archiving log segment {segment}: {str(e)}")
+            finally:
+                self._jobs.task_done()
+
+    def archives(self) -> list:
+        """
+        Rotated segments (compressed or not), oldest first.
+        """
+        directory, base = os.path.split(self.baseFilename)
+        prefix = f"{base}."
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                      if name.startswith(prefix))
+
+    def _prune(self) -> None:
+        if self.backup_count <= 0:
+            return
+        archives = self.archives()
+        for path in archives[:max(0, len(archives) - self.backup_count)]:
+            os.remove(path)
+
+    def wait_for_archives(self) -> None:
+        """
+        Blocks until every rotated segment has been compressed and pruned.
+        """
+        self._jobs.join()
+
+    def close(self) -> None:
+        self.wait_for_archives()
+        super().close()
 
 class Logger:
     _instance: Optional[logging.Logger] = None
     _initialized: bool = False
     _handlers: list = []
+    _options: dict = {"use_queue": False, "queue_size": 10000, "overflow_policy": "block",
+                      "level": os.environ.get(LOG_LEVEL_ENV, "DEBUG"),
+                      "max_bytes": 100 * 1024 * 1024, "rotate_when": "midnight",
+                      "backup_count": 30, "compress": True,
+                      "log_dir": os.environ.get(LOG_DIR_ENV, DEFAULT_LOG_DIR)}
+    _queue_handler: Optional[_BoundedQueueHandler] = None
+    _listener: Optional[QueueListener] = None
+    _atexit_registered: bool = False
+
+    @staticmethod
+    def configure(use_queue: Optional[bool] = None, queue_size: Optional[int] = None,
+                  overflow_policy: Optional[str] = None, level=None, max_bytes: Optional[int] = None,
+                  rotate_when: Union[str, float, None] = "", backup_count: Optional[int] = None,
+                  compress: Optional[bool] = None, log_dir: Optional[str] = None) -> logging.Logger:
+        """
+        Changes logger options and re-initializes the logger with them.
+
+        level: lowest level that is logged at all (default DEBUG, or the
+            MARKETPLACE_CALC_LOG_LEVEL environment variable). Records below it
+            are rejected by isEnabledFor before any message is formatted.
+        max_bytes, rotate_when, backup_count, compress: log file rotation, see
+            CompressingRotatingFileHandler. max_bytes=0 disables size rotation
+            and rotate_when=None disables time rotation.
+        log_dir: directory for app.log (default <project>/logs, or the
+            MARKETPLACE_CALC_LOG_DIR environment variable).
+        use_queue: hand records to a background QueueListener thread instead of
+            writing them on the caller's thread.
+        queue_size: maximum records waiting in the queue.
+        overflow_policy: "block" waits for space when the queue is full,
+            "drop" discards the record (see dropped_records()).
+        """
+        if overflow_policy is not None and overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {', '.join(OVERFLOW_POLICIES)}")
+        if queue_size is not None and queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        if level is not None:
+            level = resolve_level(level)
+        if isinstance(rotate_when, str) and rotate_when not in ("", "midnight", "hourly"):
+            raise ValueError("rotate_when must be 'midnight', 'hourly', a number of seconds or None")
+        for option, value in (("use_queue", use_queue), ("queue_size", queue_size),
+                              ("overflow_policy", overflow_policy), ("level", level),
+                              ("max_bytes", max_bytes), ("backup_count", backup_count),
+                              ("compress", compress), ("log_dir", log_dir)):
+            if value is not None:
+                Logger._options[option] = value
+        # None is meaningful for rotate_when, so "" marks it as not given
+        if rotate_when != "":
+            Logger._options["rotate_when"] = rotate_when
+        Logger.shutdown()
+        return Logger.setup()
+
+    @staticmethod
+    def dropped_records() -> int:
+        """
+        Number of records discarded by the "drop" overflow policy since setup.
+        """
+        return Logger._queue_handler.dropped if Logger._queue_handler else 0
     
+    @staticmethod
+    def _drain_queue() -> None:
+        if Logger._queue_handler:
+            Logger._instance.removeHandler(Logger._queue_handler)
+            Logger._queue_handler.queue.join()
+            Logger._listener.stop()
+            Logger._queue_handler = None
+            Logger._listener = None
+
     @staticmethod
     def setup() -> logging.Logger:
         """
-        Sets up the logger with file and console handlers.
+        Sets up the logger with file and console handlers, attached directly or
+        behind a queue depending on the configured options.
         Returns the logger instance.
         """
         # Create the logger instance if it doesn't exist
         if not Logger._instance:
             Logger._instance = logging.getLogger('marketplace_calculator')
-            Logger._instance.setLevel(logging.DEBUG)
+            Logger._instance.setLevel(resolve_level(Logger._options["level"]))
         
         # Only add handlers if we haven't initialized before
         if not Logger._initialized:
@@ -27,7 +249,7 @@ class Logger:
                 Logger._instance.handlers.clear()
                 
                 # Create logs directory if it doesn't exist
-                logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
+                logs_dir = Logger._options["log_dir"]
                 os.makedirs(logs_dir, exist_ok=True)
                 
                 # Create formatters
@@ -38,9 +260,18 @@ class Logger:
                     '%(levelname)s - %(message)s'
                 )
                 
-                # File handler
-                log_file = os.path.join(logs_dir, f'app_{datetime.now().strftime("%Y%m%d")}.log')
-                file_handler = logging.FileHandler(log_file)
+                # File handler, rotated by size and time into gzipped archives. The handler is
+                # single-process, so child processes write (and rotate) a file of their own
+                owner = os.environ.setdefault(_LOG_OWNER_ENV, str(os.getpid()))
+                log_name = 'app.log' if owner == str(os.getpid()) else f'app-{os.getpid()}.log'
+                log_file = os.path.join(logs_dir, log_name)
+                file_handler = CompressingRotatingFileHandler(
+                    log_file,
+                    max_bytes=Logger._options["max_bytes"],
+                    rotate_when=Logger._options["rotate_when"],
+                    backup_count=Logger._options["backup_count"],
+                    compress=Logger._options["compress"]
+                )
                 file_handler.setLevel(logging.DEBUG)
                 file_handler.setFormatter(file_formatter)
                 Logger._handlers.append(file_handler)
@@ -52,8 +283,19 @@ class Logger:
                 Logger._handlers.append(console_handler)
                 
                 # Add handlers
-                for handler in Logger._handlers:
-                    Logger._instance.addHandler(handler)
+                if Logger._options["use_queue"]:
+                    log_queue = queue.Queue(maxsize=Logger._options["queue_size"])
+                    Logger._queue_handler = _BoundedQueueHandler(log_queue, Logger._options["overflow_policy"])
+                    Logger._listener = QueueListener(log_queue, *Logger._handlers, respect_handler_level=True)
+                    Logger._listener.start()
+                    Logger._instance.addHandler(Logger._queue_handler)
+                    if not Logger._atexit_registered:
+                        # The listener thread is a daemon; drain it before the interpreter exits
+                        atexit.register(Logger._drain_queue)
+                        Logger._atexit_registered = True
+                else:
+                    for handler in Logger._handlers:
+                        Logger._instance.addHandler(handler)
                 
                 # Set the initialized flag
                 Logger._initialized = True
@@ -66,6 +308,18 @@ class Logger:
         
         return Logger._instance
     
+    @staticmethod
+    def _reset_after_fork() -> None:
+        # A forked child inherits the parent's handlers, which share its log file and
+        # archiver state; drop them without closing and set up the child's own file
+        if Logger._initialized:
+            Logger._instance.handlers.clear()
+            Logger._handlers = []
+            Logger._queue_handler = None
+            Logger._listener = None
+            Logger._initialized = False
+            Logger.setup()
+
     @staticmethod
     def get_logger() -> logging.Logger:
         """
@@ -84,6 +338,9 @@ class Logger:
         if Logger._instance:
             try:
                 Logger._instance.debug("Shutting down logger...")
+
+                # Stop accepting records, then let the listener write out the queue
+                Logger._drain_queue()
                 
                 # Close and remove all handlers
                 for handler in Logger._handlers:
@@ -108,10 +365,15 @@ class Logger:
         """
         Flushes all handlers, ensuring all pending messages are written.
         Useful when you need to ensure all logs are written before continuing.
+        In queue mode, waits until the listener has handled every queued record.
         """
         if Logger._instance:
+            if Logger._queue_handler:
+                Logger._queue_handler.queue.join()
             for handler in Logger._handlers:
                 try:
                     handler.flush()
                 except Exception as e:
-                    print(f"Error flushing handler: {str(e)}")
\ No newline at end of file
+                    print(f"Error flushing handler: {str(e)}")
+
+os.register_at_fork(after_in_child=Logger._reset_after_fork)
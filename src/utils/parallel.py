@@ -0,0 +1,122 @@
+# src/utils/parallel.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from src.models.listing import Listing
+from src.utils.calculator import ProfitCalculationResult
+from src.utils.calculator_pool import CalculatorPool
+from src.utils.config_registry import ConfigRegistry
+from src.utils.config_watcher import ConfigWatcher
+from src.utils.logger import Logger
+
+# Per-process state, populated once by _init_worker
+_marketplaces: Optional[ConfigRegistry] = None
+_shipping_carriers: Optional[ConfigRegistry] = None
+_calculators: Optional[CalculatorPool] = None
+_watcher: Optional[ConfigWatcher] = None
+
+def _init_worker(marketplace_dir: str, shipping_dir: str, reload_interval: Optional[float] = None) -> None:
+    global _marketplaces, _shipping_carriers, _calculators, _watcher
+    _marketplaces = ConfigRegistry.marketplaces(marketplace_dir)
+    _shipping_carriers = ConfigRegistry.shipping_carriers(shipping_dir)
+    _marketplaces.warm_up()
+    _shipping_carriers.warm_up()
+    _calculators = CalculatorPool(_marketplaces, _shipping_carriers)
+    if reload_interval:
+        _watcher = ConfigWatcher([_marketplaces, _shipping_carriers], interval=reload_interval).start()
+    Logger.get_logger().info(f"Pricing worker {os.getpid()} loaded {len(_marketplaces)} marketplaces "
+                             f"and {len(_shipping_carriers)} carriers")
+
+def _calculate_chunk(listings: List[Listing]) -> List[Union[ProfitCalculationResult, ValueError]]:
+    results: List[Union[ProfitCalculationResult, ValueError, None]] = [None] * len(listings)
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    for position, listing in enumerate(listings):
+        if listing.marketplace not in _marketplaces:
+            results[position] = ValueError(f"Unknown marketplace: {listing.marketplace}")
+        elif listing.carrier not in _shipping_carriers:
+            results[position] = ValueError(f"Unknown carrier: {listing.carrier}")
+        else:
+            groups.setdefault((listing.marketplace, listing.carrier), []).append(position)
+
+    for key, positions in groups.items():
+        # Fetched once per group, so a hot reload mid-chunk cannot mix config versions
+        calculator = _calculators.get(*key)
+        group_results = calculator.calculate_listings([listings[position] for position in positions])
+        for position, result in zip(positions, group_results):
+            results[position] = result
+    return results
+
+class ParallelProfitCalculator:
+    """
+    Spreads listings across a process pool. Each worker loads the configs
+    from disk once at startup, so tasks carry only listings and results.
+    Every listing must name its marketplace and carrier. Results come
+    back in input order. With reload_interval set, each worker watches the
+    config directories and picks up edited files without a restart.
+
+    Use as a context manager, or call shutdown() when done.
+    """
+    def __init__(
+        self,
+        marketplace_dir: str,
+        shipping_dir: str,
+        workers: Optional[int] = None,
+        chunk_size: int = 2000,
+        reload_interval: Optional[float] = None
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.logger = Logger.get_logger()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(marketplace_dir, shipping_dir, reload_interval)
+        )
+        self.logger.info(f"Started parallel calculator with {self.workers} workers, "
+                        f"chunk size {self.chunk_size}")
+
+    def __enter__(self) -> "ParallelProfitCalculator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    def imap(
+        self,
+        listings: Iterable[Listing],
+        return_exceptions: bool = False
+    ) -> Iterator[Union[ProfitCalculationResult, ValueError]]:
+        """
+        Yields one result per listing, in input order. At most two chunks per
+        worker are in flight, so arbitrarily long iterables stream through
+        in bounded memory. Invalid listings raise their ValueError unless
+        return_exceptions is set, in which case it is yielded in their place.
+        """
+        listings = iter(listings)
+        pending = deque()
+        while True:
+            while len(pending) < self.workers * 2:
+                chunk = list(islice(listings, self.chunk_size))
+                if not chunk:
+                    break
+                pending.append(self.executor.submit(_calculate_chunk, chunk))
+            if not pending:
+                return
+            for result in pending.popleft().result():
+                if isinstance(result, ValueError) and not return_exceptions:
+                    raise result
+                yield result
+
+    def calculate_profits(
+        self,
+        listings: Iterable[Listing],
+        return_exceptions: bool = False
+    ) -> List[Union[ProfitCalculationResult, ValueError]]:
+        return list(self.imap(listings, return_exceptions))
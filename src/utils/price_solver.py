@@ -0,0 +1,165 @@
+# src/utils/price_solver.py
+import math
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+from src.utils.calculator import ProfitCalculator
+from src.utils.logger import Logger
+
+# Rounded-up prices are re-checked against calculate_profit arithmetic and bumped
+# by one increment at a time; float error never needs more than a step or two
+MAX_ROUNDING_STEPS = 8
+
+class PriceSolver:
+    """
+    Inverts ProfitCalculator: finds the lowest sale price that reaches a
+    target profit margin (percent of gross revenue) or a target net profit.
+    Break-even is target_profit=0.
+
+    With total fees a*p*q + b*p + c*q + d (the tier's FeeKernel) and
+    shipping fixed by weight, net profit is linear in the price p, so the
+    price solves in closed form for percentage, flat and compound fees.
+    The answer is then rounded up to price_increment and confirmed with the
+    calculator's own arithmetic, stepping up one increment at a time (a
+    bounded search) until the target is met. None / NaN means the target is
+    unreachable at any price.
+    """
+    def __init__(self, calculator: ProfitCalculator, price_increment: Optional[float] = 0.01):
+        self.calculator = calculator
+        self.price_increment = price_increment
+        self.logger = Logger.get_logger()
+
+    @staticmethod
+    def _check_target(target_margin, target_profit) -> None:
+        if (target_margin is None) == (target_profit is None):
+            raise ValueError("Provide exactly one of target_margin or target_profit")
+
+    def solve_price(
+        self,
+        quantity: int,
+        cost_per_item: float,
+        weight_per_item: float,
+        tier_id: str,
+        shipping_service_id: str,
+        target_margin: Optional[float] = None,
+        target_profit: Optional[float] = None,
+        manual_shipping_price: Optional[float] = None,
+        zone: Optional[str] = None,
+        package_dimensions: Optional[Tuple[float, float, float]] = None
+    ) -> Optional[float]:
+        self._check_target(target_margin, target_profit)
+        # Shipping does not depend on price, so any valid price yields it (and validates the inputs)
+        shipping_cost = self.calculator.calculate_profit(
+            sale_price=1.0,
+            quantity=quantity,
+            cost_per_item=cost_per_item,
+            weight_per_item=weight_per_item,
+            tier_id=tier_id,
+            shipping_service_id=shipping_service_id,
+            manual_shipping_price=manual_shipping_price,
+            zone=zone,
+            package_dimensions=package_dimensions,
+            include_fee_breakdown=False
+        ).shipping_cost
+        prices = self._solve(
+            np.array([quantity], dtype=np.int64),
+            np.array([cost_per_item], dtype=np.float64),
+            np.array([shipping_cost], dtype=np.float64),
+            np.array([tier_id], dtype=object),
+            target_margin,
+            target_profit
+        )
+        price = float(prices[0])
+        self.logger.debug(f"Solved sale price for tier {tier_id}, service {shipping_service_id}: {price}")
+        return None if math.isnan(price) else price
+
+    def solve_price_batch(
+        self,
+        quantity: Sequence[int],
+        cost_per_item: Sequence[float],
+        weight_per_item: Sequence[float],
+        tier_id: Union[str, Sequence[str]],
+        shipping_service_id: Union[str, Sequence[str]],
+        target_margin: Union[float, Sequence[float], None] = None,
+        target_profit: Union[float, Sequence[float], None] = None,
+        manual_shipping_price: Optional[Sequence[float]] = None,
+        zone: Union[str, Sequence[Optional[str]], None] = None,
+        package_dimensions: Optional[Sequence[Tuple[float, float, float]]] = None
+    ) -> np.ndarray:
+        """
+        Vectorized solve_price; targets, cost_per_item and weight_per_item
+        may be scalars or one per row. Unreachable rows are NaN.
+        """
+        self._check_target(target_margin, target_profit)
+        quantity = np.asarray(quantity, dtype=np.int64)
+        row_count = len(quantity)
+        cost_per_item = np.broadcast_to(np.asarray(cost_per_item, dtype=np.float64), (row_count,))
+        weight_per_item = np.broadcast_to(np.asarray(weight_per_item, dtype=np.float64), (row_count,))
+        self.logger.info(f"Solving sale prices for {row_count} rows")
+        shipping_cost = self.calculator.calculate_profit_batch(
+            sale_price=np.ones(row_count),
+            quantity=quantity,
+            cost_per_item=cost_per_item,
+            weight_per_item=weight_per_item,
+            tier_id=tier_id,
+            shipping_service_id=shipping_service_id,
+            manual_shipping_price=manual_shipping_price,
+            zone=zone,
+            package_dimensions=package_dimensions,
+            include_fee_breakdown=False
+        ).shipping_cost
+        if isinstance(tier_id, str):
+            tier_id = np.full(row_count, tier_id, dtype=object)
+        return self._solve(
+            quantity,
+            cost_per_item,
+            shipping_cost,
+            np.asarray(tier_id, dtype=object),
+            target_margin,
+            target_profit
+        )
+
+    def _solve(self, quantity, cost_per_item, shipping_cost, tier_id, target_margin, target_profit):
+        row_count = len(quantity)
+        tiers = self.calculator.marketplace.tiers
+        tier_ids, tier_index = np.unique(tier_id, return_inverse=True)
+        kernels = [tiers[tier].fee_kernel for tier in tier_ids]
+        a = np.array([kernel.per_item_rate for kernel in kernels])[tier_index]
+        b = np.array([kernel.per_order_rate for kernel in kernels])[tier_index]
+        c = np.array([kernel.per_item_flat for kernel in kernels])[tier_index]
+        d = np.array([kernel.per_order_flat for kernel in kernels])[tier_index]
+
+        # net = p*q - (a*q + b)*p - (cost + c)*q - d - shipping, set equal to
+        # target_profit, or to (margin/100)*p*q for a target margin
+        fixed_costs = (cost_per_item + c) * quantity + d + shipping_cost
+        if target_margin is not None:
+            margin_percent = np.broadcast_to(np.asarray(target_margin, dtype=np.float64), (row_count,))
+            slope = quantity * (1 - a - margin_percent / 100) - b
+            numerator = fixed_costs
+        else:
+            profit = np.broadcast_to(np.asarray(target_profit, dtype=np.float64), (row_count,))
+            slope = quantity * (1 - a) - b
+            numerator = fixed_costs + profit
+
+        reachable = slope > 0
+        prices = np.full(row_count, np.nan)
+        prices[reachable] = numerator[reachable] / slope[reachable]
+        if not self.price_increment:
+            return prices
+
+        # Round up to the increment, then confirm with calculate_profit's arithmetic
+        increment = self.price_increment
+        prices[reachable] = np.maximum(np.ceil(prices[reachable] / increment - 1e-9), 1) * increment
+        prices[reachable] = np.round(prices[reachable], 10)
+        for _ in range(MAX_ROUNDING_STEPS):
+            gross_revenue = prices * quantity
+            total_fees = a * prices * quantity + b * prices + c * quantity + d
+            net_profit = gross_revenue - ((cost_per_item * quantity) + total_fees + shipping_cost)
+            if target_margin is not None:
+                short = (net_profit / gross_revenue) * 100 < margin_percent
+            else:
+                short = net_profit < profit
+            short &= reachable
+            if not short.any():
+                break
+            prices[short] = np.round(prices[short] + increment, 10)
+        return prices
@@ -0,0 +1,341 @@
+# src/utils/pricing_service.py
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from src.models.listing import Listing
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.calculator import ProfitCalculationResult
+from src.utils.calculator_pool import CalculatorPool
+from src.utils.logger import Logger
+from src.utils.profiling import profile_thread
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+JSON_HEADERS = b"Content-Type: application/json\r\n"
+
+class _HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+@dataclass
+class ServiceStats:
+    requests: int = 0
+    rows: int = 0
+    batches: int = 0
+
+def _parse_quantity(value: object) -> int:
+    # int() would quietly truncate 1.7 to 1
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"quantity must be a whole number, got {value!r}")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"quantity must be a whole number, got {value!r}")
+
+def parse_listing(data: object, marketplaces: Mapping[str, Marketplace],
+                  shipping_carriers: Mapping[str, ShippingCarrier]) -> Listing:
+    """
+    Builds a Listing from one JSON request object. marketplace and carrier
+    are required; package_dimensions is [length, width, height] in inches.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    marketplace = data.get("marketplace")
+    carrier = data.get("carrier")
+    if marketplace not in marketplaces:
+        raise ValueError(f"Unknown marketplace: {marketplace}")
+    if carrier not in shipping_carriers:
+        raise ValueError(f"Unknown carrier: {carrier}")
+    try:
+        weight = data.get("weight_per_item")
+        manual_price = data.get("manual_shipping_price")
+        zone = data.get("zone")
+        dimensions = data.get("package_dimensions")
+        if dimensions is not None and len(dimensions) != 3:
+            raise ValueError("package_dimensions must be [length, width, height]")
+        return Listing(
+            sale_price=float(data["sale_price"]),
+            quantity=_parse_quantity(data["quantity"]),
+            cost_per_item=float(data["cost_per_item"]),
+            weight_per_item=float(weight) if weight is not None else 0.0,
+            tier_id=str(data["tier_id"]),
+            shipping_service_id=str(data["shipping_service_id"]),
+            manual_shipping_price=float(manual_price) if manual_price is not None else None,
+            zone=str(zone) if zone is not None else None,
+            package_dimensions=tuple(float(value) for value in dimensions) if dimensions is not None else None,
+            marketplace=marketplace,
+            carrier=carrier
+        )
+    except KeyError as e:
+        raise ValueError(f"Missing required field: {e.args[0]}")
+    except TypeError as e:
+        raise ValueError(f"Invalid field value: {str(e)}")
+
+class PricingService:
+    """
+    HTTP/JSON front end for ProfitCalculator on asyncio streams.
+
+        GET  /health               status and request/batch counters
+        GET  /marketplaces         marketplaces with their seller tiers
+        GET  /carriers             carriers with their shipping services
+        POST /calculate            one listing -> one result
+        POST /calculate/batch      {"listings": [...]} -> {"results": [...]}
+
+    Listings name their marketplace and carrier. Single calculations that
+    arrive within batch_window seconds of each other (up to max_batch_size)
+    are priced together with one calculate_listings call per
+    (marketplace, carrier) pair, on a worker thread so the event loop keeps
+    accepting connections. Connections are HTTP/1.1 keep-alive.
+    """
+    def __init__(self, marketplaces: Mapping[str, Marketplace], shipping_carriers: Mapping[str, ShippingCarrier],
+                 batch_window: float = 0.002, max_batch_size: int = 512):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.marketplaces = marketplaces
+        self.shipping_carriers = shipping_carriers
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.calculators = CalculatorPool(marketplaces, shipping_carriers)
+        self.stats = ServiceStats()
+        self.logger = Logger.get_logger()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pricing")
+        self._pending: List[Tuple[Listing, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks = set()
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            "/health": ("GET", self._health),
+            "/marketplaces": ("GET", self._list_marketplaces),
+            "/carriers": ("GET", self._list_carriers),
+            "/calculate": ("POST", self._calculate_one),
+            "/calculate/batch": ("POST", self._calculate_batch),
+        }
+
+    # Server lifecycle
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        address = self._server.sockets[0].getsockname()
+        self.logger.info(f"Pricing service listening on http://{address[0]}:{address[1]}")
+        return self._server
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise outlive the server
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+        self.logger.info("Pricing service stopped")
+
+    # Routing
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[HTTPStatus, object]:
+        """
+        Dispatches one request and returns (status, JSON-serializable body).
+        """
+        self.stats.requests += 1
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        try:
+            if path not in self._routes:
+                raise _HTTPError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+            route_method, handler = self._routes[path]
+            if method != route_method:
+                raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{path} only accepts {route_method}")
+            if route_method == "GET":
+                return HTTPStatus.OK, handler()
+            try:
+                data = json.loads(body or b"null")
+            except ValueError as e:
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {str(e)}")
+            return HTTPStatus.OK, await handler(data)
+        except _HTTPError as e:
+            return e.status, {"error": str(e)}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            self.logger.error(f"Error handling {method} {path}: {str(e)}", exc_info=True)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+    def _health(self) -> dict:
+        return {
+            "status": "ok",
+            "marketplaces": len(self.marketplaces),
+            "carriers": len(self.shipping_carriers),
+            **asdict(self.stats)
+        }
+
+    def _list_marketplaces(self) -> dict:
+        return {"marketplaces": {
+            name: {"tiers": {tier_id: tier.name for tier_id, tier in marketplace.tiers.items()}}
+            for name, marketplace in self.marketplaces.items()
+        }}
+
+    def _list_carriers(self) -> dict:
+        return {"carriers": {
+            name: {"services": {service_id: {"name": service.name, "manual_entry": service.manual_entry}
+                                for service_id, service in carrier.services.items()}}
+            for name, carrier in self.shipping_carriers.items()
+        }}
+
+    async def _calculate_one(self, data: object) -> dict:
+        listing = parse_listing(data, self.marketplaces, self.shipping_carriers)
+        return asdict(await self.calculate(listing))
+
+    async def _calculate_batch(self, data: object) -> dict:
+        if not isinstance(data, dict) or not isinstance(data.get("listings"), list):
+            raise ValueError('Expected {"listings": [...]}')
+        outcomes: List[Union[Listing, ValueError]] = []
+        for row in data["listings"]:
+            try:
+                outcomes.append(parse_listing(row, self.marketplaces, self.shipping_carriers))
+            except ValueError as e:
+                outcomes.append(e)
+        listings = [outcome for outcome in outcomes if isinstance(outcome, Listing)]
+        results = iter(await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._calculate_listings, listings))
+        outcomes = [next(results) if isinstance(outcome, Listing) else outcome for outcome in outcomes]
+        return {"results": [{"error": str(outcome)} if isinstance(outcome, Exception) else asdict(outcome)
+                            for outcome in outcomes]}
+
+    # Micro-batching
+
+    async def calculate(self, listing: Listing) -> ProfitCalculationResult:
+        """
+        Queues one listing for the next micro-batch and waits for its result.
+        Raises the listing's ValueError if it fails validation.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((listing, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        result = await future
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Held until done so the task cannot be garbage collected mid-batch
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Listing, asyncio.Future]]) -> None:
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._calculate_listings, [listing for listing, _ in batch])
+        except Exception as e:
+            self.logger.error(f"Pricing batch of {len(batch)} failed: {str(e)}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _calculate_listings(self, listings: List[Listing]) -> List[Union[ProfitCalculationResult, ValueError]]:
+        # Runs on the worker thread; one vectorized call per (marketplace, carrier) pair
+        self.stats.batches += 1
+        self.stats.rows += len(listings)
+        outcomes: List[Union[ProfitCalculationResult, ValueError]] = [None] * len(listings)
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for position, listing in enumerate(listings):
+            groups.setdefault((listing.marketplace, listing.carrier), []).append(position)
+        with profile_thread():
+            for (marketplace, carrier), positions in groups.items():
+                calculator = self.calculators.get(marketplace, carrier)
+                results = calculator.calculate_listings([listings[position] for position in positions])
+                for position, result in zip(positions, results):
+                    outcomes[position] = result
+        return outcomes
+
+    # HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                        {"error": "Request headers too large"}, keep_alive=False)
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ")
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"},
+                                        keep_alive=False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    if line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive")
+                if "transfer-encoding" in headers:
+                    await self._respond(writer, HTTPStatus.NOT_IMPLEMENTED,
+                                        {"error": "Chunked request bodies are not supported"}, keep_alive=False)
+                    break
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"},
+                                        keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {"error": "Request body too large"}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                status, payload = await self.handle(method, path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload: object,
+                       keep_alive: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(b"HTTP/1.1 %d %s\r\n%sContent-Length: %d\r\nConnection: %s\r\n\r\n%s" % (
+            status.value, status.phrase.encode("ascii"), JSON_HEADERS, len(body),
+            b"keep-alive" if keep_alive else b"close", body))
+        await writer.drain()
@@ -0,0 +1,223 @@
+# src/utils/profiling.py
+import cProfile
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.utils.logger import Logger
+
+# Durations fall into power-of-two nanosecond buckets; bucket b holds [2**(b-1), 2**b) ns
+HISTOGRAM_BUCKETS = 48
+
+class StageStats:
+    """
+    Running count, total, maximum and log2 histogram of one stage's durations.
+    """
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, duration_ns: int) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.buckets[min(duration_ns.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def cumulative(self) -> List[Tuple[int, int]]:
+        """
+        (upper bound in ns, durations at or below it) for every non-empty bucket.
+        """
+        histogram = []
+        running = 0
+        for bucket, count in enumerate(self.buckets):
+            if count:
+                running += count
+                histogram.append((2 ** bucket, running))
+        return histogram
+
+    def percentile_ns(self, fraction: float) -> int:
+        # Upper bound of the bucket holding the percentile, capped at the true maximum
+        target = fraction * self.count
+        for upper_bound, running in self.cumulative():
+            if running >= target:
+                return min(upper_bound, self.max_ns)
+        return self.max_ns
+
+@dataclass(frozen=True)
+class StageSummary:
+    stage: str
+    count: int
+    total_ms: float
+    mean_us: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    max_us: float
+
+class StageClock:
+    """
+    Times consecutive stages of one call: each lap() records the time since
+    the previous lap (or since the clock was created) under a stage name.
+    """
+    __slots__ = ("_last",)
+
+    def __init__(self):
+        self._last = time.perf_counter_ns()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter_ns()
+        Instrumentation.record(stage, now - self._last)
+        self._last = now
+
+class Instrumentation:
+    """
+    Process-wide per-stage timers, off by default. Hot paths read
+    Instrumentation.enabled once per call and only create a StageClock
+    when it is set, so disabled instrumentation costs one attribute check:
+
+        clock = StageClock() if Instrumentation.enabled else None
+        ...
+        if clock:
+            clock.lap("calculator.fees")
+    """
+    enabled = False
+    _stats: Dict[str, StageStats] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def enable(enabled: bool = True) -> None:
+        Instrumentation.enabled = enabled
+
+    @staticmethod
+    def record(stage: str, duration_ns: int) -> None:
+        with Instrumentation._lock:
+            stats = Instrumentation._stats.get(stage)
+            if stats is None:
+                stats = Instrumentation._stats[stage] = StageStats()
+            stats.add(duration_ns)
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str) -> Iterator[None]:
+        """
+        Times a block as one stage; for paths where a StageClock would be overkill.
+        """
+        if not Instrumentation.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            Instrumentation.record(name, time.perf_counter_ns() - start)
+
+    @staticmethod
+    def reset() -> None:
+        with Instrumentation._lock:
+            Instrumentation._stats.clear()
+
+    @staticmethod
+    def histogram(stage: str) -> List[Tuple[int, int]]:
+        with Instrumentation._lock:
+            stats = Instrumentation._stats.get(stage)
+            return stats.cumulative() if stats is not None else []
+
+    @staticmethod
+    def snapshot() -> Dict[str, StageSummary]:
+        with Instrumentation._lock:
+            return {
+                stage: StageSummary(
+                    stage=stage,
+                    count=stats.count,
+                    total_ms=stats.total_ns / 1e6,
+                    mean_us=stats.total_ns / stats.count / 1e3,
+                    p50_us=stats.percentile_ns(0.50) / 1e3,
+                    p90_us=stats.percentile_ns(0.90) / 1e3,
+                    p99_us=stats.percentile_ns(0.99) / 1e3,
+                    max_us=stats.max_ns / 1e3
+                )
+                for stage, stats in sorted(Instrumentation._stats.items())
+            }
+
+    @staticmethod
+    def report() -> str:
+        """
+        Table of every stage recorded so far. Percentiles are bucket upper
+        bounds, so they overstate by at most 2x.
+        """
+        lines = [f"{'stage':<32} {'count':>9} {'total ms':>10} {'mean us':>9} {'p50 us':>9} "
+                 f"{'p90 us':>9} {'p99 us':>9} {'max us':>10}"]
+        for summary in Instrumentation.snapshot().values():
+            lines.append(f"{summary.stage:<32} {summary.count:>9} {summary.total_ms:>10.2f} "
+                         f"{summary.mean_us:>9.2f} {summary.p50_us:>9.2f} {summary.p90_us:>9.2f} "
+                         f"{summary.p99_us:>9.2f} {summary.max_us:>10.2f}")
+        return "\n".join(lines)
+
+class _ProfileRun:
+    """
+    The profile_run in progress, if any. cProfile only sees the thread that
+    enabled it, so worker threads profile their tasks with profile_thread
+    and hand the profilers back here to be merged into the stats file.
+    """
+    active: Optional["_ProfileRun"] = None
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.worker_profilers: List[cProfile.Profile] = []
+        self.lock = threading.Lock()
+
+@contextmanager
+def profile_run(path: str) -> Iterator[cProfile.Profile]:
+    """
+    Runs the block under cProfile and writes the stats to path (read them
+    with pstats or snakeviz). Work that pool threads run inside
+    profile_thread is merged into the same file.
+    """
+    run = _ProfileRun.active = _ProfileRun()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        _ProfileRun.active = None
+        stats = pstats.Stats(profiler)
+        with run.lock:
+            for worker_profiler in run.worker_profilers:
+                stats.add(worker_profiler)
+        stats.dump_stats(path)
+        Logger.get_logger().info(f"Wrote cProfile stats to {path} "
+                                 f"({len(run.worker_profilers)} worker tasks merged)")
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """
+    Profiles the block on the current thread into the active profile_run;
+    a no-op when none is running. QThreadPool and executor tasks wrap their
+    work in this, since the run's own profiler never sees those threads.
+    """
+    run = _ProfileRun.active
+    if run is None or threading.get_ident() == run.thread_id:
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Interpreters where cProfile allows only one active profiler already
+        # trace every thread with the run's own profiler
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with run.lock:
+            run.worker_profilers.append(profiler)
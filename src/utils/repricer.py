@@ -0,0 +1,245 @@
+# src/utils/repricer.py
+import csv
+import json
+import os
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.models.listing import Listing
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.calculator import ProfitCalculator, ProfitCalculationResult
+from src.utils.calculator_pool import CalculatorPool
+from src.utils.logger import Logger
+
+RESULT_FIELDS = [
+    "gross_revenue",
+    "total_marketplace_fees",
+    "shipping_cost",
+    "total_cost",
+    "net_profit",
+    "profit_margin",
+    "fee_breakdown",
+]
+
+# Columns _parse_row reads; the CSV header for JSONL inputs, whose rows carry their own keys
+INPUT_FIELDS = [
+    "marketplace",
+    "carrier",
+    "sale_price",
+    "quantity",
+    "cost_per_item",
+    "weight_per_item",
+    "tier_id",
+    "shipping_service_id",
+    "manual_shipping_price",
+    "zone",
+    "length",
+    "width",
+    "height",
+]
+
+REJECT_FIELDS = ["line", "raw", "error"]
+EXTRA_FIELD = "extra"
+
+@dataclass
+class RepriceSummary:
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_rejected: int = 0
+
+class _UnparseableRow(dict):
+    """
+    Placeholder yielded for JSONL lines that are not a JSON object.
+    """
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unsupported inventory file format: {path} (expected .csv or .jsonl)")
+
+class _RowWriter:
+    """
+    Appends rows to a CSV or JSONL file. CSV files get a fixed header of
+    fieldnames; values under any other key are kept as a JSON object in the
+    extra column when fieldnames has one.
+    """
+    def __init__(self, path: str, fieldnames: List[str]):
+        self.format = _file_format(path)
+        self.file = open(path, "w", newline="")
+        self.fieldnames = list(dict.fromkeys(fieldnames))
+        self.csv_writer = None
+        if self.format == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+            self.csv_writer.writeheader()
+
+    def write(self, row: dict) -> None:
+        if self.format == "jsonl":
+            self.file.write(json.dumps(row) + "\n")
+            return
+        values = {key: json.dumps(value) if isinstance(value, dict) else value
+                  for key, value in row.items() if key in self.fieldnames}
+        extra = {key: value for key, value in row.items()
+                 if key not in self.fieldnames and isinstance(key, str)}
+        if extra and EXTRA_FIELD in self.fieldnames:
+            values[EXTRA_FIELD] = json.dumps(extra)
+        self.csv_writer.writerow(values)
+
+    def close(self) -> None:
+        self.file.close()
+
+class InventoryRepricer:
+    """
+    Streams an inventory file through ProfitCalculator in fixed-size chunks,
+    writing results as it goes so memory use does not grow with file size.
+
+    Each row needs sale_price, quantity, cost_per_item, tier_id and
+    shipping_service_id, plus weight_per_item or manual_shipping_price
+    depending on the service. Optional marketplace and carrier columns
+    override the defaults given to the constructor; zone and length/width/
+    height (inches) feed zoned and DIM-weight services. Rows that fail to parse
+    or validate are written to the rejects file with an error column.
+    """
+    def __init__(
+        self,
+        marketplaces: Dict[str, Marketplace],
+        shipping_carriers: Dict[str, ShippingCarrier],
+        default_marketplace: Optional[str] = None,
+        default_carrier: Optional[str] = None,
+        chunk_size: int = 1000
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.marketplaces = marketplaces
+        self.shipping_carriers = shipping_carriers
+        self.default_marketplace = default_marketplace
+        self.default_carrier = default_carrier
+        self.chunk_size = chunk_size
+        self.calculators = CalculatorPool(marketplaces, shipping_carriers)
+        self.logger = Logger.get_logger()
+
+    def reprice(self, input_path: str, output_path: str, rejects_path: str) -> RepriceSummary:
+        self.logger.info(f"Repricing inventory {input_path} -> {output_path} "
+                        f"(rejects: {rejects_path}, chunk size: {self.chunk_size})")
+        summary = RepriceSummary()
+        input_fields = self._input_fields(input_path)
+        output = _RowWriter(output_path, input_fields + RESULT_FIELDS)
+        rejects = _RowWriter(rejects_path, input_fields + REJECT_FIELDS)
+        try:
+            rows = self._read_rows(input_path)
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                summary.rows_read += len(chunk)
+                self._process_chunk(chunk, output, rejects, summary)
+        finally:
+            output.close()
+            rejects.close()
+
+        self.logger.info(f"Repricing finished: read={summary.rows_read}, "
+                        f"written={summary.rows_written}, rejected={summary.rows_rejected}")
+        return summary
+
+    @staticmethod
+    def _input_fields(input_path: str) -> List[str]:
+        """
+        Leading CSV output columns: a CSV input's own header, or for JSONL
+        the listing columns plus an extra column for any other keys.
+        """
+        if _file_format(input_path) == "jsonl":
+            return INPUT_FIELDS + [EXTRA_FIELD]
+        with open(input_path, "r", newline="") as f:
+            return next(csv.reader(f), [])
+
+    def _read_rows(self, input_path: str) -> Iterator[dict]:
+        file_format = _file_format(input_path)
+        with open(input_path, "r", newline="") as f:
+            if file_format == "csv":
+                yield from csv.DictReader(f)
+            else:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                        if not isinstance(row, dict):
+                            raise ValueError("expected a JSON object")
+                    except ValueError as e:
+                        row = _UnparseableRow(line=line_number, raw=line.rstrip("\n"),
+                                              error=f"Invalid JSON: {str(e)}")
+                    yield row
+
+    def _process_chunk(self, chunk: List[dict], output: _RowWriter, rejects: _RowWriter,
+                       summary: RepriceSummary) -> None:
+        # Outcome per chunk position (a result or the error that rejected the row),
+        # so output keeps input order even when rows span several calculators
+        outcomes: List[object] = [None] * len(chunk)
+        groups: Dict[Tuple[str, str], List[Tuple[int, Listing]]] = {}
+        for position, row in enumerate(chunk):
+            try:
+                if isinstance(row, _UnparseableRow):
+                    raise ValueError(row["error"])
+                listing = self._parse_row(row)
+            except (KeyError, TypeError, ValueError) as e:
+                outcomes[position] = e
+                continue
+            groups.setdefault((listing.marketplace, listing.carrier), []).append((position, listing))
+
+        for key, members in groups.items():
+            results = self._get_calculator(key).calculate_listings([listing for _, listing in members])
+            for (position, _), result in zip(members, results):
+                outcomes[position] = result
+
+        for row, outcome in zip(chunk, outcomes):
+            if isinstance(outcome, Exception):
+                self._reject(row, outcome, rejects, summary)
+            else:
+                output.write(self._result_row(row, outcome))
+                summary.rows_written += 1
+
+    def _parse_row(self, row: dict) -> Listing:
+        marketplace = row.get("marketplace") or self.default_marketplace
+        carrier = row.get("carrier") or self.default_carrier
+        if marketplace not in self.marketplaces:
+            raise ValueError(f"Unknown marketplace: {marketplace}")
+        if carrier not in self.shipping_carriers:
+            raise ValueError(f"Unknown carrier: {carrier}")
+
+        weight = row.get("weight_per_item")
+        manual_price = row.get("manual_shipping_price")
+        zone = row.get("zone")
+        dimensions = [row.get(name) for name in ("length", "width", "height")]
+        return Listing(
+            sale_price=float(row["sale_price"]),
+            quantity=int(row["quantity"]),
+            cost_per_item=float(row["cost_per_item"]),
+            weight_per_item=float(weight) if weight not in (None, "") else 0.0,
+            tier_id=str(row["tier_id"]),
+            shipping_service_id=str(row["shipping_service_id"]),
+            manual_shipping_price=float(manual_price) if manual_price not in (None, "") else None,
+            zone=str(zone) if zone not in (None, "") else None,
+            package_dimensions=(tuple(float(value) for value in dimensions)
+                                if all(value not in (None, "") for value in dimensions) else None),
+            marketplace=marketplace,
+            carrier=carrier
+        )
+
+    def _get_calculator(self, key: Tuple[str, str]) -> ProfitCalculator:
+        return self.calculators.get(*key)
+
+    @staticmethod
+    def _result_row(source: dict, result: ProfitCalculationResult) -> dict:
+        row = dict(source)
+        for field in RESULT_FIELDS:
+            row[field] = getattr(result, field)
+        return row
+
+    def _reject(self, row: dict, error: Exception, rejects: _RowWriter,
+                summary: RepriceSummary) -> None:
+        self.logger.warning(f"Rejected inventory row: {str(error)}")
+        rejects.write({**row, "error": str(error)})
+        summary.rows_rejected += 1
@@ -0,0 +1,105 @@
+# src/utils/result_cache.py
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+from src.models.marketplace import Marketplace
+from src.models.shipping import ShippingCarrier
+from src.utils.logger import Logger
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ResultCache:
+    """
+    Bounded LRU cache of ProfitCalculator.calculate_profit results, shared
+    by any number of calculators (pass it as ProfitCalculator(...,
+    result_cache=cache)).
+
+    Keys are the normalized inputs plus the identity of the calculator's
+    Marketplace and ShippingCarrier objects. A config reload produces new
+    objects, so results computed from an old config can never be returned
+    for a new one; the cache keeps the config objects of its current entries
+    alive so their ids cannot be reused, and releases a pair once its last
+    entry is evicted. watch() additionally clears the cache whenever a
+    ConfigRegistry reloads a file, releasing the old entries at once.
+
+    Cached results are shared between callers; treat them as read-only.
+    """
+    def __init__(self, max_entries: int = 4096):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.logger = Logger.get_logger()
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._configs: Dict[Tuple[int, int], Tuple[Marketplace, ShippingCarrier]] = {}
+        # Entries per pinned (marketplace, carrier) id pair
+        self._config_entries: Dict[Tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, marketplace: Marketplace, shipping_carrier: ShippingCarrier,
+            inputs: Hashable) -> Optional[object]:
+        key = (id(marketplace), id(shipping_carrier), inputs)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, marketplace: Marketplace, shipping_carrier: ShippingCarrier, inputs: Hashable,
+            result: object) -> None:
+        key = (id(marketplace), id(shipping_carrier), inputs)
+        with self._lock:
+            # Pinned under the same lock as the entry, so an entry's ids always refer to live objects
+            if key not in self._entries:
+                self._configs[key[:2]] = (marketplace, shipping_carrier)
+                self._config_entries[key[:2]] = self._config_entries.get(key[:2], 0) + 1
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                self._release(evicted[:2])
+
+    def _release(self, config_key: Tuple[int, int]) -> None:
+        # Called with the lock held; unpins the configs once no entry refers to them
+        remaining = self._config_entries[config_key] - 1
+        if remaining:
+            self._config_entries[config_key] = remaining
+        else:
+            del self._config_entries[config_key]
+            del self._configs[config_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._configs.clear()
+            self._config_entries.clear()
+        self.logger.debug("Cleared profit result cache")
+
+    def watch(self, registry) -> None:
+        """
+        Clears the cache whenever the ConfigRegistry reloads a config.
+        """
+        registry.add_reload_listener(lambda name: self.clear())
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                              size=len(self._entries), max_entries=self.max_entries)
@@ -0,0 +1,157 @@
+# src/utils/result_set.py
+from array import array
+from typing import Dict, Iterable, Iterator, Sequence
+import numpy as np
+from src.utils.calculator import BatchProfitCalculationResult, ProfitCalculationResult
+
+RESULT_FIELDS = ("gross_revenue", "total_marketplace_fees", "shipping_cost",
+                 "total_cost", "net_profit", "profit_margin")
+
+class ProfitResultSet:
+    """
+    Compact columnar store for many results: one float64 array per result
+    field, and every fee breakdown in a single (rows, fees) float64 array
+    whose columns are named by fee_names (NaN where the row's tier does not
+    charge that fee). A million results take about 50 MB plus 8 bytes per
+    fee column, against gigabytes as ProfitCalculationResult objects.
+
+    Indexing returns a ProfitResultView, which reads like a
+    ProfitCalculationResult (ResultsWidget.update_results accepts one).
+    """
+    __slots__ = ("columns", "fee_names", "fee_index", "fees")
+
+    def __init__(self, columns: Dict[str, np.ndarray], fee_names: Sequence[str], fees: np.ndarray):
+        self.columns = {name: np.asarray(columns[name], dtype=np.float64) for name in RESULT_FIELDS}
+        self.fee_names = tuple(fee_names)
+        self.fee_index = {fee_name: column for column, fee_name in enumerate(self.fee_names)}
+        self.fees = np.asarray(fees, dtype=np.float64).reshape(len(self.columns["gross_revenue"]),
+                                                               len(self.fee_names))
+
+    @classmethod
+    def from_batch(cls, batch: BatchProfitCalculationResult) -> "ProfitResultSet":
+        fee_names = list(batch.fee_breakdown)
+        fees = (np.column_stack([batch.fee_breakdown[fee_name] for fee_name in fee_names])
+                if fee_names else np.empty((len(batch), 0)))
+        return cls({name: getattr(batch, name) for name in RESULT_FIELDS}, fee_names, fees)
+
+    @classmethod
+    def from_results(cls, results: Iterable[ProfitCalculationResult]) -> "ProfitResultSet":
+        builder = ProfitResultSetBuilder()
+        for result in results:
+            builder.append(result)
+        return builder.build()
+
+    @classmethod
+    def concatenate(cls, result_sets: Sequence["ProfitResultSet"]) -> "ProfitResultSet":
+        """
+        Joins sets end to end (e.g. one per repricing chunk), merging fee columns by name.
+        """
+        fee_names = list(dict.fromkeys(fee_name for result_set in result_sets for fee_name in result_set.fee_names))
+        rows = sum(len(result_set) for result_set in result_sets)
+        fees = np.full((rows, len(fee_names)), np.nan)
+        start = 0
+        for result_set in result_sets:
+            targets = [fee_names.index(fee_name) for fee_name in result_set.fee_names]
+            fees[start:start + len(result_set), targets] = result_set.fees
+            start += len(result_set)
+        columns = {name: np.concatenate([result_set.columns[name] for result_set in result_sets])
+                   if result_sets else np.empty(0) for name in RESULT_FIELDS}
+        return cls(columns, fee_names, fees)
+
+    def __len__(self) -> int:
+        return len(self.columns["gross_revenue"])
+
+    def __getitem__(self, index: int) -> "ProfitResultView":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("result index out of range")
+        return ProfitResultView(self, index)
+
+    def __iter__(self) -> Iterator["ProfitResultView"]:
+        for index in range(len(self)):
+            yield ProfitResultView(self, index)
+
+    def fee_column(self, fee_name: str) -> np.ndarray:
+        return self.fees[:, self.fee_index[fee_name]]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values()) + self.fees.nbytes
+
+def _column_property(name: str) -> property:
+    def get(self) -> float:
+        return float(self._results.columns[name][self._index])
+    return property(get)
+
+class ProfitResultView:
+    """
+    One row of a ProfitResultSet with the attributes of a
+    ProfitCalculationResult. Values are read from the set on access, so a
+    view costs two references however many fees the row has.
+    """
+    __slots__ = ("_results", "_index")
+
+    gross_revenue = _column_property("gross_revenue")
+    total_marketplace_fees = _column_property("total_marketplace_fees")
+    shipping_cost = _column_property("shipping_cost")
+    total_cost = _column_property("total_cost")
+    net_profit = _column_property("net_profit")
+    profit_margin = _column_property("profit_margin")
+
+    def __init__(self, results: ProfitResultSet, index: int):
+        self._results = results
+        self._index = index
+
+    @property
+    def fee_breakdown(self) -> Dict[str, float]:
+        amounts = self._results.fees[self._index]
+        return {fee_name: float(amount) for fee_name, amount in zip(self._results.fee_names, amounts)
+                if not np.isnan(amount)}
+
+    def to_result(self) -> ProfitCalculationResult:
+        return ProfitCalculationResult(**{name: getattr(self, name) for name in RESULT_FIELDS},
+                                       fee_breakdown=self.fee_breakdown)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ProfitResultView, ProfitCalculationResult)):
+            return all(getattr(self, name) == getattr(other, name) for name in RESULT_FIELDS) \
+                and self.fee_breakdown == other.fee_breakdown
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ProfitResultView(row={self._index}, {self.to_result()!r})"
+
+class ProfitResultSetBuilder:
+    """
+    Accumulates single results into typed arrays (8 bytes per value) and
+    builds a ProfitResultSet; fee columns are added as new fee names appear.
+    """
+    def __init__(self):
+        self._columns = {name: array("d") for name in RESULT_FIELDS}
+        self._fees: Dict[str, array] = {}
+        self._rows = 0
+
+    def append(self, result: ProfitCalculationResult) -> None:
+        for name, column in self._columns.items():
+            column.append(getattr(result, name))
+        fee_breakdown = result.fee_breakdown
+        for fee_name in fee_breakdown:
+            if fee_name not in self._fees:
+                self._fees[fee_name] = array("d", [np.nan]) * self._rows
+        for fee_name, column in self._fees.items():
+            column.append(fee_breakdown.get(fee_name, np.nan))
+        self._rows += 1
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def build(self) -> ProfitResultSet:
+        fee_names = list(self._fees)
+        if fee_names:
+            fees = np.column_stack([np.frombuffer(self._fees[fee_name], dtype=np.float64)
+                                    for fee_name in fee_names])
+        else:
+            fees = np.empty((self._rows, 0))
+        return ProfitResultSet({name: np.frombuffer(column, dtype=np.float64).copy()
+                                for name, column in self._columns.items()}, fee_names, fees)
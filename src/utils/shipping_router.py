@@ -0,0 +1,215 @@
+# src/utils/shipping_router.py
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.models.shipping import ShippingCarrier, ShippingService
+from src.utils.logger import Logger
+
+@dataclass(frozen=True)
+class ShippingQuote:
+    carrier: str
+    service_id: str
+    price: float
+
+@dataclass
+class BatchShippingQuotes:
+    """
+    Cheapest service per input row. price is NaN and carrier/service_id are
+    None where no service can ship the parcel.
+    """
+    price: np.ndarray
+    carrier: np.ndarray
+    service_id: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def quote(self, index: int) -> Optional[ShippingQuote]:
+        if self.carrier[index] is None:
+            return None
+        return ShippingQuote(self.carrier[index], self.service_id[index], float(self.price[index]))
+
+# (price, carrier, service_id, min weight, max weight)
+_Candidate = Tuple[float, str, str, float, float]
+
+class _RouteIndex:
+    """
+    Merged price index over every service that shares one zone and one
+    billable-weight rule. The weight axis is cut at every service's rate
+    breakpoints and weight limits; each breakpoint and each open interval
+    between breakpoints is a region whose candidates are precomputed in
+    price order, so a query is a single bisect over all services at once.
+    """
+    def __init__(self, services: List[Tuple[str, str, ShippingService]], zone: Optional[str],
+                 filter_limits: bool):
+        points = set()
+        for _, _, service in services:
+            points.update(service.rate_breakpoints())
+            if filter_limits:
+                points.update((service.weight_limits["min"], service.weight_limits["max"]))
+        self.points = sorted(points)
+        self.point_array = np.array(self.points, dtype=np.float64)
+
+        # Region 2i is the open interval below points[i], region 2i+1 is points[i]
+        self.regions: List[Tuple[_Candidate, ...]] = []
+        for index in range(len(self.points) + 1):
+            self.regions.append(self._candidates(services, zone, self._interval_weight(index),
+                                                 filter_limits))
+            if index < len(self.points):
+                self.regions.append(self._candidates(services, zone, self.points[index],
+                                                     filter_limits))
+
+        # Cheapest candidate per region, for vectorized lookups
+        self.best_price = np.array([region[0][0] if region else np.nan for region in self.regions])
+        self.best_carrier = np.array([region[0][1] if region else None for region in self.regions],
+                                     dtype=object)
+        self.best_service_id = np.array([region[0][2] if region else None for region in self.regions],
+                                        dtype=object)
+        self.best_min = np.array([region[0][3] if region else np.nan for region in self.regions])
+        self.best_max = np.array([region[0][4] if region else np.nan for region in self.regions])
+
+    def _interval_weight(self, index: int) -> float:
+        if not self.points:
+            return 0.0
+        if index == 0:
+            return self.points[0] - 1
+        if index == len(self.points):
+            return self.points[-1] + 1
+        return (self.points[index - 1] + self.points[index]) / 2
+
+    @staticmethod
+    def _candidates(services, zone, weight, filter_limits) -> Tuple[_Candidate, ...]:
+        candidates = []
+        for carrier_name, service_id, service in services:
+            minimum, maximum = service.weight_limits["min"], service.weight_limits["max"]
+            if filter_limits and not minimum <= weight <= maximum:
+                continue
+            price = service.price_for_billable_weight(weight, zone)
+            if price is not None:
+                candidates.append((price, carrier_name, service_id, minimum, maximum))
+        return tuple(sorted(candidates))
+
+    def region(self, weight: float) -> int:
+        index = bisect_left(self.points, weight)
+        return 2 * index + (index < len(self.points) and self.points[index] == weight)
+
+    def regions_for(self, weights: np.ndarray) -> np.ndarray:
+        index = np.searchsorted(self.point_array, weights, side="left")
+        on_point = np.zeros(len(weights), dtype=bool)
+        inside = index < len(self.points)
+        on_point[inside] = self.point_array[index[inside]] == weights[inside]
+        return 2 * index + on_point
+
+    def cheapest(self, billable_weight: float, actual_weight: float) -> Optional[_Candidate]:
+        for candidate in self.regions[self.region(billable_weight)]:
+            if candidate[3] <= actual_weight <= candidate[4]:
+                return candidate
+        return None
+
+class ShippingRouter:
+    """
+    Finds the cheapest service across every loaded carrier for a parcel.
+
+    Services are merged into one index per (zone, DIM rule): services that
+    bill on actual weight share an index, and DIM-weight services are
+    grouped by divisor and minimum volume so each group's billable weight is
+    computed once per query. Indexes are built on first use of each zone.
+    Manual entry services are never routed to.
+    """
+    def __init__(self, shipping_carriers: Dict[str, ShippingCarrier]):
+        self.logger = Logger.get_logger()
+        self.groups: Dict[Tuple[Optional[float], float], List[Tuple[str, str, ShippingService]]] = {}
+        for carrier_name, carrier in shipping_carriers.items():
+            for service_id, service in carrier.services.items():
+                if service.manual_entry:
+                    continue
+                key = (service.dim_divisor, service.dim_min_volume) if service.dim_divisor else (None, 0.0)
+                self.groups.setdefault(key, []).append((carrier_name, service_id, service))
+        self.indexes: Dict[Optional[str], List[Tuple[ShippingService, _RouteIndex]]] = {}
+        self.logger.info(f"Initialized ShippingRouter over {sum(map(len, self.groups.values()))} "
+                        f"services in {len(self.groups)} billing groups")
+
+    def _indexes_for(self, zone: Optional[str]) -> List[Tuple[ShippingService, _RouteIndex]]:
+        # Each index is paired with one of its services, whose billable_weight
+        # stands for the whole group since they share a DIM rule
+        if zone not in self.indexes:
+            indexes = []
+            for key, services in self.groups.items():
+                zoned = [(carrier_name, service_id, service) for carrier_name, service_id, service in services
+                         if service.serves_zone(zone)]
+                if zoned:
+                    indexes.append((zoned[0][2], _RouteIndex(zoned, zone, filter_limits=key[0] is None)))
+            self.indexes[zone] = indexes
+            self.logger.debug(f"Built shipping route index for zone {zone}")
+        return self.indexes[zone]
+
+    def route(
+        self,
+        weight: float,
+        zone: Optional[str] = None,
+        dimensions: Optional[Tuple[float, float, float]] = None
+    ) -> Optional[ShippingQuote]:
+        """
+        Cheapest service able to ship a parcel of this weight (oz), or None.
+        """
+        best = None
+        for billing, index in self._indexes_for(zone):
+            candidate = index.cheapest(billing.billable_weight(weight, dimensions), weight)
+            if candidate is not None and (best is None or candidate[0] < best[0]):
+                best = candidate
+        if best is None:
+            return None
+        return ShippingQuote(carrier=best[1], service_id=best[2], price=best[0])
+
+    def route_batch(
+        self,
+        weights: Sequence[float],
+        zones: Union[str, Sequence[Optional[str]], None] = None,
+        dimensions: Optional[Sequence[Tuple[float, float, float]]] = None
+    ) -> BatchShippingQuotes:
+        """
+        Vectorized route. zones is one zone or one per weight; dimensions is
+        an (n, 3) array.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        row_count = len(weights)
+        if dimensions is not None:
+            dimensions = np.asarray(dimensions, dtype=np.float64).reshape(-1, 3)
+        prices = np.full(row_count, np.nan)
+        carriers = np.full(row_count, None, dtype=object)
+        service_ids = np.full(row_count, None, dtype=object)
+
+        if zones is None or isinstance(zones, str):
+            zone_groups = [(zones, np.arange(row_count))]
+        else:
+            zone_column = np.array(["" if zone is None else str(zone) for zone in zones], dtype=object)
+            zone_names, zone_index = np.unique(zone_column, return_inverse=True)
+            zone_groups = [(zone or None, np.flatnonzero(zone_index == position))
+                           for position, zone in enumerate(zone_names)]
+
+        for zone, rows in zone_groups:
+            actual = weights[rows]
+            for billing, index in self._indexes_for(zone):
+                billable = billing.billable_weights(actual, None if dimensions is None else dimensions[rows])
+                regions = index.regions_for(billable)
+                price = index.best_price[regions]
+                carrier = index.best_carrier[regions]
+                service_id = index.best_service_id[regions]
+
+                # A region's cheapest candidate can be outside its weight limits at the
+                # actual weight (DIM groups only); those rows walk the candidate list
+                within_limits = (index.best_min[regions] <= actual) & (actual <= index.best_max[regions])
+                fallback = np.flatnonzero(~within_limits & ~np.isnan(price))
+                price[~within_limits] = np.nan
+                for position in fallback:
+                    candidate = index.cheapest(billable[position], actual[position])
+                    if candidate is not None:
+                        price[position], carrier[position], service_id[position] = candidate[:3]
+
+                better = price < np.nan_to_num(prices[rows], nan=np.inf)
+                prices[rows[better]] = price[better]
+                carriers[rows[better]] = carrier[better]
+                service_ids[rows[better]] = service_id[better]
+
+        return BatchShippingQuotes(price=prices, carrier=carriers, service_id=service_ids)
@@ -0,0 +1,135 @@
+# src/utils/sweep.py
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.utils.calculator import ProfitCalculator
+from src.utils.logger import Logger
+
+RESULT_FIELDS = ("gross_revenue", "total_marketplace_fees", "shipping_cost",
+                 "total_cost", "net_profit", "profit_margin")
+
+@dataclass
+class SweepResult:
+    """
+    Dense results over a grid. axes maps each swept input to its values, in
+    grid dimension order; every array in fields has one dimension per axis.
+    """
+    axes: Dict[str, np.ndarray]
+    fields: Dict[str, np.ndarray]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(values) for values in self.axes.values())
+
+    def to_npy(self, path: str, field: str = "net_profit") -> None:
+        np.save(path, self.fields[field])
+
+    def to_csv(self, path: str, fields: Optional[Sequence[str]] = None) -> None:
+        """
+        Long format: one row per grid point, swept inputs first.
+        """
+        fields = list(fields or RESULT_FIELDS)
+        grids = np.meshgrid(*self.axes.values(), indexing="ij")
+        columns = [grid.ravel() for grid in grids] + [self.fields[field].ravel() for field in fields]
+        np.savetxt(path, np.column_stack(columns), delimiter=",",
+                   header=",".join(list(self.axes) + fields), comments="", fmt="%.10g")
+
+class ProfitSweep:
+    """
+    Evaluates calculate_profit over an N-dimensional grid for one tier and
+    shipping service. Any of sale_price, quantity, cost_per_item and
+    weight_per_item may be a 1-D array of values to sweep (axes follow that
+    argument order); the rest are fixed. Fees come from the tier's
+    FeeKernel by broadcasting, and shipping is priced once per
+    (quantity, weight) pair rather than once per grid point.
+    """
+    def __init__(self, calculator: ProfitCalculator):
+        self.calculator = calculator
+        self.logger = Logger.get_logger()
+
+    def run(
+        self,
+        tier_id: str,
+        shipping_service_id: str,
+        sale_price: Union[float, Sequence[float]],
+        quantity: Union[int, Sequence[int]],
+        cost_per_item: Union[float, Sequence[float]],
+        weight_per_item: Union[float, Sequence[float]],
+        manual_shipping_price: Optional[float] = None,
+        zone: Optional[str] = None,
+        package_dimensions: Optional[Tuple[float, float, float]] = None
+    ) -> SweepResult:
+        inputs = {
+            "sale_price": np.asarray(sale_price, dtype=np.float64),
+            "quantity": np.asarray(quantity, dtype=np.int64),
+            "cost_per_item": np.asarray(cost_per_item, dtype=np.float64),
+            "weight_per_item": np.asarray(weight_per_item, dtype=np.float64),
+        }
+        axes = {name: values for name, values in inputs.items() if values.ndim == 1}
+        if any(values.ndim > 1 for values in inputs.values()):
+            raise ValueError("Sweep inputs must be scalars or 1-D arrays")
+
+        # Reshape each swept input to lie along its own grid dimension
+        dimension_count = len(axes)
+        grid = {}
+        for name, values in inputs.items():
+            if name in axes:
+                shape = [1] * dimension_count
+                shape[list(axes).index(name)] = len(values)
+                grid[name] = values.reshape(shape)
+            else:
+                grid[name] = values.reshape([1] * dimension_count)
+        shape = tuple(len(values) for values in axes.values())
+        self.logger.info(f"Running profit sweep over {' x '.join(axes) or 'a single point'} "
+                        f"grid of shape {shape}")
+
+        tiers = self.calculator.marketplace.tiers
+        services = self.calculator.shipping_carrier.services
+        if tier_id not in tiers:
+            raise ValueError(f"Invalid tier_id: {tier_id}")
+        if shipping_service_id not in services:
+            raise ValueError(f"Invalid shipping_service_id: {shipping_service_id}")
+        service = services[shipping_service_id]
+        is_manual_entry = getattr(service, 'manual_entry', False)
+
+        # Input validation, as in calculate_profit
+        if not ((inputs["sale_price"] > 0).all() and (inputs["quantity"] > 0).all()
+                and (inputs["cost_per_item"] >= 0).all()):
+            raise ValueError("Required parameters must have valid values")
+        if is_manual_entry:
+            if manual_shipping_price is None or manual_shipping_price < 0:
+                raise ValueError("Manual shipping price must be provided and non-negative")
+        elif not (inputs["weight_per_item"] > 0).all():
+            raise ValueError("Weight must be greater than 0 for non-manual shipping")
+
+        sale_price, quantity = grid["sale_price"], grid["quantity"]
+        cost_per_item, weight_per_item = grid["cost_per_item"], grid["weight_per_item"]
+
+        gross_revenue = sale_price * quantity
+        total_marketplace_fees = tiers[tier_id].total_fees(sale_price, quantity)
+        if is_manual_entry:
+            shipping_cost = np.full(weight_per_item.shape, manual_shipping_price, dtype=np.float64)
+        else:
+            # Only the quantity and weight dimensions matter for shipping
+            total_weight = weight_per_item * quantity
+            dimensions = None
+            if package_dimensions is not None:
+                dimensions = np.broadcast_to(np.asarray(package_dimensions, dtype=np.float64),
+                                             (total_weight.size, 3))
+            rates = service.get_rates(total_weight.ravel(), zones=zone, dimensions=dimensions)
+            shipping_cost = np.nan_to_num(rates, nan=0.0).reshape(total_weight.shape)
+
+        total_cost = (cost_per_item * quantity) + total_marketplace_fees + shipping_cost
+        net_profit = gross_revenue - total_cost
+        profit_margin = (net_profit / gross_revenue) * 100
+
+        fields = {
+            "gross_revenue": gross_revenue,
+            "total_marketplace_fees": total_marketplace_fees,
+            "shipping_cost": shipping_cost,
+            "total_cost": total_cost,
+            "net_profit": net_profit,
+            "profit_margin": profit_margin,
+        }
+        fields = {name: np.broadcast_to(values, shape).copy() for name, values in fields.items()}
+        return SweepResult(axes=axes, fields=fields)
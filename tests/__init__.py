@@ -1 +1,7 @@
- 
+import os
+import sys
+
+# Mirror src/main.py: modules import both as "src.x" and as "x"
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# Set before any test module imports src, since loading the models sets up the logger
+LOG_DIR = tempfile.mkdtemp(prefix="marketplace-calc-test-logs-")
+os.environ["MARKETPLACE_CALC_LOG_DIR"] = LOG_DIR
+
+def pytest_unconfigure(config):
+    from src.utils.logger import Logger
+    Logger.shutdown()
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
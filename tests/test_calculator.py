@@ -1 +1,82 @@
- 
+import os
+import random
+import pytest
+import numpy as np
+from src.utils.config_loader import ConfigLoader
+from src.models.listing import Listing
+from src.utils.calculator import ProfitCalculator
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+def load_all(kind, loader):
+    directory = os.path.join(DATA_DIR, kind)
+    return [loader(os.path.join(directory, filename))
+            for filename in sorted(os.listdir(directory)) if filename.endswith(".json")]
+
+MARKETPLACES = load_all("marketplaces", ConfigLoader.load_marketplace)
+CARRIERS = load_all("shipping", ConfigLoader.load_shipping)
+
+def random_rows(marketplace, carrier, count, seed=0):
+    rng = random.Random(seed)
+    tiers = list(marketplace.tiers)
+    services = list(carrier.services)
+    return {
+        "sale_price": [round(rng.uniform(0.25, 500), 2) for _ in range(count)],
+        "quantity": [rng.randint(1, 12) for _ in range(count)],
+        "cost_per_item": [round(rng.uniform(0, 200), 2) for _ in range(count)],
+        "weight_per_item": [round(rng.uniform(0.1, 40), 1) for _ in range(count)],
+        "tier_id": [rng.choice(tiers) for _ in range(count)],
+        "shipping_service_id": [rng.choice(services) for _ in range(count)],
+        "manual_shipping_price": [round(rng.uniform(0, 20), 2) for _ in range(count)],
+    }
+
+@pytest.mark.parametrize("marketplace", MARKETPLACES, ids=lambda m: m.name)
+@pytest.mark.parametrize("carrier", CARRIERS, ids=lambda c: c.name)
+def test_batch_matches_scalar(marketplace, carrier):
+    calculator = ProfitCalculator(marketplace, carrier)
+    rows = random_rows(marketplace, carrier, 200)
+    batch = calculator.calculate_profit_batch(**rows)
+
+    assert len(batch) == 200
+    for index in range(200):
+        expected = calculator.calculate_profit(**{name: column[index] for name, column in rows.items()})
+        assert batch.row(index) == expected
+
+def test_batch_accepts_single_ids():
+    calculator = ProfitCalculator(MARKETPLACES[0], CARRIERS[0])
+    tier_id = next(iter(MARKETPLACES[0].tiers))
+    service_id = next(iter(CARRIERS[0].services))
+    batch = calculator.calculate_profit_batch([10.0, 20.0], [1, 2], [1.0, 1.0], [2.0, 2.0],
+                                              tier_id, service_id)
+    assert np.all(batch.gross_revenue == [10.0, 40.0])
+
+def test_batch_rejects_invalid_rows():
+    calculator = ProfitCalculator(MARKETPLACES[0], CARRIERS[0])
+    tier_id = next(iter(MARKETPLACES[0].tiers))
+    service_id = next(iter(CARRIERS[0].services))
+    with pytest.raises(ValueError, match="row 1"):
+        calculator.calculate_profit_batch([10.0, -1.0], [1, 1], [1.0, 1.0], [2.0, 2.0],
+                                          tier_id, service_id)
+    with pytest.raises(ValueError, match="Invalid tier_id"):
+        calculator.calculate_profit_batch([10.0], [1], [1.0], [2.0], "missing", service_id)
+
+def test_invalid_listings_fail_alone_and_the_rest_are_batched(monkeypatch):
+    carrier = next(carrier for carrier in CARRIERS if carrier.name == "USPS")
+    calculator = ProfitCalculator(MARKETPLACES[0], carrier)
+    rows = random_rows(MARKETPLACES[0], carrier, 6)
+    rows["weight_per_item"] = [1.0] * 6
+    expected = [calculator.calculate_profit(**{name: column[index] for name, column in rows.items()})
+                for index in range(6)]
+    listings = [Listing(**{name: column[index] for name, column in rows.items()}) for index in range(6)]
+    listings[1].sale_price = -1.0
+    listings[3].tier_id = "missing"
+    listings[4].shipping_service_id = "missing"
+    listings[4].quantity = 0
+
+    # Valid rows must come from the batch, not a row-by-row fallback
+    monkeypatch.setattr(calculator, "calculate_profit", None)
+    results = calculator.calculate_listings(listings)
+    assert [str(result) for result in (results[1], results[3], results[4])] == [
+        "Required parameters must have valid values", "Invalid tier_id: missing",
+        "Invalid shipping_service_id: missing"]
+    assert [results[index] for index in (0, 2, 5)] == [expected[index] for index in (0, 2, 5)]
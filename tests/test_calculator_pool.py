@@ -0,0 +1,30 @@
+import threading
+import pytest
+from src.utils.calculator_pool import CalculatorPool
+from tests.test_calculator import CARRIERS, MARKETPLACES
+
+def test_pool_reuses_calculators_across_threads():
+    marketplaces = {marketplace.name: marketplace for marketplace in MARKETPLACES}
+    carriers = {carrier.name: carrier for carrier in CARRIERS}
+    pool = CalculatorPool(marketplaces, carriers)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(pool.get("eBay", "USPS"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(calculator) for calculator in seen}) == 1
+    assert pool.get("eBay", "FedEx") is not seen[0]
+    assert len(pool) == 2
+
+    with pytest.raises(ValueError, match="Unknown carrier"):
+        pool.get("eBay", "Pigeon")
+
+def test_pool_rebuilds_after_config_swap():
+    marketplaces = {marketplace.name: marketplace for marketplace in MARKETPLACES}
+    carriers = {carrier.name: carrier for carrier in CARRIERS}
+    pool = CalculatorPool(marketplaces, carriers)
+    before = pool.get("eBay", "USPS")
+    carriers["USPS"] = next(carrier for carrier in CARRIERS if carrier.name == "FedEx")
+    after = pool.get("eBay", "USPS")
+    assert after is not before and after.shipping_carrier is carriers["USPS"]
@@ -0,0 +1,44 @@
+import random
+import numpy as np
+import pytest
+from src.utils.calculator import ProfitCalculator
+from src.utils.channel_optimizer import ChannelOptimizer
+from tests.test_calculator import MARKETPLACES, CARRIERS
+
+MARKETPLACE_MAP = {marketplace.name: marketplace for marketplace in MARKETPLACES}
+CARRIER_MAP = {carrier.name: carrier for carrier in CARRIERS}
+
+def test_rank_matches_calculate_profit_and_is_sorted():
+    optimizer = ChannelOptimizer(MARKETPLACE_MAP, CARRIER_MAP)
+    options = optimizer.rank(24.99, 2, 6.5, 5.0, manual_shipping_price=7.25)
+    assert options
+    assert [option.net_profit for option in options] == sorted(
+        (option.net_profit for option in options), reverse=True)
+    for option in options:
+        result = ProfitCalculator(MARKETPLACE_MAP[option.marketplace], CARRIER_MAP[option.carrier]).calculate_profit(
+            24.99, 2, 6.5, 5.0, option.tier_id, option.service_id, manual_shipping_price=7.25)
+        assert (option.total_marketplace_fees, option.shipping_cost, option.net_profit,
+                option.profit_margin) == (result.total_marketplace_fees, result.shipping_cost,
+                                          result.net_profit, result.profit_margin)
+
+def test_rank_skips_unshippable_services():
+    optimizer = ChannelOptimizer(MARKETPLACE_MAP, CARRIER_MAP)
+    options = optimizer.rank(24.99, 1, 6.5, 5000.0)
+    assert options == []
+    assert len(optimizer.rank(24.99, 1, 6.5, 5000.0, manual_shipping_price=0.0, limit=3)) == 3
+
+def test_best_batch_matches_rank():
+    optimizer = ChannelOptimizer(MARKETPLACE_MAP, CARRIER_MAP)
+    rng = random.Random(21)
+    rows = [(round(rng.uniform(1, 300), 2), rng.randint(1, 6), round(rng.uniform(0, 50), 2),
+             round(rng.uniform(0.5, 40), 1)) for _ in range(200)]
+    batch = optimizer.best_batch(*zip(*rows))
+    for index, row in enumerate(rows):
+        ranked = optimizer.rank(*row, limit=1)
+        if not ranked:
+            assert batch.carrier[index] is None and np.isnan(batch.net_profit[index])
+            continue
+        assert batch.net_profit[index] == ranked[0].net_profit
+        assert batch.profit_margin[index] == ranked[0].profit_margin
+    with pytest.raises(ValueError):
+        optimizer.best_batch([1.0, -1.0], [1, 1], [0, 0], [1, 1])
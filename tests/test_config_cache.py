@@ -0,0 +1,50 @@
+import os
+import shutil
+import numpy as np
+from src.utils.calculator import ProfitCalculator
+from src.utils.config_cache import ConfigSnapshotCache
+from src.utils.config_loader import ConfigLoader
+from tests.test_calculator import DATA_DIR, random_rows
+
+def copy_data(tmp_path):
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR, data_dir)
+    return str(data_dir / "marketplaces"), str(data_dir / "shipping")
+
+def test_snapshots_match_parsed_configs(tmp_path):
+    marketplace_dir, shipping_dir = copy_data(tmp_path)
+    cache = ConfigSnapshotCache(str(tmp_path / "cache"))
+    ConfigLoader.load_marketplaces(marketplace_dir, cache)
+    ConfigLoader.load_shipping_carriers(shipping_dir, cache)
+    assert cache.hits == 0
+
+    cache = ConfigSnapshotCache(str(tmp_path / "cache"))
+    marketplaces = ConfigLoader.load_marketplaces(marketplace_dir, cache)
+    carriers = ConfigLoader.load_shipping_carriers(shipping_dir, cache)
+    assert cache.misses == 0 and cache.hits == len(marketplaces) + len(carriers)
+
+    for name, marketplace in ConfigLoader.load_marketplaces(marketplace_dir).items():
+        assert marketplaces[name] == marketplace
+        for carrier_name, carrier in ConfigLoader.load_shipping_carriers(shipping_dir).items():
+            rows = random_rows(marketplace, carrier, 50)
+            expected = ProfitCalculator(marketplace, carrier).calculate_profit_batch(**rows)
+            actual = ProfitCalculator(marketplaces[name], carriers[carrier_name]).calculate_profit_batch(**rows)
+            assert np.array_equal(actual.net_profit, expected.net_profit)
+
+def test_changed_source_is_reparsed(tmp_path):
+    marketplace_dir, _ = copy_data(tmp_path)
+    path = os.path.join(marketplace_dir, "whatnot.json")
+    cache = ConfigSnapshotCache(str(tmp_path / "cache"))
+    original = cache.load_marketplace(path)
+
+    # Touched without changes: still served from the snapshot
+    os.utime(path, ns=(0, 0))
+    assert cache.load_marketplace(path) == original
+    assert cache.hits == 1
+
+    with open(path) as f:
+        content = f.read()
+    with open(path, "w") as f:
+        f.write(content.replace(original.name, "Renamed"))
+    assert cache.load_marketplace(path).name == "Renamed"
+    assert cache.misses == 2
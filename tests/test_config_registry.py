@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+from src.utils.config_cache import ConfigSnapshotCache
+from src.utils.config_loader import ConfigLoader
+from src.utils.config_registry import ConfigRegistry
+from tests.test_calculator import DATA_DIR
+
+MARKETPLACE_DIR = os.path.join(DATA_DIR, "marketplaces")
+SHIPPING_DIR = os.path.join(DATA_DIR, "shipping")
+
+def test_registry_loads_on_first_access():
+    registry = ConfigRegistry.marketplaces(MARKETPLACE_DIR)
+    expected = ConfigLoader.load_marketplaces(MARKETPLACE_DIR)
+    assert sorted(registry) == sorted(expected)
+    assert not any(registry.is_loaded(name) for name in registry)
+
+    name = next(iter(expected))
+    assert registry[name] == expected[name]
+    assert registry[name] is registry[name]
+    assert [registry.is_loaded(other) for other in registry].count(True) == 1
+    assert "Missing" not in registry and registry.get("Missing") is None
+
+def test_warm_up_matches_serial_load(tmp_path):
+    expected = ConfigLoader.load_shipping_carriers(SHIPPING_DIR)
+    for processes in (False, True):
+        registry = ConfigRegistry.shipping_carriers(SHIPPING_DIR)
+        registry.warm_up(workers=2, processes=processes)
+        assert all(registry.is_loaded(name) for name in registry)
+        assert dict(registry) == expected
+
+def test_index_from_snapshot_headers(tmp_path):
+    cache = ConfigSnapshotCache(str(tmp_path))
+    ConfigRegistry.shipping_carriers(SHIPPING_DIR, cache).warm_up()
+    names = {os.path.basename(path): cache.cached_name(path, ConfigLoader.load_shipping)
+             for path in ConfigRegistry.shipping_carriers(SHIPPING_DIR, cache).paths.values()}
+    assert None not in names.values()
+    assert sorted(names.values()) == sorted(ConfigLoader.load_shipping_carriers(SHIPPING_DIR))
+
+def test_uncached_registry_parses_each_file_once(monkeypatch):
+    parsed = []
+    real_load = json.load
+    def counting_load(f, *args, **kwargs):
+        parsed.append(f.name)
+        return real_load(f, *args, **kwargs)
+    monkeypatch.setattr(json, "load", counting_load)
+
+    registry = ConfigRegistry.marketplaces(MARKETPLACE_DIR)
+    registry[next(iter(registry))]
+    registry.warm_up(workers=2)
+    # Parsed once while indexing; loading builds from those documents
+    assert sorted(parsed) == sorted(registry.paths.values())
+    assert dict(registry) == ConfigLoader.load_marketplaces(MARKETPLACE_DIR)
+
+def test_warm_up_discards_loads_that_raced_a_reload(tmp_path):
+    directory = str(tmp_path / "shipping")
+    shutil.copytree(SHIPPING_DIR, directory)
+    usps_path = os.path.join(directory, "usps.json")
+    with open(usps_path) as f:
+        document = json.load(f)
+    document["services"]["first_class"]["name"] = "First Class (edited)"
+
+    def load_racing_a_reload(file_path, source=None):
+        if file_path == usps_path and registry.version == 0:
+            with open(usps_path, "w") as f:
+                json.dump(document, f)
+            registry.reload_file(usps_path)
+        return ConfigLoader.load_shipping(file_path, source)
+
+    registry = ConfigRegistry(directory, load_racing_a_reload)
+    registry.warm_up(workers=2)
+    assert all(registry.is_loaded(name) for name in registry)
+    assert registry["USPS"].services["first_class"].name == "First Class (edited)"
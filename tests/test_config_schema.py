@@ -0,0 +1,105 @@
+import json
+import pytest
+from src.models.fee import FeeType
+from src.utils.config_loader import ConfigLoader
+from src.utils.config_schema import ConfigValidationError, build_marketplace, build_shipping
+
+def test_marketplace_errors_reported_together():
+    data = {
+        "name": "Broken",
+        "tiers": {
+            "basic": {"name": "Basic", "fees": {
+                "commission": {"type": "percentage", "application": "per_item"},
+                "listing": {"type": "flat", "value": "0.35", "application": "per_listing"},
+                "legacy": {"type": "insertion", "application": "per_order"},
+                "listing_flat": {"type": "percent", "value": 12.9, "application": "per_order"},
+            }},
+            "pro": {"fees": {}},
+        }
+    }
+    with pytest.raises(ConfigValidationError) as error:
+        build_marketplace(data, source="broken.json")
+    assert error.value.errors == [
+        "$.tiers.basic.fees.commission.value: missing required field",
+        "$.tiers.basic.fees.listing.value: expected a number, got str",
+        "$.tiers.basic.fees.listing.application: must be one of per_item, per_order, got 'per_listing'",
+        "$.tiers.basic.fees.legacy.type: must be one of percentage, flat, compound, got 'insertion'",
+        "$.tiers.basic.fees.listing_flat.type: must be one of percentage, flat, compound, got 'percent'",
+        "$.tiers.pro.name: missing required field",
+    ]
+    assert str(error.value).startswith("broken.json: 6 configuration error(s)")
+
+def test_flat_fee_without_value_is_zero():
+    data = {"name": "M", "tiers": {"t": {"name": "T", "fees": {
+        "variable": {"type": "flat", "application": "per_order"}}}}}
+    fee = build_marketplace(data).tiers["t"].fees["variable"]
+    assert fee.type == FeeType.FLAT and fee.flat_fee == 0
+
+def test_shipping_errors_reported_together(tmp_path):
+    data = {
+        "name": "Broken",
+        "services": {
+            "ground": {"name": "Ground", "weight_limits": {"min": 10, "max": 5},
+                       "rates": [{"weight_up_to": 4, "price": 5}, {"weight_up_to": 4, "price": 6}]},
+            "zoned": {"name": "Zoned", "weight_limits": {"min": 0, "max": 70},
+                      "rate_matrix": {"zones": [1, 2], "weight_breaks": [8, 16],
+                                      "prices": [[5.0, 6.0], [7.0, -1]]}},
+            "missing": {"name": "Missing", "weight_limits": {"min": 0}},
+        }
+    }
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ConfigValidationError) as error:
+        ConfigLoader.load_shipping(str(path))
+    assert error.value.errors == [
+        "$.services.ground.weight_limits: min (10) is greater than max (5)",
+        "$.services.ground.rates[1]: rates weight_up_to must be sorted and unique, 4 follows 4",
+        "$.services.zoned.rate_matrix.prices[1][1]: expected a price >= 0 or null, got -1",
+        "$.services.missing.weight_limits.max: missing required field",
+        "$.services.missing: non-manual service needs rates or a rate_matrix",
+    ]
+
+def test_rate_matrix_breaks_must_be_whole_weight_units():
+    def matrix(**extra):
+        return {"name": "C", "services": {"x": {
+            "name": "X", "weight_limits": {"min": 0, "max": 1.5},
+            "rate_matrix": {"zones": [1], "weight_breaks": [0.25, 0.5, 1.0, 1.5],
+                            "prices": [[1.0], [2.0], [3.0], [4.0]], **extra}}}}
+    with pytest.raises(ConfigValidationError) as error:
+        build_shipping(matrix())
+    assert error.value.errors == [
+        "$.services.x.rate_matrix.weight_breaks[0]: 0.25 is not a whole multiple of weight_unit 1.0",
+        "$.services.x.rate_matrix.weight_breaks[1]: 0.5 is not a whole multiple of weight_unit 1.0",
+        "$.services.x.rate_matrix.weight_breaks[3]: 1.5 is not a whole multiple of weight_unit 1.0",
+    ]
+    carrier = build_shipping(matrix(weight_unit=0.25))
+    assert carrier.services["x"].get_rate(1.2, zone="1") == 4.0
+
+def test_matrix_price_rows_checked_alongside_other_errors():
+    data = {"name": "C", "services": {
+        "zoned": {"name": "Zoned", "weight_limits": {"min": 0, "max": 16},
+                  "rate_matrix": {"zones": [1, 1], "weight_breaks": [8, 16],
+                                  "prices": [[5.0, "6"], [7.0]]}},
+        "empty": {"name": "Empty", "weight_limits": {"min": 0, "max": 4}, "rates": []},
+        "short": {"name": "Short", "weight_limits": {"min": 0, "max": 10},
+                  "rates": [{"weight_up_to": 4, "price": 5}]},
+    }}
+    with pytest.raises(ConfigValidationError) as error:
+        build_shipping(data)
+    assert error.value.errors == [
+        "$.services.zoned.rate_matrix.zones: zones must be unique",
+        "$.services.zoned.rate_matrix.prices[0][1]: expected a price >= 0 or null, got '6'",
+        "$.services.zoned.rate_matrix.prices[1]: expected 2 prices, one per zone",
+        "$.services.empty.rates: expected at least one rate",
+        "$.services.short.weight_limits.max: 10 is above the heaviest rate (4); heavier parcels would have no rate",
+    ]
+
+def test_valid_shipping_builds_runtime_objects():
+    carrier = build_shipping({"name": "C", "services": {
+        "manual": {"name": "Manual", "weight_limits": {"min": 0, "max": 100}, "manual_entry": True},
+        "ground": {"name": "Ground", "weight_limits": {"min": 0, "max": 8}, "dim_divisor": 139,
+                   "rates": [{"weight_up_to": 4, "price": 5}, {"weight_up_to": 8, "price": 6}]},
+    }})
+    assert carrier.services["manual"].get_rate(3, manual_price=2.5) == 2.5
+    assert carrier.services["ground"].get_rate(6) == 6
+    assert carrier.services["ground"].dim_divisor == 139
@@ -0,0 +1,59 @@
+import json
+import os
+import shutil
+from src.utils.config_registry import ConfigRegistry
+from src.utils.config_watcher import ConfigWatcher
+from tests.test_calculator import DATA_DIR
+
+def edit(path, change):
+    with open(path) as f:
+        data = json.load(f)
+    change(data)
+    with open(path, "w") as f:
+        json.dump(data, f)
+    # Make the change visible even on filesystems with coarse mtimes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def test_reload_swaps_changed_config_only(tmp_path):
+    directory = tmp_path / "marketplaces"
+    shutil.copytree(os.path.join(DATA_DIR, "marketplaces"), directory)
+    registry = ConfigRegistry.marketplaces(str(directory))
+    watcher = ConfigWatcher([registry])
+    ebay = registry["eBay"]
+    assert watcher.poll() == []
+
+    def raise_fee(data):
+        fee = next(iter(data["tiers"]["standard"]["fees"].values()))
+        fee["value"] = fee["value"] + 1
+    edit(str(directory / "ebay.json"), raise_fee)
+    edit(str(directory / "whatnot.json"), lambda data: None)
+    assert sorted(map(os.path.basename, watcher.poll())) == ["ebay.json", "whatnot.json"]
+
+    reloaded = registry["eBay"]
+    assert reloaded is not ebay
+    assert reloaded.tiers["standard"].total_fees(100, 1) == ebay.tiers["standard"].total_fees(100, 1) + 1
+    # In-flight holders of the old object still see the old fees
+    assert ebay.tiers["standard"].total_fees(100, 1) != reloaded.tiers["standard"].total_fees(100, 1)
+    # Whatnot was never loaded, so the change only refreshed the index
+    assert not registry.is_loaded("Whatnot")
+
+def test_reload_handles_bad_and_removed_files(tmp_path):
+    directory = tmp_path / "marketplaces"
+    shutil.copytree(os.path.join(DATA_DIR, "marketplaces"), directory)
+    registry = ConfigRegistry.marketplaces(str(directory))
+    watcher = ConfigWatcher([registry])
+    ebay = registry["eBay"]
+
+    path = directory / "ebay.json"
+    path.write_text("{not json")
+    watcher.poll()
+    assert registry["eBay"] is ebay
+
+    os.remove(path)
+    watcher.poll()
+    assert "eBay" not in registry
+
+    shutil.copy(os.path.join(DATA_DIR, "marketplaces", "ebay.json"), directory / "renamed.json")
+    watcher.poll()
+    assert registry["eBay"] == ebay
@@ -0,0 +1,123 @@
+from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+import pytest
+from src.models.fee import Fee, FeeType, FeeApplication, FeeRounding
+from src.models.marketplace import Marketplace, SellerTier
+from src.utils.config_schema import ConfigValidationError, build_marketplace
+from src.utils.fixed_point import FixedPointCalculator, FixedPointFee, to_cents
+from tests.test_calculator import MARKETPLACES, CARRIERS, random_rows
+
+CENT_COLUMNS = ("sale_price", "cost_per_item", "manual_shipping_price")
+
+def cent_rows(marketplace, carrier, count):
+    rows = random_rows(marketplace, carrier, count)
+    for name in CENT_COLUMNS:
+        rows[name] = [to_cents(amount) for amount in rows[name]]
+    return rows
+
+def fee(percentage, application=FeeApplication.PER_ITEM, mode="half_up", per="order"):
+    return FixedPointFee.compile("fee", Fee(type=FeeType.PERCENTAGE, application=application,
+                                            percentage=percentage, rounding=FeeRounding(mode, per)),
+                                 FeeRounding())
+
+def decimal_fee(fee, sale_price, quantity):
+    per_item = fee.application == FeeApplication.PER_ITEM
+    amount = Decimal(0)
+    if fee.percentage is not None:
+        amount += Decimal(sale_price) * Decimal(str(fee.percentage)) / 100 * (quantity if per_item else 1)
+    if fee.flat_fee is not None:
+        amount += Decimal(str(fee.flat_fee)) * 100 * (quantity if per_item else 1)
+    return int(amount.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def test_to_cents_rounds_half_up():
+    assert to_cents(19.99) == 1999
+    assert to_cents("0.125") == 13
+    assert to_cents(2.675) == 268
+
+@pytest.mark.parametrize("mode, expected", [("half_up", 13), ("half_even", 12), ("down", 12), ("up", 13)])
+def test_rounding_modes_on_a_half_cent(mode, expected):
+    # 2.5% of $5.00 is exactly 12.5 cents
+    assert fee(2.5, application=FeeApplication.PER_ORDER, mode=mode).amount(500, 1) == expected
+
+def test_per_item_rounding_rounds_before_multiplying():
+    # 2.5% of $1.01 is 2.525 cents per item
+    assert fee(2.5, per="item").amount(101, 3) == 9
+    assert fee(2.5, per="order").amount(101, 3) == 8
+
+def test_inexact_coefficients_are_rejected():
+    with pytest.raises(ValueError, match="exactly"):
+        fee(2.123456)
+
+def test_fee_rounding_falls_back_to_marketplace_default():
+    tier = SellerTier(name="Tier", fees={
+        "own": Fee(type=FeeType.PERCENTAGE, application=FeeApplication.PER_ORDER, percentage=2.5,
+                   rounding=FeeRounding(mode="up")),
+        "default": Fee(type=FeeType.PERCENTAGE, application=FeeApplication.PER_ORDER, percentage=2.5),
+    })
+    marketplace = Marketplace(name="Test", tiers={"tier": tier}, rounding=FeeRounding(mode="down"))
+    calculator = FixedPointCalculator(marketplace, CARRIERS[0])
+    result = calculator.calculate_profit(101, 1, 0, 1.0, "tier", next(iter(CARRIERS[0].services)),
+                                         manual_shipping_price=0)
+    assert result.fee_breakdown == {"own": 3, "default": 2}
+
+@pytest.mark.parametrize("marketplace", MARKETPLACES, ids=lambda m: m.name)
+def test_results_reconcile_exactly(marketplace):
+    carrier = CARRIERS[0]
+    calculator = FixedPointCalculator(marketplace, carrier)
+    rows = cent_rows(marketplace, carrier, 300)
+    results = [calculator.calculate_profit(**{name: column[index] for name, column in rows.items()})
+               for index in range(300)]
+    for result in results:
+        assert result.total_marketplace_fees == sum(result.fee_breakdown.values())
+        assert result.gross_revenue - result.total_cost == result.net_profit
+    # Each fee matches exact Decimal arithmetic rounded half up once per order
+    tier_fees = {tier_id: tier.fees for tier_id, tier in marketplace.tiers.items()}
+    for index, result in enumerate(results):
+        for fee_name, amount in result.fee_breakdown.items():
+            assert amount == decimal_fee(tier_fees[rows["tier_id"][index]][fee_name],
+                                         rows["sale_price"][index], rows["quantity"][index])
+
+@pytest.mark.parametrize("marketplace", MARKETPLACES, ids=lambda m: m.name)
+@pytest.mark.parametrize("carrier", CARRIERS, ids=lambda c: c.name)
+def test_batch_matches_scalar(marketplace, carrier):
+    calculator = FixedPointCalculator(marketplace, carrier)
+    rows = cent_rows(marketplace, carrier, 200)
+    batch = calculator.calculate_profit_batch(**rows)
+    for index in range(200):
+        expected = calculator.calculate_profit(**{name: column[index] for name, column in rows.items()})
+        assert batch.row(index) == expected
+
+def test_batch_reports_first_invalid_row():
+    calculator = FixedPointCalculator(MARKETPLACES[0], CARRIERS[0])
+    rows = cent_rows(MARKETPLACES[0], CARRIERS[0], 5)
+    rows["sale_price"][3] = 0
+    with pytest.raises(ValueError, match=r"\(row 3\)"):
+        calculator.calculate_profit_batch(**rows)
+
+def test_dollar_amounts_are_rejected():
+    calculator = FixedPointCalculator(MARKETPLACES[0], CARRIERS[0])
+    rows = cent_rows(MARKETPLACES[0], CARRIERS[0], 5)
+    row = {name: column[0] for name, column in rows.items()}
+    for name in CENT_COLUMNS:
+        with pytest.raises(ValueError, match=f"{name} must be integer cents"):
+            calculator.calculate_profit(**dict(row, **{name: 19.99}))
+        with pytest.raises(ValueError, match=f"{name} must be integer cents"):
+            calculator.calculate_profit_batch(**dict(rows, **{name: [19.99] + rows[name][1:]}))
+    # Whole-number floats and missing manual prices are still accepted in batches
+    floats = dict(rows, sale_price=[float(price) for price in rows["sale_price"]],
+                  manual_shipping_price=[None] + rows["manual_shipping_price"][1:])
+    batch = calculator.calculate_profit_batch(**floats)
+    assert batch.gross_revenue.dtype == np.int64
+
+def test_rounding_is_read_from_config():
+    data = {"name": "Test", "rounding": {"mode": "half_even"}, "tiers": {"standard": {
+        "name": "Standard", "fees": {
+            "final_value_fee": {"type": "percentage", "value": 12.55, "application": "per_item",
+                                "rounding": {"mode": "up", "per": "item"}}}}}}
+    marketplace = build_marketplace(data, "test.json")
+    assert marketplace.rounding == FeeRounding(mode="half_even")
+    assert marketplace.tiers["standard"].fees["final_value_fee"].rounding == FeeRounding("up", "item")
+
+    data["tiers"]["standard"]["fees"]["final_value_fee"]["rounding"] = {"mode": "bankers"}
+    with pytest.raises(ConfigValidationError, match=r"\$\.tiers\.standard\.fees\.final_value_fee\.rounding\.mode"):
+        build_marketplace(data, "test.json")
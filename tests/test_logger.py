@@ -0,0 +1,132 @@
+import gzip
+import os
+import logging
+import queue
+import time
+import pytest
+from src.utils.logger import CompressingRotatingFileHandler, Logger, _BoundedQueueHandler, resolve_level
+
+@pytest.fixture
+def restore_logger():
+    options = dict(Logger._options)
+    yield
+    Logger._options.update(options)
+    Logger.shutdown()
+
+def make_record(message):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+def test_drop_policy_counts_overflow():
+    log_queue = queue.Queue(maxsize=1)
+    handler = _BoundedQueueHandler(log_queue, "drop")
+    for position in range(3):
+        handler.handle(make_record(f"record {position}"))
+    assert log_queue.qsize() == 1
+    assert handler.dropped == 2
+
+def test_configure_rejects_unknown_policy(restore_logger):
+    with pytest.raises(ValueError):
+        Logger.configure(overflow_policy="spill")
+
+def test_queue_mode_flush_writes_records(restore_logger):
+    logger = Logger.configure(use_queue=True, queue_size=16, overflow_policy="block")
+    for position in range(200):
+        logger.debug(f"queued record {position}")
+    Logger.flush()
+    file_handler = next(handler for handler in Logger._handlers if isinstance(handler, logging.FileHandler))
+    with open(file_handler.baseFilename) as log_file:
+        assert "queued record 199" in log_file.read()
+    assert Logger.dropped_records() == 0
+
+class CountingFloat(float):
+    formatted = 0
+
+    def __str__(self):
+        CountingFloat.formatted += 1
+        return super().__str__()
+
+    def __format__(self, spec):
+        CountingFloat.formatted += 1
+        return super().__format__(spec)
+
+@pytest.mark.parametrize("level, formats", [("WARNING", False), ("DEBUG", True)])
+def test_disabled_levels_skip_formatting(restore_logger, level, formats):
+    from tests.test_calculator import CARRIERS, MARKETPLACES
+    from src.utils.calculator import ProfitCalculator
+    Logger.configure(level=level)
+    marketplace, carrier = MARKETPLACES[0], CARRIERS[0]
+    service_id = next(service_id for service_id, service in carrier.services.items() if not service.manual_entry)
+    calculator = ProfitCalculator(marketplace, carrier)
+    CountingFloat.formatted = 0
+    calculator.calculate_profit(CountingFloat(10.0), 1, CountingFloat(2.0), CountingFloat(1.0),
+                                next(iter(marketplace.tiers)), service_id)
+    assert (CountingFloat.formatted > 0) == formats
+
+def test_resolve_level():
+    assert resolve_level("warning") == logging.WARNING
+    assert resolve_level(logging.INFO) == logging.INFO
+    with pytest.raises(ValueError):
+        resolve_level("chatty")
+
+def rotation_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+def write_records(logger, count, size=100):
+    for position in range(count):
+        logger.info("%d %s", position, "x" * size)
+
+def test_size_rotation_compresses_and_prunes(tmp_path):
+    handler = CompressingRotatingFileHandler(str(tmp_path / "app.log"), max_bytes=1000, backup_count=3)
+    logger = rotation_logger("test_size_rotation", handler)
+    try:
+        write_records(logger, 100)
+        handler.wait_for_archives()
+        archives = handler.archives()
+        assert len(archives) == 3
+        assert all(path.endswith(".gz") for path in archives)
+        with gzip.open(archives[-1], "rt") as archive:
+            assert archive.read().count("x" * 100) >= 9
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+def test_time_rotation_without_compression(tmp_path):
+    handler = CompressingRotatingFileHandler(str(tmp_path / "app.log"), rotate_when=3600, compress=False)
+    logger = rotation_logger("test_time_rotation", handler)
+    try:
+        write_records(logger, 3)
+        assert handler.archives() == []
+        handler.rollover_at = time.time() - 1
+        write_records(logger, 1)
+        handler.wait_for_archives()
+        archives = handler.archives()
+        assert len(archives) == 1
+        with open(archives[0]) as archive:
+            assert archive.read().count("\n") == 3
+        assert handler.rollover_at > time.time()
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_log_dir_option_and_child_process_files(restore_logger, tmp_path):
+    Logger.configure(log_dir=str(tmp_path))
+    Logger.get_logger().info("main process record")
+    assert (tmp_path / "app.log").exists()
+
+    pid = os.fork()
+    if pid == 0:
+        # The forked child must not share (and rotate) the parent's file
+        try:
+            Logger.get_logger().info("child process record")
+            Logger.shutdown()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    child_log = tmp_path / f"app-{pid}.log"
+    assert "child process record" in child_log.read_text()
+    assert "child process record" not in (tmp_path / "app.log").read_text()
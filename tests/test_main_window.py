@@ -0,0 +1,76 @@
+import os
+import time
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from src.utils.config_registry import ConfigRegistry
+from tests.test_calculator import DATA_DIR
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+def wait_for(app, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+def test_typing_burst_calculates_once_off_thread(app):
+    from src.ui.main_window import MainWindow
+    window = MainWindow(ConfigRegistry.marketplaces(os.path.join(DATA_DIR, "marketplaces")),
+                        ConfigRegistry.shipping_carriers(os.path.join(DATA_DIR, "shipping")))
+    window.shipping_widget.weight_input.setText("4")
+    window.product_widget.quantity_input.setText("1")
+    window.product_widget.cost_input.setText("2")
+    for text in ("1", "12", "12.", "12.5"):
+        window.product_widget.price_input.setText(text)
+    assert window.recalc_timer.isActive()
+    assert window.request_id == 0
+
+    assert wait_for(app, lambda: window.request_id == 1 and not window.pending_tasks)
+    assert window.results_widget.gross_revenue_label.text() == "Gross Revenue: $12.50"
+    assert window.result_cache.stats().misses == 1
+
+def test_superseded_results_are_discarded(app):
+    from src.ui.main_window import MainWindow
+    window = MainWindow(ConfigRegistry.marketplaces(os.path.join(DATA_DIR, "marketplaces")),
+                        ConfigRegistry.shipping_carriers(os.path.join(DATA_DIR, "shipping")))
+    window.request_id = 5
+    window.on_calculation_finished(4, object())
+    assert window.results_widget.gross_revenue_label.text() == "Gross Revenue: $0.00"
+
+def test_recalculation_stages_are_timed(app):
+    from src.ui.main_window import MainWindow
+    from src.utils.profiling import Instrumentation
+    window = MainWindow(ConfigRegistry.marketplaces(os.path.join(DATA_DIR, "marketplaces")),
+                        ConfigRegistry.shipping_carriers(os.path.join(DATA_DIR, "shipping")))
+    window.shipping_widget.weight_input.setText("4")
+    window.product_widget.quantity_input.setText("1")
+    window.product_widget.cost_input.setText("2")
+    window.product_widget.price_input.setText("12.5")
+    Instrumentation.reset()
+    Instrumentation.enable()
+    try:
+        window.calculate_profit()
+        assert wait_for(app, lambda: not window.pending_tasks)
+        stages = Instrumentation.snapshot()
+    finally:
+        Instrumentation.enable(False)
+        Instrumentation.reset()
+    assert {"ui.read_inputs", "ui.dispatch", "ui.round_trip", "ui.update_results"} <= set(stages)
+
+def test_clearing_a_field_cancels_pending_recalculation(app):
+    from src.ui.main_window import MainWindow
+    window = MainWindow(ConfigRegistry.marketplaces(os.path.join(DATA_DIR, "marketplaces")),
+                        ConfigRegistry.shipping_carriers(os.path.join(DATA_DIR, "shipping")))
+    window.shipping_widget.weight_input.setText("4")
+    window.product_widget.quantity_input.setText("1")
+    window.product_widget.cost_input.setText("2")
+    window.product_widget.price_input.setText("12.5")
+    assert window.recalc_timer.isActive()
+    window.product_widget.price_input.setText("")
+    assert not window.recalc_timer.isActive()
@@ -1 +1,23 @@
- 
+import pytest
+from src.models.fee import Fee, FeeType, FeeApplication, FeeKernel
+from src.models.marketplace import SellerTier
+from tests.test_calculator import MARKETPLACES
+
+TIERS = [(marketplace.name, tier_id, tier)
+         for marketplace in MARKETPLACES for tier_id, tier in marketplace.tiers.items()]
+
+@pytest.mark.parametrize("marketplace_name,tier_id,tier", TIERS, ids=lambda value: str(value)[:40])
+@pytest.mark.parametrize("sale_price,quantity", [(0.99, 1), (12.5, 3), (499.99, 40)])
+def test_fee_kernel_matches_fee_breakdown(marketplace_name, tier_id, tier, sale_price, quantity):
+    breakdown = tier.fee_breakdown(sale_price, quantity)
+    assert tier.total_fees(sale_price, quantity) == pytest.approx(sum(breakdown.values()), abs=1e-9)
+
+def test_fee_kernel_coefficients():
+    tier = SellerTier(name="Test", fees={
+        "commission": Fee(FeeType.PERCENTAGE, FeeApplication.PER_ITEM, percentage=10),
+        "listing": Fee(FeeType.FLAT, FeeApplication.PER_ITEM, flat_fee=0.25),
+        "processing": Fee(FeeType.COMPOUND, FeeApplication.PER_ORDER, percentage=3, flat_fee=0.30),
+    })
+    assert tier.fee_kernel == FeeKernel(per_item_rate=0.1, per_order_rate=0.03,
+                                        per_item_flat=0.25, per_order_flat=0.30)
+    assert tier.total_fees(20.0, 2) == pytest.approx(2 * 2.0 + 0.6 + 2 * 0.25 + 0.30)
@@ -0,0 +1,27 @@
+import os
+import pytest
+from src.models.listing import Listing
+from src.utils.calculator import ProfitCalculator
+from src.utils.parallel import ParallelProfitCalculator
+from tests.test_calculator import DATA_DIR, MARKETPLACES, CARRIERS, random_rows
+
+def test_parallel_results_match_scalar_in_input_order():
+    marketplace = next(m for m in MARKETPLACES if m.name == "eBay")
+    carrier = next(c for c in CARRIERS if c.name == "FedEx")
+    rows = random_rows(marketplace, carrier, 300, seed=3)
+    listings = [Listing(**{name: column[index] for name, column in rows.items()},
+                        marketplace="eBay", carrier="FedEx") for index in range(300)]
+    listings.append(Listing(10, 1, 1, 1, "store", "ground", marketplace="Nowhere", carrier="FedEx"))
+
+    with ParallelProfitCalculator(os.path.join(DATA_DIR, "marketplaces"),
+                                  os.path.join(DATA_DIR, "shipping"),
+                                  workers=2, chunk_size=37) as parallel:
+        results = parallel.calculate_profits(listings, return_exceptions=True)
+        with pytest.raises(ValueError, match="Unknown marketplace"):
+            parallel.calculate_profits(listings[-2:])
+
+    calculator = ProfitCalculator(marketplace, carrier)
+    for index in range(300):
+        assert results[index] == calculator.calculate_profit(
+            **{name: column[index] for name, column in rows.items()})
+    assert isinstance(results[-1], ValueError)
@@ -0,0 +1,43 @@
+import random
+import numpy as np
+import pytest
+from src.utils.calculator import ProfitCalculator
+from src.utils.price_solver import PriceSolver
+from tests.test_calculator import MARKETPLACES, CARRIERS
+
+EBAY = next(marketplace for marketplace in MARKETPLACES if marketplace.name == "eBay")
+USPS = next(carrier for carrier in CARRIERS if carrier.name == "USPS")
+
+def test_solved_price_is_lowest_cent_meeting_target():
+    calculator = ProfitCalculator(EBAY, USPS)
+    solver = PriceSolver(calculator)
+    rng = random.Random(4)
+    for _ in range(100):
+        quantity, cost, weight = rng.randint(1, 4), round(rng.uniform(0, 40), 2), round(rng.uniform(0.5, 3.5), 1)
+        margin = rng.choice([0, 10, 25, 33.3, 50])
+        price = solver.solve_price(quantity, cost, weight, "store", "first_class", target_margin=margin)
+        result = calculator.calculate_profit(price, quantity, cost, weight, "store", "first_class")
+        assert result.profit_margin >= margin
+        if price > 0.01:
+            lower = calculator.calculate_profit(round(price - 0.01, 2), quantity, cost, weight, "store", "first_class")
+            assert lower.profit_margin < margin
+
+def test_break_even_and_target_profit():
+    calculator = ProfitCalculator(EBAY, USPS)
+    solver = PriceSolver(calculator, price_increment=None)
+    price = solver.solve_price(2, 5.0, 3.0, "standard", "first_class", target_profit=0)
+    result = calculator.calculate_profit(price, 2, 5.0, 3.0, "standard", "first_class")
+    assert result.net_profit == pytest.approx(0, abs=1e-9)
+    assert solver.solve_price(1, 5.0, 3.0, "standard", "first_class", target_margin=90) is None
+    with pytest.raises(ValueError):
+        solver.solve_price(1, 5.0, 3.0, "standard", "first_class")
+
+def test_batch_matches_scalar():
+    solver = PriceSolver(ProfitCalculator(EBAY, USPS))
+    quantities, costs, tiers = [1, 2, 3, 1], [4.0, 0.0, 12.5, 3.0], ["store", "standard", "store", "standard"]
+    prices = solver.solve_price_batch(quantities, costs, 2.0, tiers, "first_class",
+                                      target_profit=[5, 0, 20, 1])
+    for index, target in enumerate([5, 0, 20, 1]):
+        assert prices[index] == solver.solve_price(quantities[index], costs[index], 2.0, tiers[index],
+                                                   "first_class", target_profit=target)
+    assert np.isnan(solver.solve_price_batch([1], [1.0], [2.0], "store", "first_class", target_margin=95)[0])
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from dataclasses import asdict
+from http import HTTPStatus
+from src.utils.calculator import ProfitCalculator
+from src.utils.pricing_service import PricingService
+from tests.test_calculator import MARKETPLACES, CARRIERS, random_rows
+
+def make_service(**kwargs):
+    return PricingService({marketplace.name: marketplace for marketplace in MARKETPLACES},
+                          {carrier.name: carrier for carrier in CARRIERS}, **kwargs)
+
+def request_bodies(marketplace, carrier, count):
+    rows = random_rows(marketplace, carrier, count)
+    return [dict({name: column[index] for name, column in rows.items()},
+                 marketplace=marketplace.name, carrier=carrier.name) for index in range(count)]
+
+def expected_result(body):
+    calculator = ProfitCalculator(MARKETPLACES[[m.name for m in MARKETPLACES].index(body["marketplace"])],
+                                  CARRIERS[[c.name for c in CARRIERS].index(body["carrier"])])
+    inputs = {name: value for name, value in body.items() if name not in ("marketplace", "carrier")}
+    return asdict(calculator.calculate_profit(**inputs))
+
+def test_concurrent_requests_are_micro_batched():
+    async def scenario():
+        service = make_service(batch_window=0.05)
+        bodies = request_bodies(MARKETPLACES[0], CARRIERS[0], 40) + request_bodies(MARKETPLACES[1], CARRIERS[1], 40)
+        responses = await asyncio.gather(*(service.handle("POST", "/calculate", json.dumps(body).encode())
+                                           for body in bodies))
+        await service.close()
+        return service, bodies, responses
+
+    service, bodies, responses = asyncio.run(scenario())
+    assert service.stats.batches == 1
+    assert service.stats.rows == 80
+    for body, (status, payload) in zip(bodies, responses):
+        assert status == HTTPStatus.OK
+        assert payload == expected_result(body)
+
+def test_invalid_listing_fails_alone():
+    async def scenario():
+        service = make_service(batch_window=0.05)
+        good, bad = request_bodies(MARKETPLACES[0], CARRIERS[0], 2)
+        bad["sale_price"] = 0
+        responses = await asyncio.gather(service.handle("POST", "/calculate", json.dumps(good).encode()),
+                                         service.handle("POST", "/calculate", json.dumps(bad).encode()),
+                                         service.handle("POST", "/calculate", b'{"marketplace": "Nope"}'),
+                                         service.handle("POST", "/calculate", b"not json"),
+                                         service.handle("POST", "/calculate",
+                                                        json.dumps(dict(good, quantity=1.7)).encode()))
+        await service.close()
+        return responses
+
+    (good, bad, unknown, malformed, fractional) = asyncio.run(scenario())
+    assert good[0] == HTTPStatus.OK
+    assert bad == (HTTPStatus.BAD_REQUEST, {"error": "Required parameters must have valid values"})
+    assert unknown == (HTTPStatus.BAD_REQUEST, {"error": "Unknown marketplace: Nope"})
+    assert malformed[0] == HTTPStatus.BAD_REQUEST
+    assert fractional == (HTTPStatus.BAD_REQUEST, {"error": "quantity must be a whole number, got 1.7"})
+
+def test_batch_endpoint_reports_errors_per_row():
+    async def scenario():
+        service = make_service()
+        bodies = request_bodies(MARKETPLACES[0], CARRIERS[0], 5)
+        bodies[2]["quantity"] = 0
+        del bodies[4]["tier_id"]
+        response = await service.handle("POST", "/calculate/batch", json.dumps({"listings": bodies}).encode())
+        await service.close()
+        return bodies, response
+
+    bodies, (status, payload) = asyncio.run(scenario())
+    assert status == HTTPStatus.OK
+    results = payload["results"]
+    assert results[2] == {"error": "Required parameters must have valid values"}
+    assert results[4] == {"error": "Missing required field: tier_id"}
+    for index in (0, 1, 3):
+        assert results[index] == expected_result(bodies[index])
+
+def test_http_round_trip_with_keep_alive():
+    async def scenario():
+        service = make_service()
+        server = await service.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        responses = []
+        for method, path in (("GET", "/health"), ("GET", "/marketplaces"), ("GET", "/carriers"),
+                             ("POST", "/health"), ("GET", "/missing")):
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            length = int(head.lower().split("content-length: ")[1].split("\r\n")[0])
+            responses.append((int(head.split(" ")[1]), json.loads(await reader.readexactly(length))))
+        writer.close()
+        await service.close()
+        return responses
+
+    health, marketplaces, carriers, wrong_method, missing = asyncio.run(scenario())
+    assert health == (200, {"status": "ok", "marketplaces": len(MARKETPLACES), "carriers": len(CARRIERS),
+                            "requests": 1, "rows": 0, "batches": 0})
+    assert set(marketplaces[1]["marketplaces"]) == {marketplace.name for marketplace in MARKETPLACES}
+    assert marketplaces[1]["marketplaces"][MARKETPLACES[0].name]["tiers"] == {
+        tier_id: tier.name for tier_id, tier in MARKETPLACES[0].tiers.items()}
+    assert set(carriers[1]["carriers"]) == {carrier.name for carrier in CARRIERS}
+    assert wrong_method[0] == 405
+    assert missing[0] == 404
@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pstats
+import pytest
+from src.utils.calculator import ProfitCalculator
+from src.utils.config_loader import ConfigLoader
+from src.utils.profiling import Instrumentation, StageStats, profile_run, profile_thread
+from tests.test_calculator import DATA_DIR, MARKETPLACES, CARRIERS, random_rows
+
+CALCULATOR_STAGES = {"calculator.logging", "calculator.validation", "calculator.fees",
+                     "calculator.shipping", "calculator.result"}
+
+@pytest.fixture
+def instrumentation():
+    Instrumentation.reset()
+    Instrumentation.enable()
+    yield Instrumentation
+    Instrumentation.enable(False)
+    Instrumentation.reset()
+
+def calculate_rows(count):
+    calculator = ProfitCalculator(MARKETPLACES[0], CARRIERS[0])
+    rows = random_rows(MARKETPLACES[0], CARRIERS[0], count)
+    for index in range(count):
+        calculator.calculate_profit(**{name: column[index] for name, column in rows.items()})
+    calculator.calculate_profit_batch(**rows)
+
+def test_disabled_instrumentation_records_nothing():
+    Instrumentation.reset()
+    calculate_rows(5)
+    assert Instrumentation.snapshot() == {}
+
+def test_calculator_stages_are_timed(instrumentation):
+    calculate_rows(20)
+    snapshot = instrumentation.snapshot()
+    assert CALCULATOR_STAGES <= set(snapshot)
+    assert snapshot["calculator.fees"].count == 20
+    # Logging is timed before and after the arithmetic
+    assert snapshot["calculator.logging"].count == 40
+    assert snapshot["calculator.batch.fees"].count == 1
+    assert all(summary.total_ms > 0 for summary in snapshot.values())
+    assert "calculator.fees" in instrumentation.report()
+
+def test_config_loader_stages_are_timed(instrumentation):
+    ConfigLoader.load_marketplaces(os.path.join(DATA_DIR, "marketplaces"))
+    snapshot = instrumentation.snapshot()
+    marketplace_files = len([name for name in os.listdir(os.path.join(DATA_DIR, "marketplaces"))
+                             if name.endswith(".json")])
+    assert snapshot["config.marketplace.parse"].count == marketplace_files
+    assert snapshot["config.marketplace.build"].count == marketplace_files
+
+def test_histogram_is_cumulative():
+    stats = StageStats()
+    for duration in (100, 120, 3000, 5000, 70000):
+        stats.add(duration)
+    assert stats.cumulative() == [(128, 2), (4096, 3), (8192, 4), (131072, 5)]
+    assert stats.percentile_ns(0.5) == 4096
+    assert stats.percentile_ns(1.0) == 70000
+
+def test_profile_run_writes_stats(tmp_path):
+    path = str(tmp_path / "run.prof")
+    with profile_run(path):
+        calculate_rows(5)
+    stats = pstats.Stats(path)
+    assert any(function == "calculate_profit" for _, _, function in stats.stats)
+
+def test_profile_run_merges_worker_threads(tmp_path):
+    path = str(tmp_path / "run.prof")
+    calculator = ProfitCalculator(MARKETPLACES[0], CARRIERS[0])
+    rows = random_rows(MARKETPLACES[0], CARRIERS[0], 3)
+
+    def work():
+        with profile_thread():
+            calculator.calculate_profit_batch(**rows)
+
+    with profile_run(path):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(work).result()
+    stats = pstats.Stats(path)
+    assert any(function == "calculate_profit_batch" for _, _, function in stats.stats)
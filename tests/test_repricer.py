@@ -0,0 +1,65 @@
+import csv
+import json
+import os
+from src.utils.config_loader import ConfigLoader
+from src.utils.calculator import ProfitCalculator
+from src.utils.repricer import InventoryRepricer
+from tests.test_calculator import DATA_DIR
+
+MARKETPLACES = ConfigLoader.load_marketplaces(os.path.join(DATA_DIR, "marketplaces"))
+CARRIERS = ConfigLoader.load_shipping_carriers(os.path.join(DATA_DIR, "shipping"))
+
+def test_reprice_jsonl_streams_results_and_rejects(tmp_path):
+    rows = [
+        {"sku": "a", "sale_price": 20, "quantity": 2, "cost_per_item": 3,
+         "weight_per_item": 3, "tier_id": "store", "shipping_service_id": "first_class"},
+        {"sku": "b", "sale_price": -5, "quantity": 1, "cost_per_item": 3,
+         "weight_per_item": 3, "tier_id": "store", "shipping_service_id": "first_class"},
+        {"sku": "c", "sale_price": 12, "quantity": 1, "cost_per_item": 1,
+         "weight_per_item": 2, "tier_id": "standard", "shipping_service_id": "first_class"},
+    ]
+    input_path = tmp_path / "inventory.jsonl"
+    input_path.write_text("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+
+    repricer = InventoryRepricer(MARKETPLACES, CARRIERS, default_marketplace="eBay",
+                                 default_carrier="USPS", chunk_size=2)
+    summary = repricer.reprice(str(input_path), str(tmp_path / "out.jsonl"),
+                               str(tmp_path / "rejects.jsonl"))
+
+    assert (summary.rows_read, summary.rows_written, summary.rows_rejected) == (4, 2, 2)
+    written = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert [row["sku"] for row in written] == ["a", "c"]
+    expected = ProfitCalculator(MARKETPLACES["eBay"], CARRIERS["USPS"]).calculate_profit(
+        20, 2, 3, 3, "store", "first_class")
+    assert written[0]["net_profit"] == expected.net_profit
+    assert written[0]["fee_breakdown"] == expected.fee_breakdown
+
+    rejected = [json.loads(line) for line in (tmp_path / "rejects.jsonl").read_text().splitlines()]
+    assert rejected[0]["sku"] == "b"
+    assert rejected[1]["error"].startswith("Invalid JSON")
+
+def test_csv_rejects_keep_columns_across_parse_and_validation_errors(tmp_path):
+    rows = [
+        {"sku": "A1", "sale_price": 20, "quantity": 1, "cost_per_item": 3,
+         "weight_per_item": 3, "tier_id": "nope", "shipping_service_id": "first_class"},
+        {"sku": "A2", "sale_price": 20, "quantity": 1, "cost_per_item": 3,
+         "weight_per_item": 3, "tier_id": "store", "shipping_service_id": "first_class"},
+    ]
+    input_path = tmp_path / "inventory.jsonl"
+    input_path.write_text("not json\n" + "\n".join(json.dumps(row) for row in rows) + "\n")
+
+    repricer = InventoryRepricer(MARKETPLACES, CARRIERS, default_marketplace="eBay", default_carrier="USPS")
+    summary = repricer.reprice(str(input_path), str(tmp_path / "out.csv"), str(tmp_path / "rejects.csv"))
+
+    assert (summary.rows_written, summary.rows_rejected) == (1, 2)
+    with open(tmp_path / "rejects.csv", newline="") as f:
+        rejected = list(csv.DictReader(f))
+    assert rejected[0]["line"] == "1" and rejected[0]["error"].startswith("Invalid JSON")
+    assert rejected[1]["tier_id"] == "nope"
+    assert rejected[1]["sale_price"] == "20"
+    assert json.loads(rejected[1]["extra"]) == {"sku": "A1"}
+    assert rejected[1]["error"] == "Invalid tier_id: nope"
+    with open(tmp_path / "out.csv", newline="") as f:
+        written = list(csv.DictReader(f))
+    assert json.loads(written[0]["extra"]) == {"sku": "A2"}
+    assert float(written[0]["net_profit"]) > 0
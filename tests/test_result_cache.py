@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+from src.utils.calculator import ProfitCalculator
+from src.utils.config_registry import ConfigRegistry
+from src.utils.result_cache import ResultCache
+from tests.test_calculator import CARRIERS, DATA_DIR, MARKETPLACES
+
+def scalar_rows(marketplace, carrier):
+    tier_id = next(iter(marketplace.tiers))
+    service_id = next(service_id for service_id, service in carrier.services.items() if not service.manual_entry)
+    return [dict(sale_price=price, quantity=2, cost_per_item=1.5, weight_per_item=2.0,
+                 tier_id=tier_id, shipping_service_id=service_id) for price in (10, 20, 30)]
+
+def test_cache_hits_match_uncached_results():
+    marketplace, carrier = MARKETPLACES[0], CARRIERS[0]
+    cache = ResultCache(max_entries=2)
+    cached = ProfitCalculator(marketplace, carrier, result_cache=cache)
+    plain = ProfitCalculator(marketplace, carrier)
+    rows = scalar_rows(marketplace, carrier)
+
+    for row in rows[:2] * 2:
+        assert cached.calculate_profit(**row) == plain.calculate_profit(**row)
+    assert (cache.stats().hits, cache.stats().misses) == (2, 2)
+
+    # A float price equal to a cached int price is the same key
+    cached.calculate_profit(**dict(rows[0], sale_price=10.0))
+    assert cache.stats().hits == 3
+
+    # Third distinct input evicts the least recently used one (rows[1])
+    cached.calculate_profit(**rows[2])
+    cached.calculate_profit(**rows[1])
+    stats = cache.stats()
+    assert (stats.misses, stats.evictions, stats.size) == (4, 2, 2)
+    assert 0 < stats.hit_rate < 1
+
+def test_cache_is_keyed_and_cleared_by_config(tmp_path):
+    directory = tmp_path / "marketplaces"
+    shutil.copytree(os.path.join(DATA_DIR, "marketplaces"), directory)
+    registry = ConfigRegistry.marketplaces(str(directory))
+    cache = ResultCache()
+    cache.watch(registry)
+    carrier = CARRIERS[0]
+    row = scalar_rows(registry["eBay"], carrier)[0]
+    before = ProfitCalculator(registry["eBay"], carrier, result_cache=cache).calculate_profit(**row)
+    assert cache.stats().size == 1
+
+    path = directory / "ebay.json"
+    data = json.loads(path.read_text())
+    for fee in data["tiers"][row["tier_id"]]["fees"].values():
+        fee["application"] = "per_order"
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(0, 10**18))
+    registry.reload_file(str(path))
+    assert cache.stats().size == 0
+
+    after = ProfitCalculator(registry["eBay"], carrier, result_cache=cache).calculate_profit(**row)
+    assert after.total_marketplace_fees != before.total_marketplace_fees
+
+def test_evicted_entries_release_their_configs():
+    cache = ResultCache(max_entries=2)
+    for marketplace in MARKETPLACES:
+        row = scalar_rows(marketplace, CARRIERS[0])[0]
+        ProfitCalculator(marketplace, CARRIERS[0], result_cache=cache).calculate_profit(**row)
+    # Only the configs of the two entries still cached stay pinned
+    assert len(MARKETPLACES) > 2
+    assert len(cache._configs) == 2
+    assert {pinned[0].name for pinned in cache._configs.values()} == {m.name for m in MARKETPLACES[-2:]}
@@ -0,0 +1,57 @@
+import os
+import numpy as np
+import pytest
+from src.utils.calculator import ProfitCalculator, ProfitCalculationResult
+from src.utils.result_set import ProfitResultSet, ProfitResultSetBuilder
+from tests.test_calculator import MARKETPLACES, CARRIERS, random_rows
+
+def batch_and_rows(marketplace, count=50, seed=0):
+    calculator = ProfitCalculator(marketplace, CARRIERS[0])
+    rows = random_rows(marketplace, CARRIERS[0], count, seed=seed)
+    batch = calculator.calculate_profit_batch(**rows)
+    return batch, [batch.row(index) for index in range(count)]
+
+def test_single_results_are_slotted():
+    result = ProfitCalculationResult(1.0, 0.1, 0.2, 0.3, 0.7, 70.0, {"fee": 0.1})
+    assert not hasattr(result, "__dict__")
+
+@pytest.mark.parametrize("marketplace", MARKETPLACES, ids=lambda m: m.name)
+def test_views_match_batch_rows(marketplace):
+    batch, rows = batch_and_rows(marketplace)
+    result_set = ProfitResultSet.from_batch(batch)
+    assert result_set.fees.shape == (50, len(result_set.fee_names))
+    for view, row in zip(result_set, rows):
+        assert view == row
+        assert view.to_result() == row
+
+def test_builder_and_concatenate_merge_fee_columns():
+    first_batch, first_rows = batch_and_rows(MARKETPLACES[0], count=10)
+    _, second_rows = batch_and_rows(MARKETPLACES[1], count=10, seed=1)
+    built = ProfitResultSet.from_results(first_rows + second_rows)
+    joined = ProfitResultSet.concatenate([ProfitResultSet.from_batch(first_batch),
+                                          ProfitResultSet.from_results(second_rows)])
+    for result_set in (built, joined):
+        assert len(result_set) == 20
+        assert set(result_set.fee_names) == {fee for row in first_rows + second_rows for fee in row.fee_breakdown}
+        assert [view.to_result() for view in result_set] == first_rows + second_rows
+    # Fees a row's marketplace does not charge are NaN
+    only_second = [fee for fee in joined.fee_names if fee not in first_batch.fee_breakdown]
+    assert np.isnan(joined.fee_column(only_second[0])[:10]).all()
+
+def test_empty_builder():
+    result_set = ProfitResultSetBuilder().build()
+    assert len(result_set) == 0
+    assert result_set.fees.shape == (0, 0)
+    with pytest.raises(IndexError):
+        result_set[0]
+
+def test_results_widget_accepts_a_view():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from src.ui.results_widget import ResultsWidget
+    batch, rows = batch_and_rows(MARKETPLACES[0], count=3)
+    widget = ResultsWidget()
+    widget.update_results(ProfitResultSet.from_batch(batch)[-1])
+    assert widget.gross_revenue_label.text() == f"Gross Revenue: ${rows[-1].gross_revenue:.2f}"
+    assert set(widget.fee_labels) == set(rows[-1].fee_breakdown)
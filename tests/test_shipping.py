@@ -1 +1,115 @@
- 
+import json
+import math
+import random
+import numpy as np
+import pytest
+from src.models.shipping import ShippingRate, ShippingRateMatrix, ShippingService
+from src.utils.config_loader import ConfigLoader
+
+def make_service(rates, minimum=0, maximum=70, manual_entry=False):
+    return ShippingService(
+        name="Test",
+        weight_limits={"min": minimum, "max": maximum},
+        rates=[ShippingRate(weight_up_to=weight, price=price) for weight, price in rates],
+        manual_entry=manual_entry
+    )
+
+def reference_rate(service, weight):
+    if weight < service.weight_limits["min"] or weight > service.weight_limits["max"]:
+        return None
+    for rate in sorted(service.rates, key=lambda x: x.weight_up_to):
+        if weight <= rate.weight_up_to:
+            return rate.price
+    return None
+
+def test_get_rate_matches_linear_scan():
+    rng = random.Random(5)
+    rates = [(float(weight), round(rng.uniform(3, 90), 2)) for weight in rng.sample(range(1, 65), 40)]
+    service = make_service(rates, minimum=0.5, maximum=70)
+    weights = [0, 0.5, 1, 64, 64.01, 70, 70.5, math.nan] + [rng.uniform(0, 75) for _ in range(500)]
+    for weight in weights:
+        assert service.get_rate(weight) == reference_rate(service, weight)
+
+def test_get_rates_matches_get_rate():
+    service = make_service([(4, 4.5), (8, 5.25), (8, 9.99), (16, 7.0)], maximum=12)
+    weights = np.array([-1, 0, 3.9, 4, 4.1, 8, 11, 12, 12.5])
+    expected = [service.get_rate(weight) for weight in weights]
+    assert [None if math.isnan(price) else price for price in service.get_rates(weights)] == expected
+
+def test_get_rates_manual_entry():
+    service = make_service([], maximum=10, manual_entry=True)
+    prices = service.get_rates([1, 5, 20], manual_price=[3.0, 4.0, 5.0])
+    assert prices[:2].tolist() == [3.0, 4.0] and math.isnan(prices[2])
+    assert np.isnan(service.get_rates([1])).all()
+
+def make_matrix_service(**kwargs):
+    matrix = ShippingRateMatrix(
+        zones=["2", "5", "8"],
+        weight_breaks=[32, 16, 48],
+        prices=[[9.0, 10.0, 12.0], [8.0, 8.5, 9.5], [11.0, 13.0, 16.0]],
+        weight_unit=16
+    )
+    return ShippingService(name="Ground", weight_limits={"min": 0, "max": 64},
+                           rate_matrix=matrix, **kwargs)
+
+def test_rate_matrix_bills_whole_units_by_zone():
+    service = make_matrix_service()
+    assert service.get_rate(1, zone="2") == 8.0
+    assert service.get_rate(16, zone="8") == 9.5
+    assert service.get_rate(16.5, zone="5") == 10.0
+    assert service.get_rate(48, zone="8") == 16.0
+    assert service.get_rate(49, zone="8") is None
+    with pytest.raises(ValueError, match="Unknown zone"):
+        service.get_rate(1, zone="9")
+    with pytest.raises(ValueError, match="zone is required"):
+        service.get_rate(1)
+
+def test_rate_matrix_rejects_breaks_between_weight_units():
+    with pytest.raises(ValueError, match="not a whole multiple of weight_unit"):
+        ShippingRateMatrix(zones=["1"], weight_breaks=[0.25, 0.5, 0.75, 1.0, 1.5],
+                           prices=[[1.0], [2.0], [3.0], [4.0], [5.0]])
+    matrix = ShippingRateMatrix(zones=["1"], weight_breaks=[0.25, 0.5, 0.75, 1.0, 1.5],
+                                prices=[[1.0], [2.0], [3.0], [4.0], [5.0]], weight_unit=0.25)
+    assert [matrix.get_price(weight) for weight in (0.1, 0.3, 0.6, 1.2)] == [1.0, 2.0, 3.0, 5.0]
+
+def test_rate_matrix_vectorized_matches_scalar():
+    service = make_matrix_service(dim_divisor=139, dim_min_volume=1728)
+    rng = random.Random(9)
+    weights = [rng.uniform(0, 70) for _ in range(300)]
+    zones = [rng.choice(["2", "5", "8"]) for _ in range(300)]
+    dimensions = [(rng.uniform(4, 16), rng.uniform(4, 16), rng.uniform(4, 16)) for _ in range(300)]
+    prices = service.get_rates(weights, zones=zones, dimensions=dimensions)
+    for weight, zone, box, price in zip(weights, zones, dimensions, prices):
+        expected = service.get_rate(weight, zone=zone, dimensions=box)
+        assert (math.isnan(price) and expected is None) or price == expected
+
+def test_dimensional_weight():
+    service = make_matrix_service(dim_divisor=139, dim_min_volume=200)
+    assert service.billable_weight(10, (5, 5, 5)) == 10
+    assert service.billable_weight(10, (6, 6, 6)) == pytest.approx(6 * 6 * 6 / 139 * 16)
+    assert service.get_rate(10, zone="2") == 8.0
+    assert service.get_rate(10, zone="2", dimensions=(6, 6, 6)) == 9.0
+
+def test_load_shipping_rate_matrix(tmp_path):
+    config = {
+        "name": "Zoned",
+        "services": {
+            "ground": {
+                "name": "Ground",
+                "weight_limits": {"min": 0, "max": 32},
+                "dim_divisor": 139,
+                "rate_matrix": {
+                    "zones": [2, 5],
+                    "weight_unit": 16,
+                    "weight_breaks": [16, 32],
+                    "prices": [[8.0, 8.5], [9.0, 10.0]]
+                }
+            }
+        }
+    }
+    path = tmp_path / "zoned.json"
+    path.write_text(json.dumps(config))
+    service = ConfigLoader.load_shipping(str(path)).services["ground"]
+    assert service.rate_matrix.zones == ["2", "5"]
+    assert service.dim_divisor == 139
+    assert service.get_rate(20, zone="5") == 10.0
@@ -0,0 +1,52 @@
+import random
+import numpy as np
+from src.models.shipping import ShippingCarrier
+from src.utils.shipping_router import ShippingRouter
+from tests.test_calculator import CARRIERS
+from tests.test_shipping import make_matrix_service, make_service
+
+def all_carriers():
+    carriers = {carrier.name: carrier for carrier in CARRIERS}
+    carriers["Zoned"] = ShippingCarrier(name="Zoned", services={
+        "ground": make_matrix_service(dim_divisor=139, dim_min_volume=200),
+        "flat": make_service([(10, 6.0), (40, 12.0)], minimum=2, maximum=30),
+    })
+    return carriers
+
+def brute_force(carriers, weight, zone, dimensions):
+    prices = []
+    for carrier in carriers.values():
+        for service in carrier.services.values():
+            if service.manual_entry or (service.rate_matrix is not None and
+                                        zone not in service.rate_matrix.zones):
+                continue
+            price = service.get_rate(weight, zone=zone, dimensions=dimensions)
+            if price is not None:
+                prices.append(price)
+    return min(prices) if prices else None
+
+def test_route_matches_brute_force():
+    carriers = all_carriers()
+    router = ShippingRouter(carriers)
+    rng = random.Random(11)
+    for _ in range(500):
+        weight = rng.choice([rng.uniform(0, 200), float(rng.randint(0, 60))])
+        zone = rng.choice(["2", "5", "8"])
+        dimensions = rng.choice([None, (rng.uniform(2, 8), rng.uniform(2, 8), rng.uniform(2, 8))])
+        quote = router.route(weight, zone=zone, dimensions=dimensions)
+        expected = brute_force(carriers, weight, zone, dimensions)
+        assert (quote.price if quote else None) == expected
+        if quote:
+            service = carriers[quote.carrier].services[quote.service_id]
+            assert service.get_rate(weight, zone=zone, dimensions=dimensions) == quote.price
+
+def test_route_batch_matches_route():
+    router = ShippingRouter(all_carriers())
+    rng = random.Random(12)
+    weights = [rng.uniform(0, 200) for _ in range(400)]
+    zones = [rng.choice(["2", "5", "8"]) for _ in range(400)]
+    dimensions = [(rng.uniform(2, 8), rng.uniform(2, 8), rng.uniform(2, 8)) for _ in range(400)]
+    batch = router.route_batch(weights, zones=zones, dimensions=dimensions)
+    for index in range(400):
+        assert batch.quote(index) == router.route(weights[index], zones[index], dimensions[index])
+    assert np.isnan(router.route_batch([1000.0], zones="2").price[0])
@@ -0,0 +1,35 @@
+import random
+import numpy as np
+from src.utils.calculator import ProfitCalculator
+from src.utils.sweep import ProfitSweep
+from tests.test_calculator import MARKETPLACES, CARRIERS
+
+EBAY = next(marketplace for marketplace in MARKETPLACES if marketplace.name == "eBay")
+FEDEX = next(carrier for carrier in CARRIERS if carrier.name == "FedEx")
+
+def test_sweep_matches_calculate_profit():
+    calculator = ProfitCalculator(EBAY, FEDEX)
+    prices = np.linspace(1, 200, 40)
+    weights = np.linspace(0.5, 12, 25)
+    quantities = np.arange(1, 5)
+    result = ProfitSweep(calculator).run("standard", "ground", prices, quantities, 3.5, weights)
+    assert result.shape == (40, 4, 25)
+    assert list(result.axes) == ["sale_price", "quantity", "weight_per_item"]
+
+    rng = random.Random(8)
+    for _ in range(200):
+        i, j, k = rng.randrange(40), rng.randrange(4), rng.randrange(25)
+        expected = calculator.calculate_profit(float(prices[i]), int(quantities[j]), 3.5,
+                                               float(weights[k]), "standard", "ground")
+        for field in ("total_marketplace_fees", "shipping_cost", "net_profit", "profit_margin"):
+            assert result.fields[field][i, j, k] == getattr(expected, field)
+
+def test_sweep_exports(tmp_path):
+    calculator = ProfitCalculator(EBAY, FEDEX)
+    result = ProfitSweep(calculator).run("store", "ground", [10.0, 20.0], 1, [0.0, 5.0], 2.0)
+    result.to_npy(str(tmp_path / "net.npy"))
+    assert np.array_equal(np.load(tmp_path / "net.npy"), result.fields["net_profit"])
+    result.to_csv(str(tmp_path / "grid.csv"), fields=["net_profit"])
+    lines = (tmp_path / "grid.csv").read_text().splitlines()
+    assert lines[0] == "sale_price,cost_per_item,net_profit"
+    assert len(lines) == 5